@@ -1,3 +1,5 @@
+import threading
+
 import streamlit as st
 
 st.set_page_config(
@@ -6,6 +8,20 @@ st.set_page_config(
     layout="centered"
 )
 
+# Carrega fontes e imagens dos PDFs em segundo plano, uma vez por processo.
+# O import fica dentro da thread para não atrasar a primeira página.
+def _aquecer():
+    from vmc import recursos
+    recursos.aquecer()
+
+
+@st.cache_resource
+def aquecer_recursos():
+    threading.Thread(target=_aquecer, daemon=True).start()
+
+
+aquecer_recursos()
+
 st.title("📑 Bem-vindo à App VMC")
 
 st.markdown("""
@@ -0,0 +1,479 @@
+import argparse
+import contextlib
+import gc
+import json
+import math
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from datetime import date, timedelta
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTADOS = os.path.join(RAIZ, "benchmarks", "carga.json")
+
+PAGINAS = {
+    "reunioes": "pages/2_Reuniões.py",
+    "exportacoes": "pages/3_Exportacoes.py",
+}
+# Ficheiros da app copiados para a pasta de trabalho
+FICHEIROS_APP = ["app.py", "pages", "assets", "fonts", "modelo_reuniao.csv", "partes_reuniao.csv"]
+PERCENTIS = (50, 90, 95, 99)
+# preparar_apptest() mexe em internos do Streamlit verificados nestas versões
+VERSOES_STREAMLIT = ("1.65.",)
+INTERVALO_AMOSTRAS = 0.25
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+def resumo(valores):
+    if not valores:
+        return {"n": 0}
+    resultado = {"n": len(valores)}
+    for p in PERCENTIS:
+        resultado[f"p{p}_ms"] = round(percentil(valores, p), 1)
+    resultado["max_ms"] = round(max(valores), 1)
+    return resultado
+
+
+# Memória residente do processo (Linux: /proc; noutros sistemas o pico)
+def memoria_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# -------------------------
+# O AppTest foi feito para uma sessão de cada vez: em cada execução troca
+# config.get_option, cria e apaga o Runtime global e recompila a página.
+# Aqui fica tudo fixo, partilhado por todas as sessões como num servidor.
+# Só em versões verificadas do Streamlit (VERSOES_STREAMLIT).
+# -------------------------
+def versao_streamlit_suportada():
+    import streamlit
+
+    return streamlit.__version__.startswith(VERSOES_STREAMLIT), streamlit.__version__
+
+
+def preparar_apptest():
+    from unittest.mock import MagicMock
+
+    from streamlit import config as st_config
+    from streamlit import logger
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, util
+
+    # A configuração é lida (e o nível dos logs reposto) no primeiro acesso.
+    # As threads das sessões não são do Streamlit: sem avisos "missing ScriptRunContext".
+    st_config.get_config_options()
+    logger.set_log_level("error")
+
+    st_config.get_option = util.build_mock_config_get_option({"global.appTest": True})
+    app_test.patch_config_options = lambda opcoes: contextlib.nullcontext()
+
+    # Bytecode das páginas compilado uma só vez (o ast.parse não aguenta várias threads no 3.11)
+    script_cache = ScriptCache()
+    app_test.ScriptCache = lambda: script_cache
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: cls._instance or runtime)
+    Runtime.exists = classmethod(lambda cls: True)
+    return app_test.AppTest
+
+
+# -------------------------
+# Cópia de uma instalação existente: as ações "guardar" e "preencher"
+# escrevem designações, e nunca devem tocar nos dados reais
+# -------------------------
+def copiar_instalacao(origem, pasta):
+    shutil.copytree(origem, pasta, dirs_exist_ok=True, ignore=shutil.ignore_patterns("__pycache__", ".git"))
+
+
+# -------------------------
+# Pasta de trabalho: cópia da app com dados sintéticos (benchmarks/dados.py).
+# O arquivo fica com todas as semanas da escala, até à semana atual;
+# o ficheiro das designações (semanas "dd Mmm", sem ano) só com o último ano.
+# -------------------------
+def preparar_pasta(pasta, escala, semente):
+    from benchmarks.dados import ESCALAS, gerar_designacoes, gerar_nomes, guardar_arquivo
+    from vmc import config
+    from vmc.arquivo import ArquivoDesignacoes
+
+    for nome in FICHEIROS_APP:
+        origem = os.path.join(RAIZ, nome)
+        if os.path.isdir(origem):
+            shutil.copytree(
+                origem, os.path.join(pasta, nome), ignore=shutil.ignore_patterns("__pycache__", "exportacoes")
+            )
+        elif os.path.exists(origem):
+            shutil.copy2(origem, pasta)
+    os.makedirs(os.path.join(pasta, config.EXPORT_DIR), exist_ok=True)
+
+    num_nomes, num_semanas = ESCALAS[escala]
+    hoje = date.today()
+    inicio = hoje - timedelta(days=hoje.weekday(), weeks=num_semanas - 1)
+    nomes = gerar_nomes(num_nomes, semente)
+    nomes.to_csv(os.path.join(pasta, config.DB_FILE), index=False)
+    designacoes = gerar_designacoes(nomes["Nome"], num_semanas, inicio=inicio, semente=semente)
+    guardar_arquivo(ArquivoDesignacoes(os.path.join(pasta, config.ARQUIVO_DIR)), designacoes)
+    ultimo_ano = designacoes[designacoes["Data"].dt.date > hoje - timedelta(weeks=52)]
+    ultimo_ano.drop(columns="Data").to_csv(os.path.join(pasta, config.DESIGNACOES_FILE), index=False)
+    return num_nomes, num_semanas
+
+
+# -------------------------
+# Ações de cada página: devolvem o widget alterado (a correr com .run())
+# ou None se não se aplicarem ao estado atual da página
+# -------------------------
+def _botao(at, rng, *rotulos):
+    botoes = [b for b in at.button if any(r in b.label for r in rotulos) and not b.disabled]
+    return rng.choice(botoes).click() if botoes else None
+
+
+def escolher_nome(at, rng, sessao):
+    caixas = [s for s in at.selectbox if s.key and not s.key.startswith("_") and len(s.options) > 1]
+    if not caixas:
+        return None
+    caixa = rng.choice(caixas)
+    return caixa.select_index(rng.randrange(1, len(caixa.options)))
+
+
+def procurar_nome(at, rng, sessao):
+    caixas = [t for t in at.text_input if t.key and t.key.endswith("_procurar")]
+    if not caixas:
+        return None
+    return rng.choice(caixas).input(rng.choice(["", "pe", "pessoa 0", "1"]))
+
+
+def mudar_semanas(at, rng, sessao):
+    radios = [r for r in at.radio if r.label.startswith("Número de semanas")]
+    return radios[0].set_value(5 if radios[0].value == 4 else 4) if radios else None
+
+
+def filtrar(at, rng, sessao):
+    caixas = [m for m in at.multiselect if m.label in ("Secções:", "Responsáveis:")]
+    if not caixas:
+        return None
+    caixa = rng.choice(caixas)
+    if caixa.value and rng.random() < 0.3:
+        return caixa.set_value([])
+    return caixa.set_value(rng.sample(caixa.options, min(len(caixa.options), rng.randint(1, 3))))
+
+
+def mudar_periodo(at, rng, sessao):
+    if not at.date_input:
+        return None
+    periodo = at.date_input[0]
+    padrao = sessao.setdefault("periodo", tuple(periodo.value))
+    semanas = max(1, (padrao[1] - padrao[0]).days // 7)
+    return periodo.set_value((padrao[0] + timedelta(weeks=rng.randrange(semanas)), padrao[1]))
+
+
+def mudar_pagina_historico(at, rng, sessao):
+    paginas = [n for n in at.number_input if n.label.startswith("Página")]
+    if not paginas or not paginas[0].max or paginas[0].max < 2:
+        return None
+    return paginas[0].set_value(rng.randint(1, int(paginas[0].max)))
+
+
+# página -> [(peso, nome, ação)]
+ACOES = {
+    "reunioes": [
+        (10, "escolher", escolher_nome),
+        (2, "procurar", procurar_nome),
+        (1, "semanas", mudar_semanas),
+        (1, "preencher", lambda at, rng, s: _botao(at, rng, "Preencher")),
+        (2, "exportar", lambda at, rng, s: _botao(at, rng, "Exportar CSV", "Exportar PDF")),
+        (1, "guardar", lambda at, rng, s: _botao(at, rng, "Guardar")),
+    ],
+    "exportacoes": [
+        (6, "filtrar", filtrar),
+        (2, "periodo", mudar_periodo),
+        (3, "exportar", lambda at, rng, s: _botao(at, rng, "CSV", "PDF Lista", "PDF Mensal", "Excel")),
+        (1, "historico", mudar_pagina_historico),
+    ],
+}
+
+
+# -------------------------
+# Uma sessão: abre a página e faz ações ao acaso (com pausas entre elas)
+# -------------------------
+def correr_sessao(AppTest, pagina, caminho, acoes, pausa, timeout, semente, registos, exportacoes):
+    rng = random.Random(semente)
+    estado = {}
+    at = AppTest.from_file(caminho, default_timeout=timeout)
+
+    def executar(nome, widget):
+        inicio = time.perf_counter()
+        erro = None
+        try:
+            widget.run()
+        except Exception as e:   # timeout ou erro do AppTest
+            erro = f"{type(e).__name__}: {e}"
+        ms = (time.perf_counter() - inicio) * 1000
+        if erro is None and at.exception:
+            erro = at.exception[0].value
+        registos.append((pagina, nome, ms, erro))
+        if erro is None:
+            exportacoes.update(at.session_state["exportacoes"] if "exportacoes" in at.session_state else ())
+
+    executar("abrir", at)
+    pesos, nomes, funcoes = zip(*ACOES[pagina])
+    for _ in range(acoes):
+        time.sleep(rng.uniform(0, 2 * pausa))
+        for _tentativa in range(5):
+            i = rng.choices(range(len(funcoes)), weights=pesos)[0]
+            widget = funcoes[i](at, rng, estado)
+            if widget is not None:
+                executar(nomes[i], widget)
+                break
+
+
+# -------------------------
+# Amostras periódicas da memória e dos ficheiros em pages/exportacoes
+# -------------------------
+def _listar(pasta):
+    ficheiros = {}
+    for raiz, _, nomes in os.walk(pasta):
+        for nome in nomes:
+            caminho = os.path.join(raiz, nome)
+            try:
+                info = os.stat(caminho)
+            except FileNotFoundError:
+                continue
+            ficheiros[os.path.relpath(caminho, pasta)] = (info.st_size, info.st_mtime_ns)
+    return ficheiros
+
+
+class Monitor(threading.Thread):
+    def __init__(self, pasta):
+        super().__init__(daemon=True)
+        self.pasta = pasta
+        self.parar = threading.Event()
+        self.antes = _listar(pasta)
+        self.vistos = dict(self.antes)
+        self.memoria_pico = memoria_mb()
+        self.ficheiros_pico = len(self.antes)
+        self.bytes_pico = sum(t for t, _ in self.antes.values())
+
+    def amostra(self):
+        atuais = _listar(self.pasta)
+        for caminho, info in atuais.items():
+            if self.vistos.get(caminho) != info:
+                self.vistos[caminho] = info
+        self.memoria_pico = max(self.memoria_pico, memoria_mb())
+        self.ficheiros_pico = max(self.ficheiros_pico, len(atuais))
+        self.bytes_pico = max(self.bytes_pico, sum(t for t, _ in atuais.values()))
+        return atuais
+
+    def run(self):
+        while not self.parar.wait(INTERVALO_AMOSTRAS):
+            self.amostra()
+
+    def churn(self):
+        depois = self.amostra()
+        criados = self.vistos.keys() - self.antes.keys()
+        return {
+            "ficheiros_antes": len(self.antes),
+            "ficheiros_depois": len(depois),
+            "ficheiros_pico": self.ficheiros_pico,
+            "criados": len(criados),
+            "removidos": len(self.vistos.keys() - depois.keys()),
+            "alterados": sum(1 for c in self.antes.keys() & depois.keys() if self.antes[c] != depois[c]),
+            "kb_escritos": round(sum(self.vistos[c][0] for c in criados) / 1024, 1),
+            "mb_pico": round(self.bytes_pico / 2**20, 2),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.carga",
+        description="Teste de carga: várias sessões simultâneas nas páginas da app, com o AppTest do Streamlit.",
+    )
+    parser.add_argument("--sessoes", type=int, default=8, help="sessões simultâneas")
+    parser.add_argument("--acoes", type=int, default=20, help="ações por sessão")
+    parser.add_argument("--paginas", default=",".join(PAGINAS), help="páginas usadas, distribuídas pelas sessões")
+    parser.add_argument("--escala", default="media", help="dados sintéticos: pequena, media ou grande")
+    parser.add_argument(
+        "--pasta", help="instalação existente a usar (numa cópia temporária) em vez de dados sintéticos"
+    )
+    parser.add_argument("--pausa", type=float, default=0.5, help="pausa média entre ações, em segundos")
+    parser.add_argument("--rampa", type=float, default=2.0, help="segundos ao longo dos quais as sessões arrancam")
+    parser.add_argument("--timeout", type=float, default=120, help="tempo máximo de cada execução da página")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--saida", default=RESULTADOS, help="ficheiro JSON com os resultados")
+    parser.add_argument("--limite-p95", type=float, help="falha se o p95 de alguma página passar estes ms")
+    parser.add_argument("--limite-memoria", type=float, help="falha se a memória crescer mais do que estes MB")
+    args = parser.parse_args(argv)
+
+    args.saida = os.path.abspath(args.saida)
+    paginas = [p.strip() for p in args.paginas.split(",") if p.strip()]
+    desconhecidas = set(paginas) - set(PAGINAS)
+    if desconhecidas:
+        parser.error(f"páginas desconhecidas: {', '.join(sorted(desconhecidas))}")
+
+    if args.pasta and not os.path.isdir(args.pasta):
+        parser.error(f"pasta inexistente: {args.pasta}")
+    suportada, versao = versao_streamlit_suportada()
+    if not suportada:
+        parser.error(
+            f"Streamlit {versao} não verificado (o teste de carga usa internos do AppTest); "
+            f"versões verificadas: {', '.join(v + 'x' for v in VERSOES_STREAMLIT)}"
+        )
+
+    sys.path.insert(0, RAIZ)
+    warnings.filterwarnings("ignore")
+
+    with contextlib.ExitStack() as pilha:
+        pasta = pilha.enter_context(tempfile.TemporaryDirectory(prefix="vmc_carga_"))
+        if args.pasta:
+            copiar_instalacao(os.path.abspath(args.pasta), pasta)
+            dados = {"pasta": os.path.abspath(args.pasta)}
+        else:
+            num_nomes, num_semanas = preparar_pasta(pasta, args.escala, args.semente)
+            dados = {"escala": args.escala, "nomes": num_nomes, "semanas": num_semanas}
+        # Os caminhos da configuração são relativos à pasta da app
+        os.chdir(pasta)
+
+        from vmc import config, recursos
+        from vmc.tarefas import get_fila
+
+        AppTest = preparar_apptest()
+        recursos.aquecer()
+        gc.collect()
+        memoria_inicio = memoria_mb()
+        monitor = Monitor(config.EXPORT_DIR)
+        monitor.start()
+
+        registos, exportacoes, threads = [], set(), []
+        inicio = time.perf_counter()
+        for n in range(args.sessoes):
+            pagina = paginas[n % len(paginas)]
+            thread = threading.Thread(
+                target=correr_sessao,
+                args=(
+                    AppTest, pagina, os.path.join(pasta, PAGINAS[pagina]), args.acoes, args.pausa,
+                    args.timeout, args.semente * 1000 + n, registos, exportacoes,
+                ),
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+            time.sleep(args.rampa / max(1, args.sessoes))
+        for thread in threads:
+            thread.join()
+        duracao = time.perf_counter() - inicio
+
+        # Exportações pedidas que ainda estão na fila
+        fila = get_fila()
+        tarefas = [t for t in map(fila.obter, exportacoes) if t is not None]
+        for tarefa in tarefas:
+            tarefa.esperar(args.timeout)
+        duracao_total = time.perf_counter() - inicio
+
+        monitor.parar.set()
+        monitor.join()
+        churn = monitor.churn()
+        gc.collect()
+        memoria_fim = memoria_mb()
+
+    por_pagina = {}
+    for pagina, acao, ms, erro in registos:
+        por_pagina.setdefault(pagina, {}).setdefault(acao, []).append(ms)
+    erros = [(pagina, acao, erro) for pagina, acao, _, erro in registos if erro]
+
+    resultados = {
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sessoes": args.sessoes,
+        "acoes_por_sessao": args.acoes,
+        "pausa_s": args.pausa,
+        "dados": dados,
+        "duracao_s": round(duracao, 2),
+        "reruns": len(registos),
+        "reruns_por_s": round(len(registos) / duracao, 2) if duracao else None,
+        "erros": len(erros),
+        "paginas": {
+            pagina: {
+                "total": resumo([ms for lista in acoes.values() for ms in lista]),
+                "acoes": {acao: resumo(lista) for acao, lista in acoes.items()},
+            }
+            for pagina, acoes in por_pagina.items()
+        },
+        "exportacoes": {
+            "pedidas": len(tarefas),
+            "erros": sum(1 for t in tarefas if t.erro is not None),
+            "por_terminar": sum(1 for t in tarefas if not t.terminada()),
+            "geracao": resumo([t.duracao() * 1000 for t in tarefas if t.terminada()]),
+            "espera_final_s": round(duracao_total - duracao, 2),
+        },
+        "memoria_mb": {
+            "inicio": round(memoria_inicio, 1),
+            "pico": round(monitor.memoria_pico, 1),
+            "fim": round(memoria_fim, 1),
+            "crescimento": round(memoria_fim - memoria_inicio, 1),
+            "por_sessao": round((memoria_fim - memoria_inicio) / max(1, args.sessoes), 2),
+        },
+        "exportacoes_pasta": churn,
+    }
+
+    # -------------------------
+    # Relatório
+    # -------------------------
+    print(f"{args.sessoes} sessões, {len(registos)} execuções em {duracao:.1f} s "
+          f"({resultados['reruns_por_s']}/s), {len(erros)} erros")
+    cabecalho = "".join(f"{f'p{p}':>9}" for p in PERCENTIS)
+    print(f"  {'página':12} {'ação':10} {'n':>5}{cabecalho}{'máx':>9}  (ms)")
+    for pagina, dados_pagina in resultados["paginas"].items():
+        for acao, medida in [("total", dados_pagina["total"]), *dados_pagina["acoes"].items()]:
+            valores = "".join(f"{medida[f'p{p}_ms']:9.0f}" for p in PERCENTIS)
+            print(f"  {pagina:12} {acao:10} {medida['n']:5}{valores}{medida['max_ms']:9.0f}")
+    exp = resultados["exportacoes"]
+    print(f"Exportações: {exp['pedidas']} pedidas, {exp['erros']} com erro, {exp['por_terminar']} por terminar; "
+          f"geração p50 {exp['geracao'].get('p50_ms', 0):.0f} ms, p95 {exp['geracao'].get('p95_ms', 0):.0f} ms")
+    mem = resultados["memoria_mb"]
+    print(f"Memória: {mem['inicio']} MB -> {mem['fim']} MB (pico {mem['pico']} MB, "
+          f"+{mem['crescimento']} MB, {mem['por_sessao']} MB por sessão)")
+    print(f"{config.EXPORT_DIR}: {churn['ficheiros_antes']} -> {churn['ficheiros_depois']} ficheiros "
+          f"(pico {churn['ficheiros_pico']}), {churn['criados']} criados, {churn['removidos']} removidos, "
+          f"{churn['alterados']} alterados, {churn['kb_escritos']} KB escritos")
+    for pagina, acao, erro in erros[:5]:
+        print(f"ERRO {pagina}/{acao}: {erro}")
+
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False)
+    print(f"Resultados em {args.saida}")
+
+    falhas = []
+    if erros or exp["erros"] or exp["por_terminar"]:
+        falhas.append("erros nas execuções ou exportações")
+    if args.limite_p95 is not None:
+        falhas += [
+            f"p95 de {pagina} = {dados_pagina['total']['p95_ms']:.0f} ms"
+            for pagina, dados_pagina in resultados["paginas"].items()
+            if dados_pagina["total"]["p95_ms"] > args.limite_p95
+        ]
+    if args.limite_memoria is not None and mem["crescimento"] > args.limite_memoria:
+        falhas.append(f"memória +{mem['crescimento']} MB")
+    for falha in falhas:
+        print(f"FALHA: {falha}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+# (Secção, Ordem, Parte, nº de designados) de uma semana típica
+SEMANA_TIPO = [
+    ("Início da Reunião", "Abertura", "Presidente", 1),
+    ("Início da Reunião", "Abertura", "Oração Inicial", 1),
+    ("Tesouros da Palavra de Deus", "Tesouros da Palavra de Deus", "Tesouros da Palavra de Deus", 1),
+    ("Tesouros da Palavra de Deus", "Pérolas Espirituais", "Pérolas Espirituais", 1),
+    ("Tesouros da Palavra de Deus", "Leitura da Bíblia", "Leitura da Bíblia", 1),
+    ("Empenha-se no Ministério", "Parte 1", "Iniciar conversas (3 min)", 2),
+    ("Empenha-se no Ministério", "Parte 2", "Cultivar o interesse (4 min)", 2),
+    ("Empenha-se no Ministério", "Parte 3", "Discurso (5 min)", 1),
+    ("Viver como Cristãos", "Parte variável 1", "Parte variável 1 (5 min)", 1),
+    ("Viver como Cristãos", "Parte fixa 1", "Estudo Bíblico de Congregação (30 min)", 1),
+    ("Viver como Cristãos", "Parte fixa 2", "Leitor do Estudo Bíblico", 1),
+    ("Final da Reunião", "Encerramento", "Oração Final", 1),
+]
+
+# Escalas: nome -> (nº de nomes, nº de semanas)
+ESCALAS = {
+    "pequena": (10, 4),
+    "media": (1_000, 52),
+    "grande": (10_000, 260),
+}
+
+
+def gerar_nomes(n, semente=0):
+    rng = np.random.default_rng(semente)
+    return pd.DataFrame({
+        "Nome": [f"Pessoa {i:05d}" for i in range(n)],
+        "Visível": rng.random(n) > 0.1,
+    })
+
+
+# Designações como no arquivo: Data de cada semana e Semana "dd Mmm"
+def gerar_designacoes(nomes, semanas, inicio=date(2021, 1, 4), semente=0):
+    rng = np.random.default_rng(semente)
+    nomes = np.asarray(nomes)
+    linhas = []
+    for w in range(semanas):
+        data = inicio + timedelta(weeks=w)
+        semana = data.strftime("%d %b")
+        escolhidos = iter(rng.choice(nomes, size=min(len(nomes), 20), replace=False))
+        for secao, ordem, parte, pessoas in SEMANA_TIPO:
+            resp = " / ".join(next(escolhidos, "") for _ in range(pessoas))
+            linhas.append((data, semana, secao, ordem, parte, resp))
+    df = pd.DataFrame(linhas, columns=["Data", "Semana", "Secção", "Ordem", "Parte", "Responsável"])
+    df["Data"] = pd.to_datetime(df["Data"])
+    return df
+
+
+# -------------------------
+# Guarda as designações num arquivo, um ano de cada vez:
+# dentro de um ano civil cada semana "dd Mmm" tem uma só data
+# -------------------------
+def guardar_arquivo(arquivo, designacoes):
+    for _, ano in designacoes.groupby(designacoes["Data"].dt.year, sort=True):
+        datas = dict(zip(ano["Semana"], ano["Data"].dt.date))
+        arquivo.guardar(ano.drop(columns="Data"), datas)
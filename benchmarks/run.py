@@ -0,0 +1,259 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(RAIZ, "benchmarks", "baseline.json")
+RESULTADOS = os.path.join(RAIZ, "benchmarks", "resultados.json")
+
+# Repetições por escala. O valor comparado é o mínimo: o ruído da máquina
+# (outros processos, GC, frequência do CPU) só acrescenta tempo
+REPETICOES = {"pequena": 15, "media": 9, "grande": 7}
+TOLERANCIA = 0.25
+REFERENCIA = "referencia"
+
+
+# -------------------------
+# Trabalho fixo medido junto com os casos: quanto mais lenta a máquina
+# estiver nesta execução (face à da baseline), mais lento fica também.
+# Metade Python puro (como o fpdf), metade numpy (como o pandas).
+# -------------------------
+def referencia():
+    sorted(str(i * 7919 % 100_003) for i in range(60_000))
+    np.sort(np.random.default_rng(0).random(400_000))
+
+
+# -------------------------
+# Mede os casos {nome: (função, preparar)} às voltas: cada volta corre
+# todos uma vez, por isso um abrandamento passageiro da máquina afeta
+# uma repetição de vários casos e não todas as repetições de um só
+# -------------------------
+def _medir(casos, repeticoes):
+    tempos = {nome: [] for nome in casos}
+    for _ in range(repeticoes):
+        for nome, (funcao, preparar) in casos.items():
+            if preparar is not None:
+                preparar()
+            # Como o timeit: sem recolhas do GC a meio da medição
+            gc.collect()
+            gc.disable()
+            try:
+                inicio = time.perf_counter()
+                funcao()
+                tempos[nome].append((time.perf_counter() - inicio) * 1000)
+            finally:
+                gc.enable()
+    return {
+        nome: {
+            "mediana_ms": round(statistics.median(t), 3),
+            "min_ms": round(min(t), 3),
+            "repeticoes": repeticoes,
+        }
+        for nome, t in tempos.items()
+    }
+
+
+# -------------------------
+# Tamanho de cada PDF sem e com a otimização (fonte sem hinting,
+# imagens ao tamanho impresso)
+# -------------------------
+def tamanhos_pdf(documentos):
+    from vmc import config
+
+    otimizar = config.PDF_OTIMIZAR
+    tamanhos = {}
+    try:
+        for nome, gerar in documentos.items():
+            config.PDF_OTIMIZAR = False
+            antes = len(gerar())
+            config.PDF_OTIMIZAR = True
+            depois = len(gerar())
+            tamanhos[nome] = {"antes_kb": round(antes / 1024, 1), "depois_kb": round(depois / 1024, 1)}
+    finally:
+        config.PDF_OTIMIZAR = otimizar
+    return tamanhos
+
+
+# -------------------------
+# Corre todos os benchmarks de uma escala
+# -------------------------
+def correr_escala(escala, repeticoes, tamanhos=True):
+    from benchmarks.dados import ESCALAS, gerar_designacoes, gerar_nomes, guardar_arquivo
+    from vmc import cache, config, recursos, reuniao
+    from vmc.armazenamento import ArmazenamentoCSV
+    from vmc.arquivo import ArquivoDesignacoes, limites_mes
+    from vmc.documentos import gerar_excel, gerar_pdf_lista, gerar_pdf_mensal, gerar_pdf_nomes
+    from vmc.filtros import IndiceFiltros
+
+    num_nomes, num_semanas = ESCALAS[escala]
+    nomes = gerar_nomes(num_nomes)
+    designacoes = gerar_designacoes(nomes["Nome"], num_semanas)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        nomes_csv = os.path.join(pasta, "nomes.csv")
+        partes_csv = os.path.join(pasta, "partes.csv")
+        pasta_arquivo = os.path.join(pasta, "arquivo")
+        nomes.to_csv(nomes_csv, index=False)
+        # O ficheiro das designações não tem datas (semanas "dd Mmm"); o arquivo tem
+        designacoes.drop(columns="Data").to_csv(partes_csv, index=False)
+        armazenamento = ArmazenamentoCSV(nomes_csv, partes_csv)
+        arquivo = ArquivoDesignacoes(pasta_arquivo)
+        guardar_arquivo(arquivo, designacoes)
+
+        def particoes():
+            return [os.path.join(pasta_arquivo, f) for f in os.listdir(pasta_arquivo)]
+
+        def arquivo_vazio():
+            for caminho in particoes():
+                os.remove(caminho)
+
+        def arquivo_sem_cache():
+            cache.invalidar(*particoes())
+
+        # Como na página das exportações: por omissão os últimos 3 meses
+        meses = arquivo.meses()
+        de, _ = limites_mes(meses[max(0, len(meses) - 3)])
+        _, ate = limites_mes(meses[-1])
+
+        df = arquivo.carregar()
+        indice = IndiceFiltros(df)
+        semana = indice.semanas(de, ate)[0]
+        pessoa = indice.responsaveis()[0]
+
+        def pipeline_filtros():
+            indice.semanas(de, ate)
+            indice.secoes()
+            indice.responsaveis()
+            indice.filtrar(de, ate)
+            indice.filtrar(de, ate, semanas=[semana])
+            indice.filtrar(de, ate, secoes=["Tesouros da Palavra de Deus"], responsaveis=[pessoa])
+            indice.filtrar(responsaveis=[pessoa])
+
+        # Como no arranque da app: fontes e imagens já preparadas
+        recursos.aquecer()
+
+        def sem_cache():
+            cache.invalidar(nomes_csv, partes_csv, config.PARTES_FILE)
+
+        casos = {
+            "load_nomes": (armazenamento.load_nomes, sem_cache),
+            "load_nomes_cache": (armazenamento.load_nomes, None),
+            "load_designacoes": (armazenamento.load_designacoes, sem_cache),
+            "load_partes": (reuniao.load_partes, sem_cache),
+            "arquivo_guardar": (lambda: guardar_arquivo(arquivo, designacoes), arquivo_vazio),
+            "arquivo_carregar": (arquivo.carregar, arquivo_sem_cache),
+            "arquivo_periodo": (lambda: arquivo.carregar(de, ate), arquivo_sem_cache),
+            "indice_filtros": (lambda: IndiceFiltros(df), None),
+            "filtros": (pipeline_filtros, None),
+            "gerar_pdf_lista": (lambda: gerar_pdf_lista(df), None),
+            "gerar_pdf_mensal": (lambda: gerar_pdf_mensal(df), None),
+            "gerar_excel": (lambda: gerar_excel(df), None),
+        }
+
+        casos[REFERENCIA] = (referencia, None)
+
+        resultados = {"nomes": num_nomes, "semanas": num_semanas, "linhas": len(df), "casos": _medir(casos, repeticoes)}
+        for nome, medida in resultados["casos"].items():
+            print(f"  {escala:8} {nome:18} {medida['min_ms']:10.1f} ms (mediana {medida['mediana_ms']:.1f})", flush=True)
+
+        if tamanhos:
+            resultados["tamanhos"] = tamanhos_pdf({
+                "pdf_lista": lambda: gerar_pdf_lista(df),
+                "pdf_mensal": lambda: gerar_pdf_mensal(df),
+                "pdf_nomes": lambda: gerar_pdf_nomes(nomes),
+            })
+            for nome, medida in resultados["tamanhos"].items():
+                print(f"  {escala:8} {nome:18} {medida['antes_kb']:8.1f} KB -> {medida['depois_kb']:.1f} KB", flush=True)
+    return resultados
+
+
+# -------------------------
+# Comparação com a baseline: mínimo acima de (1 + tolerância) é regressão.
+# Os tempos da baseline são primeiro ajustados à velocidade da máquina
+# nesta execução (razão entre os tempos do trabalho de referência).
+# -------------------------
+def velocidade(dados, base):
+    if REFERENCIA not in dados["casos"] or REFERENCIA not in base:
+        return 1.0
+    return dados["casos"][REFERENCIA]["min_ms"] / base[REFERENCIA]["min_ms"]
+
+
+def comparar(resultados, baseline, tolerancia):
+    regressoes = []
+    for escala, dados in resultados["escalas"].items():
+        base = baseline.get("escalas", {}).get(escala, {}).get("casos", {})
+        fator = velocidade(dados, base)
+        for caso, medida in dados["casos"].items():
+            if caso not in base or caso == REFERENCIA:
+                continue
+            antes, agora = base[caso]["min_ms"] * fator, medida["min_ms"]
+            if agora > antes * (1 + tolerancia) and agora - antes > 1:
+                regressoes.append((escala, caso, antes, agora))
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Benchmarks dos carregamentos, filtros e exportações com dados sintéticos.",
+    )
+    parser.add_argument("--escalas", default="pequena,media,grande", help="lista separada por vírgulas")
+    parser.add_argument("--repeticoes", type=int, help="repetições por caso (por omissão depende da escala)")
+    parser.add_argument("--saida", default=RESULTADOS, help="ficheiro JSON com os resultados")
+    parser.add_argument("--baseline", default=BASELINE, help="ficheiro JSON de referência")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA, help="aumento aceite (0.25 = 25%%)")
+    parser.add_argument("--sem-tamanhos", action="store_true", help="não compara o tamanho dos PDFs")
+    parser.add_argument("--guardar-baseline", action="store_true", help="grava os resultados como nova baseline")
+    args = parser.parse_args(argv)
+
+    # Os caminhos das fontes e imagens são relativos à raiz da app
+    os.chdir(RAIZ)
+    sys.path.insert(0, RAIZ)
+    warnings.filterwarnings("ignore")
+
+    import pandas as pd
+
+    resultados = {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "maquina": platform.machine(),
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "escalas": {},
+    }
+    for escala in [e.strip() for e in args.escalas.split(",") if e.strip()]:
+        resultados["escalas"][escala] = correr_escala(
+            escala, args.repeticoes or REPETICOES[escala], not args.sem_tamanhos
+        )
+
+    destino = args.baseline if args.guardar_baseline else args.saida
+    with open(destino, "w", encoding="utf-8") as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False)
+    print(f"Resultados em {destino}")
+
+    if args.guardar_baseline or not os.path.exists(args.baseline):
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    for escala, dados in resultados["escalas"].items():
+        base = baseline.get("escalas", {}).get(escala, {}).get("casos", {})
+        print(f"Referência {escala}: {velocidade(dados, base):.2f}x o tempo da baseline")
+    regressoes = comparar(resultados, baseline, args.tolerancia)
+    for escala, caso, antes, agora in regressoes:
+        print(f"REGRESSÃO {escala}/{caso}: {antes:.1f} ms (baseline ajustada) -> {agora:.1f} ms")
+    if not regressoes:
+        print(f"Sem regressões face à baseline (tolerância {args.tolerancia:.0%}).")
+    return 1 if regressoes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
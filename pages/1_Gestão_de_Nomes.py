@@ -1,49 +1,30 @@
 import streamlit as st
-import pandas as pd
-import os
-from fpdf import FPDF
+
+from vmc import medicao
+from vmc.armazenamento import juntar_partes, separar_partes
+from vmc.documentos import gerar_pdf_nomes
+from vmc.exportacao import assinatura, diferido, gerar_csv
+from vmc.importacao import PlanoImportacao, ler_ficheiro
+from vmc.painel import escolher_congregacao, painel_medicao
+
+inicio_execucao = medicao.inicio_pagina()
 
 st.set_page_config(page_title="Base de Dados de Nomes", page_icon="👤", layout="centered")
 
-DB_FILE = "nomes.csv"
+congregacao = escolher_congregacao()
+armazenamento = congregacao.armazenamento
 
 # Função para carregar a base de dados
 def load_data():
-    if os.path.exists(DB_FILE):
-        return pd.read_csv(DB_FILE)
-    else:
-        return pd.DataFrame(columns=["Nome", "Visível"])
-
-# Função para guardar a base de dados
-def save_data(df):
-    df.to_csv(DB_FILE, index=False)
-
-# Função para exportar para PDF
-def export_pdf(df):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    pdf.cell(200, 10, txt="Lista de Nomes", ln=True, align="C")
-
-    # Cabeçalho
-    pdf.cell(100, 10, "Nome", 1, 0, "C")
-    pdf.cell(40, 10, "Visível", 1, 1, "C")
-
-    # Linhas
-    for _, row in df.iterrows():
-        pdf.cell(100, 10, str(row["Nome"]), 1, 0)
-        pdf.cell(40, 10, str(row["Visível"]), 1, 1)
-
-    return pdf.output(dest="S").encode("latin-1")
+    return armazenamento.load_nomes()
 
 # Carregar dados existentes
 df = load_data()
 
 st.title("👤 Base de Dados de Nomes")
 
-# Mostrar tabela apenas com nomes visíveis
-st.subheader("Lista de Nomes Ativos")
-st.dataframe(df[df["Visível"] != False], use_container_width=True)
+# A lista completa fica no editor paginado, mais abaixo
+st.caption(f"{int(df['Visível'].sum())} nomes ativos de {len(df)}.")
 
 # Formulário para adicionar nome
 st.subheader("Adicionar Novo Nome")
@@ -51,35 +32,156 @@ with st.form("add_name_form"):
     novo_nome = st.text_input("Escreve o nome")
     submitted = st.form_submit_button("Adicionar")
     if submitted and novo_nome.strip():
-        novo_df = pd.DataFrame([{"Nome": novo_nome.strip(), "Visível": True}])
-        df = pd.concat([df, novo_df], ignore_index=True)
-        save_data(df)
+        armazenamento.adicionar_nome(novo_nome.strip())
         st.success(f"Nome '{novo_nome}' adicionado com sucesso!")
         st.stop()  # evita crash do experimental_rerun
 
+# -------------------------
+# Importar uma lista de nomes (CSV ou Excel), tudo numa única escrita
+# -------------------------
+st.subheader("Importar Nomes")
+versao_importacao = st.session_state.get("versao_importacao", 0)
+ficheiro = st.file_uploader(
+    "Ficheiro CSV ou Excel com a coluna Nome (e, opcionalmente, Visível e Partes)",
+    type=["csv", "txt", "xlsx"],
+    key=f"importar_nomes_{versao_importacao}",
+)
+if ficheiro is not None:
+    # O plano só é refeito se o ficheiro ou a lista atual mudarem
+    chave_plano = (ficheiro.file_id, assinatura(df))
+    guardado = st.session_state.get("plano_importacao")
+    if guardado is None or guardado[0] != chave_plano:
+        try:
+            plano = PlanoImportacao(df, ler_ficheiro(ficheiro.getvalue(), ficheiro.name))
+        except (ValueError, KeyError) as e:
+            st.error(f"Não foi possível ler o ficheiro: {e}")
+            st.stop()
+        st.session_state.plano_importacao = guardado = (chave_plano, plano)
+    plano = guardado[1]
+
+    col_novos, col_juntar, col_conflitos, col_iguais = st.columns(4)
+    col_novos.metric("Novos", len(plano.adicionar))
+    col_juntar.metric("Ganham partes", len(plano.juntar))
+    col_conflitos.metric("Conflitos", len(plano.conflitos))
+    col_iguais.metric("Sem alterações", plano.iguais)
+    if plano.repetidos or plano.vazios:
+        st.caption(f"{plano.repetidos} linhas repetidas no ficheiro juntas; {plano.vazios} linhas sem nome ignoradas.")
+
+    tab_novos, tab_juntar, tab_conflitos = st.tabs(["Novos", "Ganham partes", "Conflitos"])
+    tab_novos.dataframe(plano.adicionar, hide_index=True, use_container_width=True)
+    tab_juntar.dataframe(plano.juntar, hide_index=True, use_container_width=True)
+    tab_conflitos.dataframe(plano.conflitos, hide_index=True, use_container_width=True)
+
+    usar_ficheiro = st.checkbox(
+        "Nos conflitos, usar o que está no ficheiro",
+        disabled=plano.conflitos.empty,
+        help="Os nomes que correspondem a mais de um nome existente nunca são alterados.",
+    )
+    total_importacao = plano.total(usar_ficheiro)
+    if st.button(f"📥 Importar ({total_importacao} alterações)", disabled=total_importacao == 0, key="importar"):
+        try:
+            armazenamento.aplicar_alteracoes(**plano.alteracoes(usar_ficheiro))
+        except ValueError as e:
+            st.error(f"{e} Revê o plano e importa de novo.")
+            del st.session_state["plano_importacao"]
+            st.stop()
+        del st.session_state["plano_importacao"]
+        st.session_state.versao_importacao = versao_importacao + 1
+        st.rerun()
+
 # Secção para gerir nomes
 st.subheader("Gerir Nomes")
-for i, row in df.iterrows():
-    col1, col2, col3, col4 = st.columns([3,1,1,1])
-    col1.write(row["Nome"])
-    if row["Visível"]:
-        if col2.button("Ocultar", key=f"hide_{i}"):
-            df.at[i, "Visível"] = False
-            save_data(df)
-            st.stop()
+
+# Alterações pendentes, guardadas todas de uma vez. Os ids do CSV são posições:
+# guarda-se também o nome original de cada linha alterada, que é verificado ao guardar.
+if "alteracoes_nomes" not in st.session_state:
+    st.session_state.alteracoes_nomes = {"visivel": {}, "renomear": {}, "partes": {}, "eliminar": set(), "originais": {}}
+    # Uma nova versão do editor descarta o estado antigo das células
+    st.session_state.versao_editor = st.session_state.get("versao_editor", -1) + 1
+alteracoes = st.session_state.alteracoes_nomes
+
+if "aviso_nomes" in st.session_state:
+    st.error(st.session_state.pop("aviso_nomes"))
+
+col_pesq, col_tam = st.columns([3, 1])
+pesquisa = col_pesq.text_input("Pesquisar nome")
+por_pagina = col_tam.selectbox("Por página", [25, 50, 100])
+
+encontrados = df[df["Nome"].str.contains(pesquisa.strip(), case=False, regex=False)] if pesquisa.strip() else df
+num_paginas = max(1, (len(encontrados) - 1) // por_pagina + 1)
+pagina = st.number_input(f"Página (de {num_paginas})", min_value=1, max_value=num_paginas, value=1) - 1
+
+# Só a página atual é enviada para o editor, já com as alterações pendentes
+original = encontrados.iloc[pagina * por_pagina:(pagina + 1) * por_pagina]
+vista = original.copy()
+vista["Nome"] = [alteracoes["renomear"].get(i, n) for i, n in zip(vista.index, vista["Nome"])]
+vista["Visível"] = [alteracoes["visivel"].get(i, v) for i, v in zip(vista.index, vista["Visível"])]
+vista["Partes"] = [separar_partes(alteracoes["partes"].get(i, p)) for i, p in zip(vista.index, vista["Partes"])]
+vista["Eliminar"] = vista.index.isin(list(alteracoes["eliminar"]))
+
+editado = st.data_editor(
+    vista,
+    hide_index=True,
+    column_config={
+        "Nome": st.column_config.TextColumn("Nome", required=True),
+        "Visível": st.column_config.CheckboxColumn("Visível"),
+        "Partes": st.column_config.MultiselectColumn(
+            "Partes", options=congregacao.modelo.tipos, help="Partes que pode fazer (vazio = todas)"
+        ),
+        "Eliminar": st.column_config.CheckboxColumn("Eliminar"),
+    },
+    key=f"editor_nomes_{st.session_state.versao_editor}_{pagina}_{pesquisa}_{por_pagina}",
+)
+
+# Atualizar as alterações pendentes das linhas desta página
+for i, nome, visivel, partes, eliminar in zip(
+    editado.index, editado["Nome"], editado["Visível"], editado["Partes"], editado["Eliminar"]
+):
+    nome = str(nome).strip()
+    if nome and nome != original.at[i, "Nome"]:
+        alteracoes["renomear"][i] = nome
     else:
-        if col2.button("Reativar", key=f"show_{i}"):
-            df.at[i, "Visível"] = True
-            save_data(df)
-            st.stop()
-    if col3.button("Eliminar", key=f"delete_{i}"):
-        df = df.drop(i).reset_index(drop=True)
-        save_data(df)
-        st.stop()
+        alteracoes["renomear"].pop(i, None)
+    if bool(visivel) != bool(original.at[i, "Visível"]):
+        alteracoes["visivel"][i] = bool(visivel)
+    else:
+        alteracoes["visivel"].pop(i, None)
+    partes = juntar_partes(partes if isinstance(partes, (list, tuple)) else separar_partes(partes or ""))
+    if partes != original.at[i, "Partes"]:
+        alteracoes["partes"][i] = partes
+    else:
+        alteracoes["partes"].pop(i, None)
+    if eliminar:
+        alteracoes["eliminar"].add(i)
+    else:
+        alteracoes["eliminar"].discard(i)
+    if any(i in alteracoes[k] for k in ("renomear", "visivel", "partes", "eliminar")):
+        # O nome de quando a linha foi alterada pela primeira vez
+        alteracoes["originais"].setdefault(i, original.at[i, "Nome"])
+    else:
+        alteracoes["originais"].pop(i, None)
+
+num_alteracoes = sum(len(alteracoes[k]) for k in ("renomear", "visivel", "partes", "eliminar"))
+col_guardar, col_descartar = st.columns(2)
+if col_guardar.button(f"💾 Guardar alterações ({num_alteracoes})", disabled=num_alteracoes == 0):
+    try:
+        armazenamento.aplicar_alteracoes(
+            alteracoes["visivel"], alteracoes["renomear"], alteracoes["eliminar"],
+            partes=alteracoes["partes"], originais=alteracoes["originais"],
+        )
+    except ValueError as e:
+        st.session_state.aviso_nomes = f"{e} As alterações pendentes foram descartadas; volta a fazê-las."
+    del st.session_state["alteracoes_nomes"]
+    st.rerun()
+if col_descartar.button("Descartar", disabled=num_alteracoes == 0):
+    del st.session_state["alteracoes_nomes"]
+    st.rerun()
 
 # Exportar CSV
-st.download_button("📥 Exportar CSV", data=df.to_csv(index=False), file_name="nomes.csv", mime="text/csv")
+st.download_button("📥 Exportar CSV", data=diferido(gerar_csv, df), file_name="nomes.csv", mime="text/csv")
+
+# Exportar PDF (só é gerado quando se clica)
+st.download_button("📄 Exportar PDF", data=diferido(gerar_pdf_nomes, df), file_name="nomes.pdf", mime="application/pdf")
 
-# Exportar PDF
-pdf_bytes = export_pdf(df)
-st.download_button("📄 Exportar PDF", data=pdf_bytes, file_name="nomes.pdf", mime="application/pdf")
+medicao.fim_pagina("Gestão de Nomes", inicio_execucao)
+painel_medicao()
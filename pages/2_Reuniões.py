@@ -1,69 +1,34 @@
 import streamlit as st
 import pandas as pd
 import os
-import io
 from datetime import timedelta
-from fpdf import FPDF
 
-DB_FILE = "nomes.csv"
-PARTES_FILE = "partes_reuniao.csv"
+from vmc import config, medicao
+from vmc.agendador import Agendador, Vaga
+from vmc.documentos import gerar_pdf_reuniao
+from vmc.exportacao import gerar_csv
+from vmc.modelo_reuniao import texto_parte
+from vmc.reuniao import tipo_parte
+from vmc.painel import escolher_congregacao, painel_exportacoes, painel_medicao, pedir_exportacao
+from vmc.qualificacoes import obter_indice_nomes
+
+inicio_execucao = medicao.inicio_pagina()
+
+congregacao = escolher_congregacao()
 
 # -------------------------
 # Carregar nomes
 # -------------------------
 def load_nomes():
-    if os.path.exists(DB_FILE):
-        df = pd.read_csv(DB_FILE)
-        if "Nome" not in df.columns:
-            df["Nome"] = ""
-        if "Visível" not in df.columns:
-            df["Visível"] = True
-        df["Visível"] = df["Visível"].astype(str).str.lower().isin(["true", "1", "sim", "yes"])
-        return df
-    return pd.DataFrame(columns=["Nome", "Visível"])
+    return congregacao.armazenamento.load_nomes()
 
 # -------------------------
-# Carregar partes
+# Modelo da reunião (modelo_reuniao.csv + partes_reuniao.csv)
 # -------------------------
-def load_partes():
-    if not os.path.exists(PARTES_FILE):
+def load_modelo():
+    if not os.path.exists(congregacao.partes_file):
         st.warning("Faltou o ficheiro partes_reuniao.csv.")
-        return pd.DataFrame(columns=["Secção", "Parte", "TempoMin", "TempoMax"])
-
-    df = pd.read_csv(PARTES_FILE)
-    df["Secção"] = df["Secção"].astype(str).str.strip()
-    df["TempoMin"] = pd.to_numeric(df["TempoMin"], errors="coerce").fillna(0).astype(int)
-    df["TempoMax"] = pd.to_numeric(df["TempoMax"], errors="coerce").fillna(0).astype(int)
-    return df
-
-# -------------------------
-# Exportar PDF
-# -------------------------
-def export_pdf(df):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    pdf.cell(200, 10, txt="Designações da Reunião", ln=True, align="C")
-    pdf.ln(5)
-
-    col_widths = [30, 45, 35, 70, 30]
-    headers = ["Semana", "Secção", "Ordem", "Parte", "Responsável"]
-
-    for i, header in enumerate(headers):
-        pdf.cell(col_widths[i], 8, header, border=1)
-    pdf.ln()
-
-    for _, row in df.iterrows():
-        pdf.cell(col_widths[0], 8, str(row["Semana"]), border=1)
-        pdf.cell(col_widths[1], 8, str(row["Secção"]), border=1)
-        pdf.cell(col_widths[2], 8, str(row.get("Ordem", "")), border=1)
-        pdf.cell(col_widths[3], 8, str(row["Parte"])[:65], border=1)
-        pdf.cell(col_widths[4], 8, str(row["Responsável"]), border=1)
-        pdf.ln()
-
-    buffer = io.BytesIO()
-    pdf.output(buffer)
-    return buffer.getvalue()
+    return congregacao.modelo
 
 # -------------------------
 # APP
@@ -74,206 +39,234 @@ st.subheader("Definir semanas do mês")
 primeira_semana = st.date_input("Escolhe a primeira semana do mês")
 num_semanas = st.radio("Número de semanas:", [4, 5], index=0)
 
-semanas = [(primeira_semana + timedelta(weeks=i)).strftime("%d %b") for i in range(num_semanas)]
+datas = [primeira_semana + timedelta(weeks=i) for i in range(num_semanas)]
+semanas = [d.strftime("%d %b") for d in datas]
 
 nomes_df = load_nomes()
-partes_cfg = load_partes()
-nomes_visiveis = [""] + nomes_df[nomes_df["Visível"]]["Nome"].tolist()
+modelo = load_modelo()
+indice_nomes = obter_indice_nomes(nomes_df)
+estatisticas = congregacao.estatisticas
+_dicas = {}
 
-dados = []
 
-# -------------------------
-# LOOP DAS SEMANAS
-# -------------------------
-for idx, semana in enumerate(semanas, start=1):
+# Mostra junto a cada nome a última vez que teve esta parte (uma vez por tipo em cada execução)
+def dica(tipo):
+    formatar = _dicas.get(tipo)
+    if formatar is None:
+        ultimas = estatisticas.ultimas(tipo)
 
-    st.header(f"📅 Semana {idx} - {semana}")
+        def formatar(nome):
+            ultima = ultimas.get(nome)
+            return f"{nome}  ·  última: {ultima:%d/%m/%Y}" if ultima else nome
+        _dicas[tipo] = formatar
+    return formatar
 
-    # -------------------------
-    # Início da Reunião
-    # -------------------------
-    st.subheader("Início da Reunião")
 
-    presidente = st.selectbox(f"Presidente ({semana})", nomes_visiveis, key=f"presidente_{semana}")
-    dados.append({"Semana": semana, "Secção": "Início da Reunião", "Ordem": "Abertura", "Parte": "Presidente", "Responsável": presidente})
-
-    oracao_inicial = st.selectbox(f"Oração Inicial ({semana})", nomes_visiveis, key=f"oracao_inicial_{semana}")
-    dados.append({"Semana": semana, "Secção": "Início da Reunião", "Ordem": "Abertura", "Parte": "Oração Inicial", "Responsável": oracao_inicial})
-
-    # -------------------------
-    # Tesouros da Palavra de Deus
-    # -------------------------
-    st.subheader("Tesouros da Palavra de Deus")
-
-    for parte in ["Tesouros da Palavra de Deus", "Pérolas Espirituais", "Leitura da Bíblia"]:
-        resp = st.selectbox(f"{parte} ({semana})", nomes_visiveis, key=f"{semana}_{parte}")
-        dados.append({"Semana": semana, "Secção": "Tesouros da Palavra de Deus", "Ordem": parte, "Parte": parte, "Responsável": resp})
-
-    # -------------------------
-    # Empenha-se no Ministério
-    # -------------------------
-    st.subheader("Empenha-se no Ministério")
-
-    ministerio_cfg = partes_cfg[partes_cfg["Secção"] == "Empenha-se no Ministério"]
-
-    num_ministerio = st.number_input(f"Número de partes ({semana})", min_value=1, max_value=4, value=3, key=f"num_ministerio_{semana}")
+# -------------------------
+# Selectbox de um designado: só com os nomes que podem fazer a parte.
+# Com muitos nomes, uma caixa ao lado pesquisa pelo início de qualquer
+# palavra do nome, sem acentos.
+# -------------------------
+def escolher_nome(rotulo, tipo, chave):
+    opcoes = indice_nomes.elegiveis(tipo)
+    destino = st
+    if len(opcoes) > config.PESQUISA_MIN_NOMES:
+        destino, col_pesquisa = st.columns([3, 1])
+        pesquisa = col_pesquisa.text_input("Procurar", key=f"{chave}_procurar", placeholder="🔎")
+        opcoes = indice_nomes.procurar(pesquisa, opcoes)
+
+    opcoes = [""] + list(opcoes)
+    # O nome já escolhido continua disponível, mesmo fora da pesquisa
+    atual = st.session_state.get(chave, "")
+    if atual and atual not in opcoes:
+        opcoes.append(atual)
+    return destino.selectbox(rotulo, opcoes, format_func=dica(tipo), key=chave)
 
-    for i in range(num_ministerio):
-        parte_escolhida = st.selectbox(
-            f"Parte {i+1} ({semana})",
-            ministerio_cfg["Parte"].unique(),
-            key=f"{semana}_ministerio_parte_{i}"
-        )
+# -------------------------
+# Percorre as partes de uma semana segundo o modelo.
+# Com desenhar=True mostra os widgets; senão só lê o estado atual deles.
+# Devolve (secção, ordem, parte, tipo, chaves dos selectbox, responsáveis).
+# -------------------------
+def percorrer_semana(semana, desenhar=False):
+    ss = st.session_state
+
+    def widget(funcao, chave, padrao, *args, **kwargs):
+        if desenhar:
+            return funcao(*args, key=chave, **kwargs)
+        return ss.get(chave, padrao)
+
+    partes = []
+    for secao in modelo.secoes:
+        if desenhar:
+            st.subheader(secao.nome)
+
+        especial = False
+        if secao.variantes:
+            especial = widget(st.checkbox, f"{semana}_especial", False, f"Semana Especial ({semana})")
+
+        for parte in secao.partes:
+            if not parte.ativa(especial):
+                continue
+
+            quantidade = parte.quantidade
+            if parte.maximo > 1:
+                quantidade = widget(
+                    st.number_input, f"{semana}_{parte.id}_num", parte.quantidade,
+                    f"Número de partes ({semana})",
+                    min_value=1, max_value=parte.maximo, value=parte.quantidade, step=1,
+                )
+
+            for n in range(1, quantidade + 1):
+                prefixo = f"{semana}_{parte.id}_{n}"
+                ordem = parte.ordem_de(n)
+
+                escolha = None
+                if parte.catalogo:
+                    opcoes = modelo.opcoes.get(parte.secao, ())
+                    escolha = widget(
+                        st.selectbox, f"{prefixo}_parte", opcoes[0] if opcoes else "",
+                        f"{ordem} ({semana})", opcoes,
+                    )
+                nome, pessoas, tempo_min, tempo_max = modelo.resolver(parte, n, escolha)
+
+                minutos = tempo_min
+                if tempo_min < tempo_max:
+                    minutos = widget(
+                        st.number_input, f"{prefixo}_tempo", tempo_min,
+                        f"Tempo para {nome} ({semana})",
+                        min_value=tempo_min, max_value=tempo_max, value=tempo_min,
+                    )
+
+                tipo = tipo_parte(nome)
+                chaves = [f"{prefixo}_resp{k}" for k in range(1, pessoas + 1)]
+                if desenhar:
+                    responsaveis = [
+                        escolher_nome(
+                            f"{nome} - Designado {k} ({semana})" if pessoas > 1 else f"{nome} ({semana})",
+                            tipo, chave,
+                        )
+                        for k, chave in enumerate(chaves, start=1)
+                    ]
+                else:
+                    responsaveis = [ss.get(chave, "") for chave in chaves]
+
+                partes.append((secao.nome, ordem, texto_parte(nome, minutos), tipo, chaves, responsaveis))
+    return partes
 
-        row = ministerio_cfg[ministerio_cfg["Parte"] == parte_escolhida].iloc[0]
-
-        if parte_escolhida == "Discurso":
-            resp = st.selectbox(f"Discurso - Responsável ({semana})", nomes_visiveis, key=f"{semana}_discurso_resp_{i}")
-            dados.append({"Semana": semana, "Secção": "Empenha-se no Ministério", "Ordem": f"Parte {i+1}", "Parte": "Discurso (5 min)", "Responsável": resp})
-
-        else:
-            tempo = st.number_input(
-                f"Tempo para {parte_escolhida} ({semana})",
-                min_value=row["TempoMin"],
-                max_value=row["TempoMax"],
-                value=row["TempoMin"],
-                key=f"{semana}_ministerio_tempo_{i}"
-            )
-
-            resp1 = st.selectbox(f"{parte_escolhida} - Designado 1 ({semana})", nomes_visiveis, key=f"{semana}_ministerio_resp1_{i}")
-            resp2 = st.selectbox(f"{parte_escolhida} - Designado 2 ({semana})", nomes_visiveis, key=f"{semana}_ministerio_resp2_{i}")
-
-            dados.append({
-                "Semana": semana,
-                "Secção": "Empenha-se no Ministério",
-                "Ordem": f"Parte {i+1}",
-                "Parte": f"{parte_escolhida} ({tempo} min)",
-                "Responsável": f"{resp1} / {resp2}"
-            })
-
-    # -------------------------
-    # Viver como Cristãos (COM SEMANA ESPECIAL)
-    # -------------------------
-    st.subheader("Viver como Cristãos")
-
-    semana_especial = st.checkbox(
-        f"Semana Especial ({semana})",
-        key=f"{semana}_especial"
-    )
 
-    num_partes_vc = st.number_input(
-        f"Número de partes variáveis ({semana})",
-        min_value=1,
-        max_value=3,
-        value=1,
-        step=1,
-        key=f"{semana}_num_vc"
+# -------------------------
+# Preenchimento automático
+# -------------------------
+# Vagas da semana segundo o estado atual dos widgets: (tipo de parte, chaves dos selectbox)
+def vagas_da_semana(semana):
+    return [(tipo, chaves) for _, _, _, tipo, chaves, _ in percorrer_semana(semana)]
+
+
+# Preenche os campos vazios; os nomes já escolhidos mantêm-se
+def preencher_automaticamente():
+    ss = st.session_state
+    # Último ano do arquivo, antes das semanas que estão a ser preenchidas
+    historico = congregacao.arquivo.carregar(datas[0] - timedelta(weeks=52), datas[0] - timedelta(days=1))
+    agendador = Agendador(
+        indice_nomes.nomes, historico,
+        elegiveis=indice_nomes.conjuntos(modelo.tipos),
+        referencia=datas[0],
     )
 
-    for i in range(num_partes_vc):
-        tempo = st.number_input(
-            f"Tempo da Parte variável {i+1} ({semana})",
-            min_value=5,
-            max_value=15,
-            value=5,
-            key=f"{semana}_viver_tempo_{i}"
-        )
+    vagas = {semana: vagas_da_semana(semana) for semana in semanas}
+    pedido = [
+        (data, [Vaga(tipo, len(chaves), [ss.get(k, "") for k in chaves]) for tipo, chaves in vagas[semana]])
+        for data, semana in zip(datas, semanas)
+    ]
 
-        resp = st.selectbox(
-            f"Parte variável {i+1} - Designado ({semana})",
-            nomes_visiveis,
-            key=f"{semana}_viver_resp_{i}"
-        )
+    for semana, escolhas in zip(semanas, agendador.agendar(pedido)):
+        for (_, chaves), nomes in zip(vagas[semana], escolhas):
+            novos = iter(nomes[len([k for k in chaves if ss.get(k, "")]):])
+            for k in chaves:
+                if not ss.get(k, ""):
+                    ss[k] = next(novos, "")
 
-        dados.append({
-            "Semana": semana,
-            "Secção": "Viver como Cristãos",
-            "Ordem": f"Parte variável {i+1}",
-            "Parte": f"Parte variável {i+1} ({tempo} min)",
-            "Responsável": resp
-        })
 
-    if semana_especial:
+st.button(
+    "🪄 Preencher automaticamente",
+    on_click=preencher_automaticamente,
+    help="Preenche os campos vazios, distribuindo as partes por igual e por quem as teve há mais tempo."
+)
 
-        resp_ds = st.selectbox(
-            f"Discurso de Serviço ({semana})",
-            nomes_visiveis,
-            key=f"{semana}_discurso_servico"
-        )
+# Designações de cada semana, atualizadas por cada fragmento
+if "designacoes_semanas" not in st.session_state:
+    st.session_state.designacoes_semanas = {}
+designacoes_semanas = st.session_state.designacoes_semanas
 
-        dados.append({
-            "Semana": semana,
-            "Secção": "Viver como Cristãos",
-            "Ordem": "Parte Especial",
-            "Parte": "Discurso de Serviço (30 min)",
-            "Responsável": resp_ds
-        })
+# -------------------------
+# SEMANA (fragmento: uma alteração só volta a correr esta semana)
+# -------------------------
+@st.fragment
+def render_semana(idx, semana):
+    st.header(f"📅 Semana {idx} - {semana}")
 
-    else:
+    designacoes_semanas[semana] = [
+        {"Semana": semana, "Secção": secao, "Ordem": ordem, "Parte": parte, "Responsável": " / ".join(responsaveis)}
+        for secao, ordem, parte, _, _, responsaveis in percorrer_semana(semana, desenhar=True)
+    ]
 
-        resp_estudo = st.selectbox(
-            f"Estudo Bíblico de Congregação ({semana})",
-            nomes_visiveis,
-            key=f"{semana}_estudo_biblico"
-        )
 
-        dados.append({
-            "Semana": semana,
-            "Secção": "Viver como Cristãos",
-            "Ordem": "Parte fixa 1",
-            "Parte": "Estudo Bíblico de Congregação (30 min)",
-            "Responsável": resp_estudo
-        })
-
-        resp_leitor = st.selectbox(
-            f"Leitor do Estudo Bíblico ({semana})",
-            nomes_visiveis,
-            key=f"{semana}_leitor_estudo"
-        )
+for idx, semana in enumerate(semanas, start=1):
+    render_semana(idx, semana)
 
-        dados.append({
-            "Semana": semana,
-            "Secção": "Viver como Cristãos",
-            "Ordem": "Parte fixa 2",
-            "Parte": "Leitor do Estudo Bíblico",
-            "Responsável": resp_leitor
-        })
 
-    # -------------------------
-    # Final da Reunião
-    # -------------------------
-    st.subheader("Final da Reunião")
+# DataFrame consolidado, montado a partir das semanas atuais
+def get_partes_df_final():
+    return pd.DataFrame([linha for semana in semanas for linha in designacoes_semanas.get(semana, [])])
 
-    oracao_final = st.selectbox(f"Oração Final ({semana})", nomes_visiveis, key=f"oracao_final_{semana}")
-    dados.append({"Semana": semana, "Secção": "Final da Reunião", "Ordem": "Encerramento", "Parte": "Oração Final", "Responsável": oracao_final})
 
 # -------------------------
-# Exportação
+# Exportação (fragmento próprio; lê sempre o estado mais recente das semanas)
 # -------------------------
-partes_df_final = pd.DataFrame(dados)
+@st.fragment
+def render_exportacao():
+    st.subheader("Exportação")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        if st.button("💾 Guardar"):
+            df_final = get_partes_df_final()
+            datas_semanas = dict(zip(semanas, datas))
+            congregacao.armazenamento.save_designacoes(df_final)
+            congregacao.arquivo.guardar(df_final, datas_semanas)
+            estatisticas.atualizar(df_final, datas_semanas)
+            st.success("Designações guardadas")
+
+    # Gerados em segundo plano (e guardados no histórico de exportações)
+    filtros = {"Semanas": ", ".join(semanas)}
+    historico = congregacao.historico
+    with col2:
+        st.button(
+            "📥 Exportar CSV",
+            on_click=pedir_exportacao,
+            args=(gerar_csv, get_partes_df_final),
+            kwargs=dict(
+                nome=f"partes_{datas[0]:%Y-%m-%d}.csv", tipo="csv", filtros=filtros,
+                mime="text/csv", historico=historico,
+            ),
+        )
 
-st.subheader("Exportação")
+    with col3:
+        st.button(
+            "📄 Exportar PDF",
+            on_click=pedir_exportacao,
+            args=(gerar_pdf_reuniao, get_partes_df_final),
+            kwargs=dict(
+                nome=f"partes_{datas[0]:%Y-%m-%d}.pdf", tipo="reuniao", filtros=filtros,
+                mime="application/pdf", historico=historico,
+            ),
+        )
 
-col1, col2, col3 = st.columns(3)
+    painel_exportacoes()
 
-with col1:
-    if st.button("💾 Guardar CSV"):
-        partes_df_final.to_csv("partes.csv", index=False)
-        st.success("Guardado como partes.csv")
 
-with col2:
-    st.download_button(
-        "📥 Exportar CSV",
-        data=partes_df_final.to_csv(index=False),
-        file_name="partes.csv",
-        mime="text/csv"
-    )
+render_exportacao()
 
-with col3:
-    pdf_bytes = export_pdf(partes_df_final)
-    st.download_button(
-        "📄 Exportar PDF",
-        data=pdf_bytes,
-        file_name="partes.pdf",
-        mime="application/pdf"
-    )
+medicao.fim_pagina("Reuniões", inicio_execucao)
+painel_medicao()
@@ -0,0 +1,60 @@
+import streamlit as st
+import pandas as pd
+from datetime import date, timedelta
+
+from vmc import medicao
+from vmc.painel import escolher_congregacao, painel_medicao
+
+inicio_execucao = medicao.inicio_pagina()
+
+st.set_page_config(page_title="Estatísticas", page_icon="📊", layout="centered")
+
+st.title("📊 Estatísticas das Designações")
+
+congregacao = escolher_congregacao()
+estatisticas = congregacao.estatisticas
+nomes_df = congregacao.armazenamento.load_nomes()
+nomes_visiveis = nomes_df[nomes_df["Visível"]]["Nome"].tolist()
+
+tipos = estatisticas.tipos()
+if not tipos:
+    st.info("Ainda não existem designações guardadas.")
+    st.stop()
+
+# -------------------------
+# Quem não tem uma parte há algum tempo
+# -------------------------
+st.subheader("Sem esta parte há algum tempo")
+
+col_tipo, col_meses = st.columns([3, 1])
+tipo = col_tipo.selectbox("Parte", tipos, index=tipos.index("Leitura da Bíblia") if "Leitura da Bíblia" in tipos else 0)
+meses = col_meses.number_input("Meses", min_value=1, max_value=24, value=3)
+
+limite = date.today() - timedelta(days=round(meses * 30.44))
+sem_parte = estatisticas.sem_parte_desde(tipo, limite, nomes_visiveis)
+
+if sem_parte:
+    st.dataframe(
+        pd.DataFrame(
+            [(nome, ultima.strftime("%d/%m/%Y") if ultima else "Nunca") for nome, ultima in sem_parte],
+            columns=["Nome", "Última vez"],
+        ),
+        hide_index=True,
+        use_container_width=True,
+    )
+else:
+    st.success(f"Todos tiveram «{tipo}» nos últimos {meses} meses.")
+
+# -------------------------
+# Resumo por pessoa e parte
+# -------------------------
+st.subheader("Resumo por pessoa")
+
+pessoa = st.selectbox("Pessoa", ["Todas"] + nomes_visiveis)
+resumo = pd.DataFrame(estatisticas.resumo())
+if pessoa != "Todas":
+    resumo = resumo[resumo["Pessoa"] == pessoa]
+st.dataframe(resumo, hide_index=True, use_container_width=True)
+
+medicao.fim_pagina("Estatísticas", inicio_execucao)
+painel_medicao()
@@ -0,0 +1,85 @@
+from collections import Counter
+from datetime import date, timedelta
+
+import pandas as pd
+
+from vmc.agendador import Agendador, Vaga
+
+LEITURA = "Leitura da Bíblia"
+
+
+def _semanas(inicio, num, *vagas):
+    return [(inicio + timedelta(weeks=k), [Vaga(tipo, pessoas) for tipo, pessoas in vagas]) for k in range(num)]
+
+
+def _historico(linhas):
+    return pd.DataFrame(linhas, columns=["Data", "Semana", "Secção", "Ordem", "Parte", "Responsável"]).assign(
+        Data=lambda df: pd.to_datetime(df["Data"])
+    )
+
+
+def test_distribui_por_igual():
+    nomes = ["Ana", "Rui", "Eva", "Rita"]
+    resultado = Agendador(nomes, semente=1).agendar(_semanas(date(2026, 1, 5), 8, (LEITURA, 1)))
+    contagem = Counter(vagas[0][0] for vagas in resultado)
+    assert contagem == Counter({nome: 2 for nome in nomes})
+
+
+def test_ninguem_repete_na_mesma_semana():
+    nomes = ["Ana", "Rui", "Eva"]
+    resultado = Agendador(nomes, semente=2).agendar(
+        _semanas(date(2026, 1, 5), 4, (LEITURA, 1), ("Discurso", 1), ("Estudo", 1))
+    )
+    for vagas in resultado:
+        escolhidos = [nome for vaga in vagas for nome in vaga]
+        assert sorted(escolhidos) == sorted(nomes)
+
+
+def test_sem_candidatos_fica_vazio():
+    agendador = Agendador(["Ana", "Rui"], elegiveis={"Discurso": {"Rui"}}, semente=3)
+    resultado = agendador.agendar([(date(2026, 1, 5), [Vaga("Discurso", 2)])])
+    assert resultado == [[["Rui", ""]]]
+
+
+def test_nomes_escolhidos_a_mao_ocupam_a_semana():
+    agendador = Agendador(["Ana", "Rui"], semente=4)
+    resultado = agendador.agendar([(date(2026, 1, 5), [Vaga("Discurso", 1, ["Ana"]), Vaga(LEITURA, 1)])])
+    assert resultado == [[["Ana"], ["Rui"]]]
+
+
+def test_desempate_pela_ultima_vez_na_parte():
+    historico = _historico([
+        ("2025-11-03", "03 Nov", "Tesouros", "3", LEITURA, "Ana"),
+        ("2025-12-22", "22 Dec", "Tesouros", "3", LEITURA, "Rui"),
+    ])
+    agendador = Agendador(["Ana", "Rui"], historico, semente=5)
+    assert agendador.agendar([(date(2026, 1, 5), [Vaga(LEITURA, 1)])]) == [[["Ana"]]]
+
+
+def test_empate_total_decidido_pela_semente():
+    nomes = ["Ana", "Rui", "Eva"]
+    semanas = [(date(2026, 1, 5), [Vaga(LEITURA, 1)])]
+    primeiros = {Agendador(nomes, semente=s).agendar(semanas)[0][0][0] for s in range(20)}
+    assert primeiros == set(nomes)
+    assert Agendador(nomes, semente=7).agendar(semanas) == Agendador(nomes, semente=7).agendar(semanas)
+
+
+def test_historico_do_arquivo_atravessa_o_ano():
+    # "02 Jun" visto de janeiro de 2026 seria junho de 2026; a coluna Data diz 2025
+    historico = _historico([
+        ("2025-06-02", "02 Jun", "Tesouros", "3", LEITURA, "Rui"),
+        ("2025-12-29", "29 Dec", "Tesouros", "3", LEITURA, "Ana"),
+    ])
+    referencia = date(2026, 1, 12)
+    agendador = Agendador(["Ana", "Rui"], historico, referencia=referencia, semente=6)
+    assert agendador.agendar([(referencia, [Vaga(LEITURA, 1)])]) == [[["Rui"]]]
+
+
+def test_historico_sem_data_usa_o_nome_da_semana():
+    historico = _historico([
+        (None, "10 Nov", "Tesouros", "3", LEITURA, "Rui"),
+        (None, "29 Dec", "Tesouros", "3", LEITURA, "Ana"),
+    ]).drop(columns="Data")
+    referencia = date(2026, 1, 12)
+    agendador = Agendador(["Ana", "Rui"], historico, referencia=referencia, semente=8)
+    assert agendador.agendar([(referencia, [Vaga(LEITURA, 1)])]) == [[["Rui"]]]
@@ -0,0 +1,97 @@
+import pandas as pd
+import pytest
+
+from vmc.armazenamento import ArmazenamentoCSV, ArmazenamentoSQLite
+
+
+@pytest.fixture(params=["csv", "sqlite"])
+def armazenamento(request, tmp_path):
+    if request.param == "sqlite":
+        armazenamento = ArmazenamentoSQLite(str(tmp_path / "vmc.db"))
+    else:
+        armazenamento = ArmazenamentoCSV(str(tmp_path / "nomes.csv"), str(tmp_path / "partes.csv"))
+    armazenamento.save_nomes(pd.DataFrame({
+        "Nome": ["Ana", "Rui", "Eva", "Rita"],
+        "Visível": [True, True, False, True],
+        "Partes": ["", "Leitura da Bíblia", "", "Discurso"],
+    }))
+    return armazenamento
+
+
+def _ids(armazenamento):
+    df = armazenamento.load_nomes()
+    return dict(zip(df["Nome"], df.index))
+
+
+def _linhas(armazenamento):
+    df = armazenamento.load_nomes()
+    return sorted(zip(df["Nome"], df["Visível"].astype(bool), df["Partes"]))
+
+
+def test_aplicar_alteracoes(armazenamento):
+    ids = _ids(armazenamento)
+    armazenamento.aplicar_alteracoes(
+        visivel={ids["Eva"]: True, ids["Ana"]: False},
+        renomear={ids["Rui"]: "Rui Costa"},
+        eliminar={ids["Rita"]},
+        partes={ids["Eva"]: ["Discurso", " Leitura da Bíblia ", "Discurso"]},
+    )
+    assert _linhas(armazenamento) == [
+        ("Ana", False, ""),
+        ("Eva", True, "Discurso; Leitura da Bíblia"),
+        ("Rui Costa", True, "Leitura da Bíblia"),
+    ]
+
+
+def test_aplicar_alteracoes_adicionar(armazenamento):
+    ids = _ids(armazenamento)
+    adicionar = pd.DataFrame({"Nome": ["Novo"], "Visível": [False], "Partes": ["Estudo;Estudo"]})
+    armazenamento.aplicar_alteracoes(partes={ids["Ana"]: "Estudo"}, adicionar=adicionar)
+    assert _linhas(armazenamento) == [
+        ("Ana", True, "Estudo"),
+        ("Eva", False, ""),
+        ("Novo", False, "Estudo"),
+        ("Rita", True, "Discurso"),
+        ("Rui", True, "Leitura da Bíblia"),
+    ]
+
+
+def test_aplicar_alteracoes_ignora_ids_inexistentes(armazenamento):
+    antes = _linhas(armazenamento)
+    inexistente = max(_ids(armazenamento).values()) + 100
+    armazenamento.aplicar_alteracoes(
+        visivel={inexistente: False}, renomear={inexistente: "X"}, eliminar={inexistente}
+    )
+    assert _linhas(armazenamento) == antes
+
+
+def test_aplicar_alteracoes_vazio_nao_muda_nada(armazenamento):
+    antes = _linhas(armazenamento)
+    armazenamento.aplicar_alteracoes()
+    assert _linhas(armazenamento) == antes
+
+
+def test_aplicar_alteracoes_rejeita_ids_que_mudaram_de_pessoa(armazenamento):
+    ids = _ids(armazenamento)
+    # Preparado com a lista antiga: esconder o Rui
+    visivel, originais = {ids["Rui"]: False}, {ids["Rui"]: "Rui"}
+    # Entretanto outra sessão elimina a Ana (no CSV, o Rui muda de posição)
+    armazenamento.aplicar_alteracoes(eliminar={ids["Ana"]})
+    antes = _linhas(armazenamento)
+    if _ids(armazenamento)["Rui"] == ids["Rui"]:
+        # SQLite: o id continua a ser do Rui e a alteração é aplicada
+        armazenamento.aplicar_alteracoes(visivel=visivel, originais=originais)
+        assert ("Rui", False, "Leitura da Bíblia") in _linhas(armazenamento)
+        return
+    with pytest.raises(ValueError, match="mudou"):
+        armazenamento.aplicar_alteracoes(visivel=visivel, originais=originais)
+    assert _linhas(armazenamento) == antes
+
+
+def test_aplicar_alteracoes_com_originais_certos(armazenamento):
+    ids = _ids(armazenamento)
+    armazenamento.aplicar_alteracoes(
+        renomear={ids["Eva"]: "Eva Lima"}, eliminar={ids["Rita"]},
+        originais={ids["Eva"]: "Eva", ids["Rita"]: "Rita"},
+    )
+    assert [linha[0] for linha in _linhas(armazenamento)] == ["Ana", "Eva Lima", "Rui"]
@@ -0,0 +1,76 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from vmc.arquivo import ArquivoDesignacoes, limites_mes
+
+
+def _semana(semana, *responsaveis):
+    return pd.DataFrame({
+        "Semana": [semana] * len(responsaveis),
+        "Secção": ["Tesouros"] * len(responsaveis),
+        "Ordem": [str(k) for k in range(len(responsaveis))],
+        "Parte": ["Leitura da Bíblia"] * len(responsaveis),
+        "Responsável": list(responsaveis),
+    })
+
+
+@pytest.fixture(params=["parquet", "csv"])
+def arquivo(request, tmp_path):
+    if request.param == "parquet":
+        pytest.importorskip("pyarrow")
+    return ArquivoDesignacoes(str(tmp_path / "arquivo"), formato=request.param)
+
+
+def test_uma_particao_por_mes(arquivo):
+    df = pd.concat([_semana("26 Jan", "Ana"), _semana("02 Feb", "Rui")])
+    arquivo.guardar(df, {"26 Jan": date(2026, 1, 26), "02 Feb": date(2026, 2, 2)})
+    assert arquivo.meses() == ["2026-01", "2026-02"]
+    assert arquivo.ler_mes("2026-02")["Responsável"].tolist() == ["Rui"]
+
+
+def test_guardar_substitui_so_as_semanas_com_a_mesma_data(arquivo):
+    arquivo.guardar(_semana("05 Jan", "Ana", "Rui"), {"05 Jan": date(2026, 1, 5)})
+    arquivo.guardar(_semana("12 Jan", "Eva"), {"12 Jan": date(2026, 1, 12)})
+    arquivo.guardar(_semana("05 Jan", "Rita"), {"05 Jan": date(2026, 1, 5)})
+    df = arquivo.carregar()
+    assert list(zip(df["Data"].dt.date, df["Responsável"])) == [
+        (date(2026, 1, 5), "Rita"), (date(2026, 1, 12), "Eva"),
+    ]
+
+
+def test_mesmo_nome_de_semana_em_anos_diferentes(arquivo):
+    arquivo.guardar(_semana("05 Jan", "Ana"), {"05 Jan": date(2025, 1, 6)})
+    arquivo.guardar(_semana("05 Jan", "Rui"), {"05 Jan": date(2026, 1, 5)})
+    assert arquivo.meses() == ["2025-01", "2026-01"]
+    assert arquivo.carregar()["Responsável"].tolist() == ["Ana", "Rui"]
+
+
+def test_carregar_intervalo(arquivo):
+    for dia, nome in ((date(2025, 12, 29), "Ana"), (date(2026, 1, 5), "Rui"), (date(2026, 2, 2), "Eva")):
+        semana = f"{dia:%d %b}"
+        arquivo.guardar(_semana(semana, nome), {semana: dia})
+    assert arquivo.meses_entre(date(2026, 1, 1), date(2026, 1, 31)) == ["2026-01"]
+    assert arquivo.carregar(date(2026, 1, 1))["Responsável"].tolist() == ["Rui", "Eva"]
+    assert arquivo.carregar(ate=date(2026, 1, 4))["Responsável"].tolist() == ["Ana"]
+    assert arquivo.carregar(date(2027, 1, 1)).empty
+
+
+def test_versao_muda_com_a_particao(arquivo):
+    arquivo.guardar(_semana("05 Jan", "Ana"), {"05 Jan": date(2026, 1, 5)})
+    antes = arquivo.versao(date(2026, 1, 1), date(2026, 1, 31))
+    outro_mes = arquivo.versao(date(2026, 2, 1), date(2026, 2, 28))
+    arquivo.guardar(_semana("05 Jan", "Rui"), {"05 Jan": date(2026, 1, 5)})
+    assert arquivo.versao(date(2026, 1, 1), date(2026, 1, 31)) != antes
+    assert arquivo.versao(date(2026, 2, 1), date(2026, 2, 28)) == outro_mes
+
+
+def test_importar_semanas_sem_ano(arquivo):
+    arquivo.importar(_semana("29 Dec", "Ana"), referencia=date(2026, 1, 10))
+    assert arquivo.carregar()["Data"].dt.date.tolist() == [date(2025, 12, 29)]
+
+
+def test_limites_mes():
+    assert limites_mes("2026-02") == (date(2026, 2, 1), date(2026, 2, 28))
+    assert limites_mes("2025-12") == (date(2025, 12, 1), date(2025, 12, 31))
@@ -0,0 +1,71 @@
+from datetime import date
+
+import pandas as pd
+
+from vmc.arquivo import ArquivoDesignacoes
+from vmc.estatisticas import EstatisticasDesignacoes, abrir_estatisticas
+
+LEITURA = "Leitura da Bíblia"
+
+
+def _semana(semana, *linhas):
+    return pd.DataFrame(
+        [(semana, "Tesouros", str(k), parte, responsavel) for k, (parte, responsavel) in enumerate(linhas)],
+        columns=["Semana", "Secção", "Ordem", "Parte", "Responsável"],
+    )
+
+
+SEMANAS = {
+    "05 Jan": (date(2026, 1, 5), [(LEITURA, "Ana"), ("Discurso", "Rui")]),
+    "12 Jan": (date(2026, 1, 12), [(LEITURA, "Rui"), ("Iniciando conversas", "Ana / Eva")]),
+    "19 Jan": (date(2026, 1, 19), [(LEITURA, "Ana"), ("Discurso", "Eva")]),
+}
+
+
+def _incremental(caminho):
+    estatisticas = EstatisticasDesignacoes(str(caminho))
+    for semana, (data, linhas) in SEMANAS.items():
+        estatisticas.atualizar(_semana(semana, *linhas), {semana: data})
+    return estatisticas
+
+
+def test_incremental_igual_a_reconstruir(tmp_path):
+    incremental = _incremental(tmp_path / "a.json")
+    df = pd.concat([_semana(s, *linhas) for s, (_, linhas) in SEMANAS.items()], ignore_index=True)
+    reconstruido = EstatisticasDesignacoes(str(tmp_path / "b.json"))
+    reconstruido.reconstruir(df, referencia=date(2026, 1, 20))
+    assert incremental.resumo() == reconstruido.resumo()
+    assert incremental.estatistica("Ana", LEITURA) == (2, date(2026, 1, 19), 14)
+    assert incremental.estatistica("Eva", "Iniciando conversas") == (1, date(2026, 1, 12), None)
+
+
+def test_guardar_a_semana_outra_vez_substitui(tmp_path):
+    estatisticas = _incremental(tmp_path / "e.json")
+    estatisticas.atualizar(_semana("19 Jan", (LEITURA, "Eva")), {"19 Jan": date(2026, 1, 19)})
+    assert estatisticas.estatistica("Ana", LEITURA) == (1, date(2026, 1, 5), None)
+    assert estatisticas.estatistica("Eva", "Discurso") == (0, None, None)
+    assert estatisticas.ultimas(LEITURA) == {"Ana": date(2026, 1, 5), "Rui": date(2026, 1, 12), "Eva": date(2026, 1, 19)}
+
+
+def test_sem_parte_desde(tmp_path):
+    estatisticas = _incremental(tmp_path / "e.json")
+    assert estatisticas.sem_parte_desde(LEITURA, date(2026, 1, 15), ["Ana", "Rui", "Eva"]) == [
+        ("Eva", None), ("Rui", date(2026, 1, 12)),
+    ]
+
+
+def test_outra_instancia_ve_as_escritas(tmp_path):
+    caminho = tmp_path / "e.json"
+    leitor = EstatisticasDesignacoes(str(caminho))
+    assert leitor.resumo() == []
+    _incremental(caminho)
+    assert leitor.tipos() == ["Discurso", "Iniciando conversas", LEITURA]
+
+
+def test_primeira_abertura_reconstroi_do_arquivo_com_as_datas(tmp_path):
+    arquivo = ArquivoDesignacoes(str(tmp_path / "arquivo"))
+    df = _semana("05 Jan", (LEITURA, "Ana"))
+    arquivo.guardar(df, {"05 Jan": date(2025, 1, 6)})
+    arquivo.guardar(df, {"05 Jan": date(2026, 1, 5)})
+    estatisticas = abrir_estatisticas(str(tmp_path / "e.json"), arquivo)
+    assert estatisticas.estatistica("Ana", LEITURA) == (2, date(2026, 1, 5), 364)
@@ -0,0 +1,102 @@
+import os
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+
+from vmc import filtros
+from vmc.filtros import IndiceFiltros, descrever, obter_indice
+from vmc.reuniao import separar_responsaveis
+
+NOMES = ["Ana", "Rui", "Eva", "Rita", "João"]
+SECOES = ["Tesouros", "Ministério", "Vida Cristã"]
+
+
+def _designacoes(semanas=12, semente=0):
+    rng = random.Random(semente)
+    linhas = []
+    for k in range(semanas):
+        dia = date(2025, 12, 1) + timedelta(weeks=k)
+        for ordem in range(4):
+            responsavel = " / ".join(rng.sample(NOMES, rng.choice((1, 1, 2))))
+            linhas.append((dia, f"{dia:%d %b}", rng.choice(SECOES), str(ordem), "Parte", responsavel))
+    df = pd.DataFrame(linhas, columns=["Data", "Semana", "Secção", "Ordem", "Parte", "Responsável"])
+    # Fora de ordem, como depois de juntar vários meses
+    return df.sample(frac=1, random_state=semente).reset_index(drop=True)
+
+
+# O mesmo filtro, linha a linha
+def _esperado(df, de=None, ate=None, semanas=(), secoes=(), responsaveis=()):
+    datas = pd.to_datetime(df["Data"]).dt.date
+    mascara = pd.Series(True, index=df.index)
+    if de is not None:
+        mascara &= datas >= de
+    if ate is not None:
+        mascara &= datas <= ate
+    if semanas:
+        mascara &= datas.isin(semanas)
+    if secoes:
+        mascara &= df["Secção"].isin(secoes)
+    if responsaveis:
+        mascara &= df["Responsável"].map(lambda r: bool(set(separar_responsaveis(r)) & set(responsaveis)))
+    return sorted(map(tuple, df[mascara][["Semana", "Secção", "Ordem", "Responsável"]].astype(str).to_numpy()))
+
+
+def _obtido(resultado):
+    return sorted(map(tuple, resultado[["Semana", "Secção", "Ordem", "Responsável"]].astype(str).to_numpy()))
+
+
+def test_filtrar_igual_ao_filtro_linha_a_linha():
+    df = _designacoes()
+    indice = IndiceFiltros(df)
+    rng = random.Random(1)
+    datas = indice.semanas()
+    for _ in range(200):
+        de = rng.choice([None, *datas])
+        ate = rng.choice([None, *datas])
+        filtro = dict(
+            semanas=rng.sample(datas, rng.randint(0, 3)),
+            secoes=rng.sample(SECOES, rng.randint(0, 2)),
+            responsaveis=rng.sample(NOMES + ["Ninguém"], rng.randint(0, 2)),
+        )
+        assert _obtido(indice.filtrar(de, ate, **filtro)) == _esperado(df, de, ate, **filtro)
+
+
+def test_resultado_ordenado_por_data():
+    resultado = IndiceFiltros(_designacoes()).filtrar(responsaveis=["Ana"])
+    assert resultado["Data"].is_monotonic_increasing
+
+
+def test_opcoes_dos_filtros():
+    indice = IndiceFiltros(_designacoes(semanas=3))
+    assert indice.semanas() == [date(2025, 12, 1), date(2025, 12, 8), date(2025, 12, 15)]
+    assert indice.semanas(date(2025, 12, 2), date(2025, 12, 15)) == [date(2025, 12, 8), date(2025, 12, 15)]
+    assert set(indice.responsaveis()) <= set(NOMES)
+    assert "Ana / Rui" not in indice.responsaveis()
+
+
+def test_sem_coluna_data_usa_o_nome_da_semana():
+    df = _designacoes(semanas=2).drop(columns="Data")
+    indice = IndiceFiltros(df, referencia=date(2025, 12, 10))
+    assert indice.semanas() == [date(2025, 12, 1), date(2025, 12, 8)]
+
+
+def test_indice_construido_uma_vez_por_versao(tmp_path):
+    chamadas = []
+
+    def carregar():
+        chamadas.append(1)
+        return _designacoes(semanas=2)
+
+    versao = (os.path.realpath(tmp_path), (("2025-12", 1, 1),))
+    primeiro = obter_indice(versao, carregar)
+    assert obter_indice(versao, carregar) is primeiro
+    assert len(chamadas) == 1
+    filtros.descartar(str(tmp_path))
+    assert obter_indice(versao, carregar) is not primeiro
+    assert len(chamadas) == 2
+
+
+def test_descrever():
+    assert descrever([]) == "Todos"
+    assert descrever([date(2026, 1, 5)], lambda d: f"{d:%d/%m}") == "05/01"
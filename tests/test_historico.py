@@ -0,0 +1,73 @@
+import logging
+import os
+import time
+
+from vmc.historico import HistoricoExportacoes, OBJETOS
+
+
+def _objetos(pasta):
+    return sorted(os.listdir(os.path.join(pasta, OBJETOS)))
+
+
+def test_conteudo_igual_guardado_uma_vez(tmp_path):
+    historico = HistoricoExportacoes(str(tmp_path))
+    historico.guardar(b"a;b", "partes.csv", "csv", criado=1)
+    historico.guardar(b"a;b", "outro nome.csv", "csv", criado=2)
+    historico.guardar(b"c;d", "partes.csv", "csv", criado=3)
+    assert historico.total() == 2
+    assert len(_objetos(tmp_path)) == 2
+    entradas = historico.listar()
+    assert [e["criado"] for e in entradas] == [3, 2]
+    assert historico.ler(entradas[1]) == b"a;b"
+
+
+def test_listagem_paginada(tmp_path):
+    historico = HistoricoExportacoes(str(tmp_path))
+    for k in range(5):
+        historico.guardar(f"{k}".encode(), f"f{k}.csv", "csv", criado=k)
+    assert [e["nome"] for e in historico.listar(0, 2)] == ["f4.csv", "f3.csv"]
+    assert [e["nome"] for e in historico.listar(2, 2)] == ["f0.csv"]
+
+
+def test_retencao_por_numero_idade_e_tamanho(tmp_path):
+    agora = time.time()
+    historico = HistoricoExportacoes(str(tmp_path), max_ficheiros=3, max_dias=10, max_bytes=25)
+    historico.guardar(b"velho", "velho.csv", "csv", criado=agora - 20 * 86400)
+    for k in range(4):
+        historico.guardar(f"{k}".encode() * 10, f"f{k}.csv", "csv", criado=agora - 4 + k)
+    # velho: idade; f0: número; f1: tamanho (3 x 10 bytes > 25)
+    assert [e["nome"] for e in historico.listar()] == ["f3.csv", "f2.csv"]
+    assert len(_objetos(tmp_path)) == 2
+
+
+def test_duas_instancias_da_mesma_pasta(tmp_path):
+    primeira = HistoricoExportacoes(str(tmp_path))
+    segunda = HistoricoExportacoes(str(tmp_path))
+    primeira.guardar(b"1", "um.csv", "csv")
+    segunda.guardar(b"2", "dois.csv", "csv")
+    assert primeira.total() == segunda.total() == 2
+
+
+def test_migracao_aplica_a_retencao_uma_vez_e_avisa(tmp_path, caplog):
+    agora = time.time()
+    for k in range(4):
+        caminho = tmp_path / f"partes_{k}.csv"
+        caminho.write_bytes(f"linha {k}".encode())
+        os.utime(caminho, (agora - k * 86400, agora - k * 86400))
+    (tmp_path / "modelo_mensal_1.pdf").write_bytes(b"%PDF")
+
+    with caplog.at_level(logging.WARNING, logger="vmc.historico"):
+        historico = HistoricoExportacoes(str(tmp_path), max_ficheiros=3)
+    assert sorted(os.listdir(tmp_path)) == ["indice.json", OBJETOS]
+    assert {e["nome"]: e["tipo"] for e in historico.listar()} == {
+        "modelo_mensal_1.pdf": "mensal", "partes_0.csv": "csv", "partes_1.csv": "csv",
+    }
+    assert "2 de 5" in caplog.text
+
+
+def test_migracao_sem_retencao_nao_avisa(tmp_path, caplog):
+    (tmp_path / "partes_0.csv").write_bytes(b"x")
+    with caplog.at_level(logging.WARNING, logger="vmc.historico"):
+        historico = HistoricoExportacoes(str(tmp_path), max_ficheiros=3)
+    assert historico.total() == 1
+    assert caplog.text == ""
@@ -0,0 +1,94 @@
+import pandas as pd
+import pytest
+
+from vmc.armazenamento import ArmazenamentoCSV
+from vmc.importacao import PlanoImportacao, ler_ficheiro
+
+
+def _existentes():
+    return pd.DataFrame({
+        "Nome": ["Ana", "João Simões", "Rui", "Eva", "Rita", "rita "],
+        "Visível": [True, True, True, False, True, True],
+        "Partes": ["", "", "Leitura da Bíblia", "", "", ""],
+    })
+
+
+def _importados(nomes, **colunas):
+    return pd.DataFrame({"Nome": nomes, **colunas})
+
+
+def test_duplicado_exato_nao_muda_nada():
+    plano = PlanoImportacao(_existentes(), _importados(["Ana", "Rui"]))
+    assert plano.iguais == 2
+    assert plano.adicionar.empty and plano.juntar.empty and plano.conflitos.empty
+    assert plano.total() == 0
+
+
+def test_variantes_de_acentos_e_espacos_sao_a_mesma_pessoa():
+    plano = PlanoImportacao(_existentes(), _importados(["  joao   SIMOES ", "ANA"]))
+    assert plano.adicionar.empty
+    assert plano.iguais == 2
+
+
+def test_duplicados_no_ficheiro_juntam_se():
+    importados = _importados(
+        ["Novo  Nome", "novo nome", "Nóvo Nome", "", "Rui"],
+        Partes=["Estudo", "Discurso", "Estudo", "", "Discurso"],
+    )
+    plano = PlanoImportacao(_existentes(), importados)
+    assert plano.repetidos == 2
+    assert plano.vazios == 1
+    assert plano.adicionar.to_dict("records") == [{"Nome": "Novo Nome", "Visível": True, "Partes": "Estudo; Discurso"}]
+    assert plano.juntar.loc[2, "Partes"] == "Leitura da Bíblia; Discurso"
+
+
+def test_conflitos_so_com_usar_ficheiro():
+    importados = _importados(["joao simoes", "Eva", "Rita"], Partes=["Leitura da Bíblia", "", ""], Visível=["", "sim", "não"])
+    plano = PlanoImportacao(_existentes(), importados)
+    motivos = dict(zip(plano.conflitos["Nome"], plano.conflitos["Motivo"]))
+    assert motivos == {
+        "João Simões": "Partes: todas → Leitura da Bíblia",
+        "Eva": "Visível: não → sim",
+        "Rita": "Corresponde a 2 nomes existentes",
+    }
+    assert plano.alteracoes() == {"visivel": {}, "partes": {}, "adicionar": plano.adicionar, "originais": {}}
+    alteracoes = plano.alteracoes(usar_ficheiro=True)
+    assert alteracoes["visivel"] == {3: True}
+    assert alteracoes["partes"] == {1: "Leitura da Bíblia"}
+    assert alteracoes["originais"] == {3: "Eva", 1: "João Simões"}
+    assert plano.total(usar_ficheiro=True) == 2
+
+
+def test_aplicar_plano(tmp_path):
+    armazenamento = ArmazenamentoCSV(str(tmp_path / "nomes.csv"), str(tmp_path / "partes.csv"))
+    armazenamento.save_nomes(_existentes())
+    importados = _importados(["rui", "Nova", "nova"], Partes=["Discurso", "", ""])
+    plano = PlanoImportacao(armazenamento.load_nomes(), importados)
+    armazenamento.aplicar_alteracoes(**plano.alteracoes())
+    df = armazenamento.load_nomes()
+    assert df["Nome"].tolist() == ["Ana", "João Simões", "Rui", "Eva", "Rita", "rita", "Nova"]
+    assert df.at[2, "Partes"] == "Leitura da Bíblia; Discurso"
+    assert PlanoImportacao(df, importados).total() == 0
+
+
+def test_ler_ficheiro_csv_do_excel():
+    dados = "NOME;Visível;Partes\r\nJoão;sim;Discurso\r\n".encode("cp1252")
+    df = ler_ficheiro(dados, "nomes.csv")
+    assert df.to_dict("records") == [{"Nome": "João", "Visível": "sim", "Partes": "Discurso"}]
+
+
+def test_ler_ficheiro_lista_sem_cabecalho():
+    df = ler_ficheiro("Ana\nRui\n".encode(), "nomes.txt")
+    assert df["Nome"].tolist() == ["Ana", "Rui"]
+
+
+def test_aplicar_plano_desatualizado_e_rejeitado(tmp_path):
+    armazenamento = ArmazenamentoCSV(str(tmp_path / "nomes.csv"), str(tmp_path / "partes.csv"))
+    armazenamento.save_nomes(_existentes())
+    plano = PlanoImportacao(armazenamento.load_nomes(), _importados(["Rui"], Partes=["Discurso"]))
+    # Outra sessão elimina "Ana": o Rui passa da posição 2 para a 1
+    armazenamento.aplicar_alteracoes(eliminar={0})
+    antes = armazenamento.load_nomes()
+    with pytest.raises(ValueError):
+        armazenamento.aplicar_alteracoes(**plano.alteracoes())
+    pd.testing.assert_frame_equal(armazenamento.load_nomes(), antes)
@@ -0,0 +1,107 @@
+import os
+
+from vmc import config
+from vmc.congregacoes import Congregacao
+from vmc.modelo_reuniao import get_modelo
+
+MODELO = """Id,Secção,Ordem,Parte,Pessoas,TempoMin,TempoMax,Quantidade,Máximo,Variante
+presidente,Início,Abertura,Presidente,1,0,0,1,1,
+ministerio,Ministério,Parte {n},,0,0,0,2,3,
+viver,Viver,Parte variável {n},Parte variável {n},1,5,15,1,2,
+estudo,Viver,Parte fixa,Estudo Bíblico,1,30,30,1,1,normal
+servico,Viver,Parte Especial,Discurso de Serviço,1,30,30,1,1,especial
+,Viver,,Linha sem id,1,0,0,1,1,
+"""
+
+PARTES = """Secção,Parte,TempoMin,TempoMax,Pessoas
+Ministério,Iniciar conversas,1,5,2
+Ministério,Discurso,5,5,1
+"""
+
+
+def _ficheiros(pasta, modelo=MODELO, partes=PARTES):
+    modelo_file = os.path.join(pasta, os.path.basename(config.MODELO_FILE))
+    partes_file = os.path.join(pasta, os.path.basename(config.PARTES_FILE))
+    with open(modelo_file, "w", encoding="utf-8") as f:
+        f.write(modelo)
+    with open(partes_file, "w", encoding="utf-8") as f:
+        f.write(partes)
+    return modelo_file, partes_file
+
+
+def test_estrutura(tmp_path):
+    modelo = get_modelo(*_ficheiros(tmp_path))
+    assert [p.id for p in modelo.partes] == ["presidente", "ministerio", "viver", "estudo", "servico"]
+    assert [s.nome for s in modelo.secoes] == ["Início", "Ministério", "Viver"]
+    assert [s.variantes for s in modelo.secoes] == [False, False, True]
+    # Partes do catálogo pela ordem do ficheiro, sem o número das repetidas
+    assert modelo.tipos == (
+        "Presidente", "Iniciar conversas", "Discurso", "Parte variável", "Estudo Bíblico", "Discurso de Serviço",
+    )
+
+
+def test_linhas_mensal(tmp_path):
+    modelo = get_modelo(*_ficheiros(tmp_path))
+    assert modelo.linhas_mensal == (
+        ("Início", "Presidente", "Presidente", False),
+        ("Ministério", "Parte 1", "Parte 1", False),
+        ("Ministério", "Parte 2", "Parte 2", False),
+        ("Ministério", "Parte 3", "Parte 3", True),
+        ("Viver", "Parte variável 1", "Parte variável 1", False),
+        ("Viver", "Parte variável 2", "Parte variável 2", True),
+        ("Viver", "Parte fixa", "Estudo Bíblico", False),
+        ("Viver", "Parte Especial", "Discurso de Serviço", True),
+    )
+
+
+def test_variantes(tmp_path):
+    modelo = get_modelo(*_ficheiros(tmp_path))
+    estudo, servico, viver = modelo.por_id["estudo"], modelo.por_id["servico"], modelo.por_id["viver"]
+    assert estudo.ativa(False) and not estudo.ativa(True)
+    assert servico.ativa(True) and not servico.ativa(False)
+    assert viver.ativa(False) and viver.ativa(True)
+
+
+def test_resolver(tmp_path):
+    modelo = get_modelo(*_ficheiros(tmp_path))
+    ministerio, viver = modelo.por_id["ministerio"], modelo.por_id["viver"]
+    assert modelo.resolver(viver, 2) == ("Parte variável 2", 1, 5, 15)
+    assert modelo.resolver(ministerio, 1, "Iniciar conversas") == ("Iniciar conversas", 2, 1, 5)
+    assert modelo.resolver(ministerio, 2, "Discurso") == ("Discurso", 1, 5, 5)
+    # Escolha que já não está no catálogo: fica o nome, com os valores da linha do modelo
+    assert modelo.resolver(ministerio, 1, "Antiga") == ("Antiga", 1, 0, 0)
+    assert modelo.resolver(ministerio, 1) == ("", 1, 0, 0)
+
+
+def test_compilado_uma_vez_por_versao(tmp_path):
+    modelo_file, partes_file = _ficheiros(tmp_path)
+    modelo = get_modelo(modelo_file, partes_file)
+    assert get_modelo(modelo_file, partes_file) is modelo
+
+    _ficheiros(tmp_path, partes=PARTES + "Ministério,Fazer discípulos,1,5,2\n")
+    novo = get_modelo(modelo_file, partes_file)
+    assert novo is not modelo
+    assert "Fazer discípulos" in novo.tipos
+
+
+def test_congregacao_usa_modelo_da_instalacao(tmp_path):
+    congregacao = Congregacao("norte", str(tmp_path))
+    assert congregacao.modelo_file == config.MODELO_FILE
+    assert congregacao.partes_file == config.PARTES_FILE
+    assert congregacao.modelo is get_modelo()
+
+
+def test_congregacao_com_modelo_proprio(tmp_path):
+    modelo_file, partes_file = _ficheiros(tmp_path)
+    congregacao = Congregacao("norte", str(tmp_path))
+    assert (congregacao.modelo_file, congregacao.partes_file) == (modelo_file, partes_file)
+    assert congregacao.modelo.tipos == get_modelo(modelo_file, partes_file).tipos
+    assert congregacao.modelo.tipos != get_modelo().tipos
+
+
+def test_congregacao_so_com_catalogo_proprio(tmp_path):
+    _, partes_file = _ficheiros(tmp_path)
+    os.remove(os.path.join(tmp_path, os.path.basename(config.MODELO_FILE)))
+    congregacao = Congregacao("norte", str(tmp_path))
+    assert (congregacao.modelo_file, congregacao.partes_file) == (config.MODELO_FILE, partes_file)
+    assert [p.id for p in congregacao.modelo.partes] == [p.id for p in get_modelo().partes]
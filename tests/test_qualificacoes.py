@@ -0,0 +1,90 @@
+import random
+
+import pandas as pd
+
+from vmc.qualificacoes import IndiceNomes, normalizar, obter_indice_nomes
+
+LEITURA = "Leitura da Bíblia"
+DISCURSO = "Discurso"
+
+
+def _nomes(*linhas):
+    return pd.DataFrame(linhas, columns=["Nome", "Visível", "Partes"])
+
+
+NOMES = _nomes(
+    ("João Simões", True, ""),
+    ("Ana Sá", True, LEITURA),
+    ("Rui Silva", True, f"{LEITURA}; {DISCURSO}"),
+    ("Eva Simão", False, DISCURSO),
+    ("Zé", True, DISCURSO),
+    ("", True, ""),
+)
+
+
+def test_normalizar():
+    assert normalizar("  João SIMÕES ") == "joao simoes"
+
+
+def test_elegiveis():
+    indice = IndiceNomes(NOMES)
+    # Invisíveis e nomes vazios ficam de fora; sem qualificações = todas as partes
+    assert indice.nomes == ("João Simões", "Ana Sá", "Rui Silva", "Zé")
+    assert indice.elegiveis(LEITURA) == ("João Simões", "Ana Sá", "Rui Silva")
+    assert indice.elegiveis(DISCURSO) == ("João Simões", "Rui Silva", "Zé")
+    assert indice.elegiveis("Oração Final") == ("João Simões",)
+    assert indice.conjuntos([DISCURSO]) == {DISCURSO: frozenset({"João Simões", "Rui Silva", "Zé"})}
+
+
+def test_sem_coluna_partes():
+    indice = IndiceNomes(NOMES[["Nome", "Visível"]])
+    assert indice.elegiveis(DISCURSO) == indice.nomes
+
+
+def test_procurar():
+    indice = IndiceNomes(NOMES)
+    assert indice.procurar("si") == ["João Simões", "Rui Silva"]
+    assert indice.procurar("SIMOES") == ["João Simões"]
+    assert indice.procurar("joao s") == ["João Simões"]
+    assert indice.procurar("sa") == ["Ana Sá"]
+    assert indice.procurar("mões") == []
+    assert indice.procurar("eva") == []
+    assert indice.procurar("  ") == list(indice.nomes)
+    # Pesquisa dentro das opções já filtradas, pela ordem delas
+    assert indice.procurar("s", ("Rui Silva", "Ana Sá")) == ["Rui Silva", "Ana Sá"]
+
+
+def test_igual_a_pesquisa_direta():
+    rng = random.Random(0)
+    nomes = ["Álvaro", "Ana", "André", "Inês", "Simão", "Silva", "Sá", "Sousa", "Vítor", "Oliveira"]
+    tipos = [LEITURA, DISCURSO, "Oração Final", "Iniciar conversas"]
+    completos = dict.fromkeys(" ".join(rng.sample(nomes, rng.randint(1, 3))) for _ in range(300))
+    linhas = [
+        (nome, rng.random() < 0.9, "; ".join(rng.sample(tipos, rng.randint(0, 2))))
+        for nome in completos
+    ]
+    indice = IndiceNomes(_nomes(*linhas))
+
+    visiveis = [n for n, v, _ in linhas if v]
+    partes = {n: set(p.split("; ")) - {""} for n, _, p in linhas}
+    for tipo in tipos:
+        assert indice.elegiveis(tipo) == tuple(n for n in visiveis if not partes[n] or tipo in partes[n])
+
+    for texto in ["a", "an", "si", "sá", "SOUSA", "vitor o", "oli", "x", "ana s"]:
+        chave = normalizar(texto)
+        esperado = [
+            n for n in visiveis
+            if any(" ".join(normalizar(n).split()[i:]).startswith(chave) for i in range(len(n.split())))
+        ]
+        assert indice.procurar(texto) == esperado
+
+
+def test_indice_por_versao_da_lista():
+    indice = obter_indice_nomes(NOMES)
+    assert obter_indice_nomes(NOMES.copy()) is indice
+
+    alterada = NOMES.copy()
+    alterada.loc[3, "Visível"] = True
+    outro = obter_indice_nomes(alterada)
+    assert outro is not indice
+    assert "Eva Simão" in outro.nomes
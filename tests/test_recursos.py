@@ -0,0 +1,53 @@
+import io
+import os
+
+import pandas as pd
+import pytest
+from fontTools import ttLib
+
+from vmc import config, documentos
+
+pypdf = pytest.importorskip("pypdf")
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _designacoes():
+    return pd.DataFrame({
+        "Semana": ["05 Jan", "05 Jan", "12 Jan", "12 Jan"],
+        "Secção": ["Tesouros da Palavra de Deus", "Faça Seu Melhor no Ministério"] * 2,
+        "Ordem": ["3", "4", "3", "4"],
+        "Parte": ["Leitura da Bíblia", "Iniciando conversas", "Leitura da Bíblia", "Cultivando o interesse"],
+        "Responsável": ["João Simões", "Ana / Rita Gonçalves", "Çé Ãõ", "Rui"],
+    })
+
+
+# Texto de cada página e, por fonte embebida, os glifos e as larguras
+def _conteudo(dados):
+    leitor = pypdf.PdfReader(io.BytesIO(dados))
+    textos = [pagina.extract_text() for pagina in leitor.pages]
+    fontes = {}
+    for pagina in leitor.pages:
+        for fonte in pagina["/Resources"]["/Font"].values():
+            fonte = fonte.get_object()
+            descritor = fonte["/DescendantFonts"][0].get_object()["/FontDescriptor"].get_object()
+            ttf = ttLib.TTFont(io.BytesIO(descritor["/FontFile2"].get_object().get_data()))
+            fontes[str(fonte["/BaseFont"]).split("+")[-1]] = {
+                nome: ttf["hmtx"][nome][0] for nome in ttf.getGlyphOrder()
+            }
+    return textos, fontes
+
+
+@pytest.mark.parametrize("gerar", [documentos.gerar_pdf_lista, documentos.gerar_pdf_mensal])
+def test_pdf_otimizado_tem_o_mesmo_texto_e_glifos(gerar, monkeypatch):
+    monkeypatch.chdir(RAIZ)
+    df = _designacoes()
+    monkeypatch.setattr(config, "PDF_OTIMIZAR", False)
+    normal = gerar(df)
+    monkeypatch.setattr(config, "PDF_OTIMIZAR", True)
+    otimizado = gerar(df)
+
+    textos, fontes = _conteudo(normal)
+    assert _conteudo(otimizado) == (textos, fontes)
+    assert "João Simões" in "".join(textos)
+    assert len(otimizado) <= len(normal)
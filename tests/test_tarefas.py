@@ -0,0 +1,113 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from vmc import tarefas
+from vmc.historico import HistoricoExportacoes
+from vmc.tarefas import CONCLUIDA, ERRO, FilaExportacoes
+
+DF = pd.DataFrame({"Nome": ["Ana", "Rui"], "Parte": ["Leitura", "Discurso"]})
+
+_liberar = threading.Event()
+_iniciada = threading.Event()
+_chamadas = []
+
+
+def _gerar(df, titulo=""):
+    _chamadas.append(titulo)
+    _iniciada.set()
+    _liberar.wait(5)
+    return f"{titulo}:{len(df)}".encode()
+
+
+def _falhar(df):
+    raise ValueError("sem dados")
+
+
+@pytest.fixture
+def fila():
+    _liberar.set()
+    _chamadas.clear()
+    fila = FilaExportacoes(trabalhadores=1)
+    yield fila
+    _liberar.set()
+    fila._executor.shutdown(wait=True)
+
+
+def test_pedidos_iguais_dao_a_mesma_tarefa(fila):
+    _liberar.clear()
+    tarefa = fila.submeter(_gerar, DF, "Lista", nome="lista.pdf", tipo="pdf")
+    assert fila.submeter(_gerar, DF.copy(), "Lista", nome="lista.pdf", tipo="pdf") is tarefa
+    outra = fila.submeter(_gerar, DF, "Mensal", nome="mensal.pdf", tipo="pdf")
+    assert outra is not tarefa
+    _liberar.set()
+
+    assert tarefa.esperar(5) and outra.esperar(5)
+    assert tarefa.estado == CONCLUIDA and tarefa.dados == b"Lista:2"
+    assert tarefa.duracao() >= 0
+    assert _chamadas == ["Lista", "Mensal"]
+    # Terminada há pouco: o mesmo pedido continua a dar a mesma tarefa
+    assert fila.submeter(_gerar, DF, "Lista", nome="lista.pdf", tipo="pdf") is tarefa
+    assert fila.obter(tarefa.id) is tarefa
+    assert fila.obter(999) is None
+
+
+def test_historicos_diferentes_nao_partilham_tarefas(fila, tmp_path):
+    norte = HistoricoExportacoes(str(tmp_path / "norte"))
+    sul = HistoricoExportacoes(str(tmp_path / "sul"))
+    a = fila.submeter(_gerar, DF, "Lista", nome="lista.pdf", tipo="pdf", historico=norte)
+    b = fila.submeter(_gerar, DF, "Lista", nome="lista.pdf", tipo="pdf", historico=sul)
+    assert a is not b
+    assert a.esperar(5) and b.esperar(5)
+    assert norte.total() == sul.total() == 1
+
+
+def test_terminar_guarda_no_historico(fila, tmp_path):
+    historico = HistoricoExportacoes(str(tmp_path))
+    tarefa = fila.submeter(
+        _gerar, DF, "Lista", nome="lista.pdf", tipo="pdf", filtros={"Parte": ["Leitura"]}, historico=historico
+    )
+    assert tarefa.esperar(5)
+    [entrada] = historico.listar()
+    assert (entrada["nome"], entrada["tipo"], entrada["filtros"]) == ("lista.pdf", "pdf", {"Parte": ["Leitura"]})
+    assert historico.ler(entrada) == b"Lista:2"
+
+
+def test_historico_da_fila_por_omissao(tmp_path):
+    _liberar.set()
+    fila = FilaExportacoes(trabalhadores=1, historico=HistoricoExportacoes(str(tmp_path)))
+    try:
+        assert fila.submeter(_gerar, DF, "Lista", nome="lista.pdf", tipo="pdf").esperar(5)
+    finally:
+        fila._executor.shutdown(wait=True)
+    assert fila.historico.total() == 1
+
+
+def test_erro_fica_na_tarefa_e_novo_pedido_repete(fila, tmp_path):
+    historico = HistoricoExportacoes(str(tmp_path))
+    tarefa = fila.submeter(_falhar, DF, nome="lista.pdf", tipo="pdf", historico=historico)
+    assert tarefa.esperar(5)
+    assert tarefa.estado == ERRO and tarefa.erro == "sem dados" and tarefa.dados is None
+    assert historico.total() == 0
+
+    nova = fila.submeter(_falhar, DF, nome="lista.pdf", tipo="pdf", historico=historico)
+    assert nova is not tarefa
+    assert nova.esperar(5)
+
+
+def test_terminadas_antigas_sao_descartadas(fila, monkeypatch):
+    monkeypatch.setattr(tarefas, "MAX_CONCLUIDAS", 2)
+    pedidas = [fila.submeter(_gerar, DF, str(k), nome=f"{k}.pdf", tipo="pdf") for k in range(4)]
+    assert all(t.esperar(5) for t in pedidas)
+    # Com um só trabalhador, a tarefa seguinte só começa depois de a
+    # anterior ter passado por _terminar (e descartado as antigas)
+    _liberar.clear()
+    _iniciada.clear()
+    seguinte = fila.submeter(_gerar, DF, "seguinte", nome="seguinte.pdf", tipo="pdf")
+    assert _iniciada.wait(5)
+    assert [fila.obter(t.id) for t in pedidas] == [None, None, pedidas[2], pedidas[3]]
+    # A chave da descartada também sai: o mesmo pedido gera outra vez
+    assert fila.submeter(_gerar, DF, "0", nome="0.pdf", tipo="pdf") is not pedidas[0]
+    _liberar.set()
+    assert seguinte.esperar(5)
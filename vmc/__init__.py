@@ -0,0 +1 @@
+# Código partilhado entre as páginas da App VMC.
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+from vmc.reuniao import data_semana, separar_responsaveis, tipo_parte
+
+# Pesos da pontuação de cada candidato
+PESO_INTERVALO = 1.0   # por semana desde a última vez nesta parte
+PESO_TOTAL = 2.0       # por parte já atribuída (qualquer tipo)
+PESO_TIPO = 4.0        # por vez já atribuída nesta parte
+MAX_INTERVALO = 52     # semanas; acima disto conta como "há muito tempo"
+
+
+# -------------------------
+# Uma vaga numa semana: tipo de parte, nº de pessoas e nomes já escolhidos
+# -------------------------
+class Vaga:
+    __slots__ = ("tipo", "pessoas", "atuais")
+
+    def __init__(self, tipo, pessoas=1, atuais=None):
+        self.tipo = tipo
+        self.pessoas = pessoas
+        self.atuais = [n for n in (atuais or []) if n]
+
+
+_EPOCA = pd.Timestamp("1970-01-01")
+
+
+def _semana_num(data):
+    return data.toordinal() // 7
+
+
+# -------------------------
+# Agendador: preenche as vagas de várias semanas de uma vez.
+#
+# Restrições: ninguém repete na mesma semana; só pessoas elegíveis para a parte.
+# Objetivos: distribuir as partes por igual e dar cada parte a quem a teve há mais tempo.
+# -------------------------
+class Agendador:
+    def __init__(self, nomes, historico=None, elegiveis=None, referencia=None, semente=None):
+        self.nomes = list(dict.fromkeys(n for n in nomes if n))
+        self.pos = {n: i for i, n in enumerate(self.nomes)}
+        self.elegiveis = elegiveis
+        self.rng = np.random.default_rng(semente)
+
+        self.tipos = {}
+        n = len(self.nomes)
+        self.total = np.zeros(n)
+        self._ultimo = []     # por tipo: semana da última atribuição (-inf = nunca)
+        self._contagem = []   # por tipo: nº de atribuições
+        self._mascara = []    # por tipo: elegibilidade
+
+        if historico is not None and not historico.empty:
+            self._carregar_historico(historico, referencia)
+
+    def _tipo(self, tipo):
+        t = self.tipos.get(tipo)
+        if t is None:
+            t = self.tipos[tipo] = len(self.tipos)
+            n = len(self.nomes)
+            self._ultimo.append(np.full(n, -np.inf))
+            self._contagem.append(np.zeros(n))
+            if self.elegiveis is not None and tipo in self.elegiveis:
+                permitidos = self.elegiveis[tipo]
+                self._mascara.append(np.array([nome in permitidos for nome in self.nomes]))
+            else:
+                self._mascara.append(np.ones(n, dtype=bool))
+        return t
+
+    # -------------------------
+    # Histórico: última semana e contagens por (tipo, pessoa), de forma vetorizada
+    # -------------------------
+    def _carregar_historico(self, df, referencia):
+        if "Data" in df.columns:
+            # Arquivo: a data real de cada semana
+            dias = (pd.to_datetime(df["Data"]) - _EPOCA).dt.days + _EPOCA.toordinal()
+            semanas = (dias // 7).to_numpy()
+        else:
+            # partes.csv antigo: semanas sem ano, data deduzida do nome
+            semanas = [
+                _semana_num(d) if d else None
+                for d in (data_semana(s, referencia) for s in df["Semana"].astype(str))
+            ]
+        hist = pd.DataFrame({
+            "semana": semanas,
+            "tipo": df["Parte"].map(tipo_parte),
+            "nome": df["Responsável"].map(separar_responsaveis),
+        }).explode("nome").dropna()
+        hist = hist[hist["nome"].isin(self.pos)]
+        if hist.empty:
+            return
+
+        hist["pos"] = hist["nome"].map(self.pos).astype(int)
+        np.add.at(self.total, hist["pos"].to_numpy(), 1)
+
+        agregado = hist.groupby(["tipo", "pos"])["semana"].agg(["max", "size"]).reset_index()
+        for tipo, grupo in agregado.groupby("tipo"):
+            t = self._tipo(tipo)
+            pos = grupo["pos"].to_numpy()
+            self._ultimo[t][pos] = grupo["max"].to_numpy(dtype=float)
+            self._contagem[t][pos] = grupo["size"].to_numpy(dtype=float)
+
+    def _atribuir(self, t, i, semana):
+        self._ultimo[t][i] = max(self._ultimo[t][i], semana)
+        self._contagem[t][i] += 1
+        self.total[i] += 1
+
+    # -------------------------
+    # semanas: lista de (data, [Vaga, ...]).
+    # Devolve, por semana, a lista de nomes de cada vaga ("" quando não há ninguém disponível).
+    # -------------------------
+    def agendar(self, semanas):
+        resultado = []
+        n = len(self.nomes)
+        for data, vagas in semanas:
+            semana = _semana_num(data)
+            livre = np.ones(n, dtype=bool)
+
+            # Nomes já escolhidos à mão ocupam a semana
+            for vaga in vagas:
+                for nome in vaga.atuais:
+                    if nome in self.pos:
+                        livre[self.pos[nome]] = False
+
+            nomes_semana = []
+            for vaga in vagas:
+                t = self._tipo(vaga.tipo)
+                escolhidos = list(vaga.atuais)
+                for nome in vaga.atuais:
+                    if nome in self.pos:
+                        self._atribuir(t, self.pos[nome], semana)
+
+                while len(escolhidos) < vaga.pessoas:
+                    candidatos = livre & self._mascara[t]
+                    if n == 0 or not candidatos.any():
+                        escolhidos.append("")
+                        continue
+                    intervalo = np.minimum(semana - self._ultimo[t], MAX_INTERVALO)
+                    pontos = (
+                        PESO_INTERVALO * intervalo
+                        - PESO_TOTAL * self.total
+                        - PESO_TIPO * self._contagem[t]
+                        + self.rng.random(n)  # desempate aleatório
+                    )
+                    pontos[~candidatos] = -np.inf
+                    i = int(np.argmax(pontos))
+                    livre[i] = False
+                    self._atribuir(t, i, semana)
+                    escolhidos.append(self.nomes[i])
+
+                nomes_semana.append(escolhidos)
+            resultado.append(nomes_semana)
+        return resultado
@@ -0,0 +1,294 @@
+import os
+import sqlite3
+from contextlib import closing, contextmanager
+
+import pandas as pd
+
+from vmc import cache, config, ficheiros, medicao
+
+COLUNAS_NOMES = ["Nome", "Visível", "Partes"]
+COLUNAS_DESIGNACOES = ["Semana", "Secção", "Ordem", "Parte", "Responsável"]
+
+
+def _normalizar_nomes(df):
+    if "Nome" not in df.columns:
+        df["Nome"] = ""
+    if "Visível" not in df.columns:
+        df["Visível"] = True
+    df["Nome"] = df["Nome"].fillna("").astype(str).str.strip()
+    df["Visível"] = df["Visível"].astype(str).str.strip().str.lower().isin(["true", "1", "sim", "yes"])
+    # Partes que a pessoa pode fazer, separadas por ";" (vazio = todas)
+    if "Partes" not in df.columns:
+        df["Partes"] = ""
+    df["Partes"] = df["Partes"].fillna("").astype(str).map(juntar_partes)
+    return df[COLUNAS_NOMES]
+
+
+# "Leitura da Bíblia; Discurso" <-> ["Leitura da Bíblia", "Discurso"]
+def separar_partes(texto):
+    return [p.strip() for p in str(texto).split(";") if p.strip()]
+
+
+def juntar_partes(partes):
+    if isinstance(partes, str):
+        partes = separar_partes(partes)
+    return "; ".join(dict.fromkeys(str(p).strip() for p in partes if str(p).strip()))
+
+
+# Escrita atómica, com o lock do ficheiro (as sessões do Streamlit são threads do mesmo processo)
+def _escrever_csv(df, caminho):
+    with ficheiros.lock(caminho), ficheiros.escrita_atomica(caminho) as tmp:
+        df.to_csv(tmp, index=False)
+
+
+# As alterações preparadas numa sessão referem ids (no CSV, posições).
+# originais = {id: nome quando a alteração foi feita}: se outra sessão
+# entretanto mudou a lista, nada é aplicado.
+def _verificar_originais(atuais, originais):
+    if not originais:
+        return
+    esperados = pd.Series(originais, dtype=object)
+    mudaram = esperados[atuais.reindex(esperados.index).ne(esperados)]
+    if len(mudaram):
+        nomes = ", ".join(mudaram.astype(str).head(5))
+        raise ValueError(f"A lista de nomes mudou entretanto ({len(mudaram)} nomes: {nomes}).")
+
+
+# -------------------------
+# Armazenamento em CSV (formato original)
+# Os ids dos nomes são as posições das linhas no ficheiro.
+# -------------------------
+class ArmazenamentoCSV:
+    def __init__(self, nomes_file, designacoes_file):
+        self.nomes_file = nomes_file
+        self.designacoes_file = designacoes_file
+
+    @medicao.medido("carregar")
+    def load_nomes(self):
+        return cache.carregar("nomes", [self.nomes_file], self._ler_nomes)
+
+    def _ler_nomes(self):
+        if os.path.exists(self.nomes_file):
+            return _normalizar_nomes(pd.read_csv(self.nomes_file))
+        return pd.DataFrame(columns=COLUNAS_NOMES)
+
+    @medicao.medido("guardar")
+    def save_nomes(self, df):
+        _escrever_csv(df[COLUNAS_NOMES], self.nomes_file)
+
+    # Ler, alterar e escrever sem outra sessão pelo meio
+    def adicionar_nome(self, nome):
+        with ficheiros.lock(self.nomes_file):
+            df = self.load_nomes()
+            df.loc[len(df)] = [nome, True, ""]
+            self.save_nomes(df)
+
+    # Várias alterações numa única escrita (adicionar: DataFrame com COLUNAS_NOMES)
+    @medicao.medido("guardar")
+    def aplicar_alteracoes(
+        self, visivel=None, renomear=None, eliminar=(), partes=None, adicionar=None, originais=None
+    ):
+        with ficheiros.lock(self.nomes_file):
+            self._aplicar_alteracoes(visivel, renomear, eliminar, partes, adicionar, originais)
+
+    def _aplicar_alteracoes(self, visivel, renomear, eliminar, partes, adicionar, originais):
+        df = self.load_nomes()
+        _verificar_originais(df["Nome"], originais)
+        if partes:
+            partes = {i: juntar_partes(p) for i, p in partes.items()}
+        for coluna, valores in (("Visível", visivel), ("Nome", renomear), ("Partes", partes)):
+            if valores:
+                valores = pd.Series(valores)
+                valores = valores[valores.index.isin(df.index)]
+                df.loc[valores.index, coluna] = valores
+        df = df.drop(index=list(eliminar), errors="ignore")
+        if adicionar is not None and len(adicionar):
+            df = pd.concat([df, adicionar[COLUNAS_NOMES]], ignore_index=True)
+        self.save_nomes(df)
+
+    @medicao.medido("carregar")
+    def load_designacoes(self):
+        return cache.carregar("designacoes", [self.designacoes_file], self._ler_designacoes)
+
+    def _ler_designacoes(self):
+        if os.path.exists(self.designacoes_file):
+            return pd.read_csv(self.designacoes_file)
+        return pd.DataFrame(columns=COLUNAS_DESIGNACOES)
+
+    @medicao.medido("guardar")
+    def save_designacoes(self, df):
+        _escrever_csv(df, self.designacoes_file)
+
+
+# -------------------------
+# Armazenamento em SQLite (WAL, escritas transacionais linha a linha)
+# -------------------------
+class ArmazenamentoSQLite:
+    def __init__(self, db_file, nomes_csv=None, designacoes_csv=None):
+        self.db_file = db_file
+        with self._ligar() as con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.executescript("""
+                CREATE TABLE IF NOT EXISTS nomes (
+                    id INTEGER PRIMARY KEY,
+                    nome TEXT NOT NULL,
+                    visivel INTEGER NOT NULL DEFAULT 1,
+                    partes TEXT NOT NULL DEFAULT ''
+                );
+                CREATE INDEX IF NOT EXISTS idx_nomes_nome ON nomes(nome);
+
+                CREATE TABLE IF NOT EXISTS designacoes (
+                    id INTEGER PRIMARY KEY,
+                    semana TEXT NOT NULL,
+                    secao TEXT NOT NULL,
+                    ordem TEXT,
+                    parte TEXT,
+                    responsavel TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_designacoes_semana ON designacoes(semana);
+                CREATE INDEX IF NOT EXISTS idx_designacoes_secao ON designacoes(secao);
+            """)
+            # Bases de dados anteriores às qualificações
+            colunas = {linha[1] for linha in con.execute("PRAGMA table_info(nomes)")}
+            if "partes" not in colunas:
+                con.execute("ALTER TABLE nomes ADD COLUMN partes TEXT NOT NULL DEFAULT ''")
+            vazio = con.execute("SELECT NOT EXISTS (SELECT 1 FROM nomes)").fetchone()[0]
+
+        # Primeira utilização: importa os CSV existentes
+        if vazio:
+            self.importar_csv(nomes_csv, designacoes_csv)
+
+    @contextmanager
+    def _ligar(self):
+        with closing(sqlite3.connect(self.db_file, timeout=10)) as con:
+            con.execute("PRAGMA busy_timeout=10000")
+            with con:
+                yield con
+
+    # Ficheiros que mudam a cada escrita (a base de dados e o WAL)
+    def _ficheiros(self):
+        return [self.db_file, f"{self.db_file}-wal"]
+
+    @contextmanager
+    def _escrever(self):
+        try:
+            with self._ligar() as con:
+                yield con
+        finally:
+            cache.invalidar(*self._ficheiros())
+
+    # -------------------------
+    # Nomes
+    # -------------------------
+    @medicao.medido("carregar")
+    def load_nomes(self):
+        return cache.carregar("nomes", self._ficheiros(), self._ler_nomes)
+
+    def _ler_nomes(self):
+        with self._ligar() as con:
+            linhas = con.execute("SELECT id, nome, visivel, partes FROM nomes ORDER BY id").fetchall()
+        df = pd.DataFrame(linhas, columns=["id", "Nome", "Visível", "Partes"]).set_index("id")
+        df["Visível"] = df["Visível"].astype(bool)
+        df.index.name = None
+        return df
+
+    @medicao.medido("guardar")
+    def save_nomes(self, df):
+        with self._escrever() as con:
+            con.execute("DELETE FROM nomes")
+            con.executemany(
+                "INSERT INTO nomes (nome, visivel, partes) VALUES (?, ?, ?)",
+                zip(
+                    df["Nome"].astype(str),
+                    df["Visível"].astype(bool).astype(int),
+                    df["Partes"].fillna("").map(juntar_partes) if "Partes" in df.columns else [""] * len(df),
+                ),
+            )
+
+    def adicionar_nome(self, nome):
+        with self._escrever() as con:
+            con.execute("INSERT INTO nomes (nome, visivel) VALUES (?, 1)", (nome,))
+
+    # Várias alterações numa única transação
+    @medicao.medido("guardar")
+    def aplicar_alteracoes(
+        self, visivel=None, renomear=None, eliminar=(), partes=None, adicionar=None, originais=None
+    ):
+        with self._escrever() as con:
+            if originais:
+                # A verificação e as escritas na mesma transação
+                con.execute("BEGIN IMMEDIATE")
+                atuais = dict(con.execute("SELECT id, nome FROM nomes").fetchall())
+                _verificar_originais(pd.Series(atuais, dtype=object), originais)
+            if visivel:
+                con.executemany(
+                    "UPDATE nomes SET visivel = ? WHERE id = ?",
+                    [(int(v), int(i)) for i, v in visivel.items()],
+                )
+            if renomear:
+                con.executemany(
+                    "UPDATE nomes SET nome = ? WHERE id = ?",
+                    [(str(n), int(i)) for i, n in renomear.items()],
+                )
+            if partes:
+                con.executemany(
+                    "UPDATE nomes SET partes = ? WHERE id = ?",
+                    [(juntar_partes(p), int(i)) for i, p in partes.items()],
+                )
+            if eliminar:
+                con.executemany("DELETE FROM nomes WHERE id = ?", [(int(i),) for i in eliminar])
+            if adicionar is not None and len(adicionar):
+                con.executemany(
+                    "INSERT INTO nomes (nome, visivel, partes) VALUES (?, ?, ?)",
+                    zip(
+                        adicionar["Nome"].astype(str),
+                        adicionar["Visível"].astype(bool).astype(int),
+                        adicionar["Partes"].fillna("").map(juntar_partes),
+                    ),
+                )
+
+    # -------------------------
+    # Designações
+    # -------------------------
+    @medicao.medido("carregar")
+    def load_designacoes(self):
+        return cache.carregar("designacoes", self._ficheiros(), self._ler_designacoes)
+
+    def _ler_designacoes(self):
+        with self._ligar() as con:
+            linhas = con.execute(
+                "SELECT semana, secao, ordem, parte, responsavel FROM designacoes ORDER BY id"
+            ).fetchall()
+        return pd.DataFrame(linhas, columns=COLUNAS_DESIGNACOES)
+
+    @medicao.medido("guardar")
+    def save_designacoes(self, df):
+        df = df.reindex(columns=COLUNAS_DESIGNACOES).fillna("").astype(str)
+        with self._escrever() as con:
+            con.execute("DELETE FROM designacoes")
+            con.executemany(
+                "INSERT INTO designacoes (semana, secao, ordem, parte, responsavel) VALUES (?, ?, ?, ?, ?)",
+                df.itertuples(index=False, name=None),
+            )
+
+    # -------------------------
+    # Compatibilidade com os CSV
+    # -------------------------
+    def importar_csv(self, nomes_csv=None, designacoes_csv=None):
+        if nomes_csv and os.path.exists(nomes_csv):
+            self.save_nomes(_normalizar_nomes(pd.read_csv(nomes_csv)))
+        if designacoes_csv and os.path.exists(designacoes_csv):
+            self.save_designacoes(pd.read_csv(designacoes_csv))
+
+    def exportar_csv(self, nomes_csv, designacoes_csv):
+        _escrever_csv(self.load_nomes(), nomes_csv)
+        _escrever_csv(self.load_designacoes(), designacoes_csv)
+
+
+# -------------------------
+# Armazenamento configurado (VMC_ARMAZENAMENTO=csv|sqlite) para um conjunto de ficheiros
+# -------------------------
+def criar_armazenamento(nomes_file, designacoes_file, sqlite_file):
+    if config.ARMAZENAMENTO == "sqlite":
+        return ArmazenamentoSQLite(sqlite_file, nomes_file, designacoes_file)
+    return ArmazenamentoCSV(nomes_file, designacoes_file)
@@ -0,0 +1,151 @@
+import os
+import re
+from datetime import date, timedelta
+
+import pandas as pd
+
+from vmc import cache, config, ficheiros, medicao
+from vmc.reuniao import data_semana
+
+COLUNAS = ["Data", "Semana", "Secção", "Ordem", "Parte", "Responsável"]
+_PARTICAO = re.compile(r"^(\d{4}-\d{2})\.(parquet|csv)$")
+
+
+# Parquet quando o pyarrow está instalado (vem com o streamlit); senão CSV
+def _formato():
+    if config.ARQUIVO_FORMATO:
+        return config.ARQUIVO_FORMATO
+    try:
+        import pyarrow  # noqa: F401
+        return "parquet"
+    except ImportError:
+        return "csv"
+
+
+def _vazio():
+    df = pd.DataFrame(columns=COLUNAS)
+    df["Data"] = pd.to_datetime(df["Data"])
+    return df
+
+
+# Primeiro e último dia de um mês "AAAA-MM"
+def limites_mes(mes):
+    ano, num = (int(x) for x in mes.split("-"))
+    inicio = date(ano, num, 1)
+    fim = date(ano + num // 12, num % 12 + 1, 1) - timedelta(days=1)
+    return inicio, fim
+
+
+# -------------------------
+# Arquivo de todas as designações, uma partição por mês:
+#
+# pasta/AAAA-MM.parquet  (Data, Semana, Secção, Ordem, Parte, Responsável)
+#
+# Guardar um mês reescreve apenas a partição desse mês; as leituras
+# por intervalo de datas só abrem as partições necessárias.
+# O lock é o da pasta: partilhado por todas as instâncias do mesmo arquivo.
+# -------------------------
+class ArquivoDesignacoes:
+    def __init__(self, pasta, formato=None):
+        self.pasta = pasta
+        self.formato = formato or _formato()
+        os.makedirs(pasta, exist_ok=True)
+        self._lock = ficheiros.lock(pasta)
+
+    def _caminho(self, mes):
+        return os.path.join(self.pasta, f"{mes}.{self.formato}")
+
+    def meses(self):
+        return sorted(
+            m.group(1) for m in map(_PARTICAO.match, os.listdir(self.pasta))
+            if m and m.group(2) == self.formato
+        )
+
+    def _ler(self, caminho):
+        if self.formato == "parquet":
+            df = pd.read_parquet(caminho)
+        else:
+            df = pd.read_csv(caminho, dtype=str, keep_default_na=False)
+        df["Data"] = pd.to_datetime(df["Data"])
+        return df
+
+    def _escrever(self, df, caminho):
+        with ficheiros.escrita_atomica(caminho) as tmp:
+            if self.formato == "parquet":
+                df.to_parquet(tmp, index=False)
+            else:
+                df.to_csv(tmp, index=False, date_format="%Y-%m-%d")
+
+    def ler_mes(self, mes):
+        caminho = self._caminho(mes)
+        return cache.carregar("arquivo", [caminho], lambda: self._ler(caminho))
+
+    # -------------------------
+    # Guardar: df com as designações de algumas semanas, datas_semanas = {semana: data}.
+    # As semanas guardadas substituem as que já existiam com a mesma data.
+    # -------------------------
+    @medicao.medido("guardar")
+    def guardar(self, df, datas_semanas):
+        df = df.reindex(columns=COLUNAS[1:]).fillna("").astype(str)
+        df.insert(0, "Data", pd.to_datetime(df["Semana"].map(datas_semanas)))
+        df = df.dropna(subset=["Data"])
+        if df.empty:
+            return
+
+        with self._lock:
+            for mes, grupo in df.groupby(df["Data"].dt.strftime("%Y-%m"), sort=True):
+                caminho = self._caminho(mes)
+                if os.path.exists(caminho):
+                    anterior = self.ler_mes(mes)
+                    anterior = anterior[~anterior["Data"].isin(grupo["Data"].unique())]
+                    grupo = pd.concat([anterior, grupo], ignore_index=True)
+                grupo = grupo.sort_values("Data", kind="stable").reset_index(drop=True)
+                self._escrever(grupo, caminho)
+
+    # Importa designações sem ano (ex: partes.csv), deduzindo a data de cada semana
+    def importar(self, df, referencia=None):
+        if df.empty or "Semana" not in df.columns:
+            return
+        semanas = df["Semana"].astype(str).unique()
+        self.guardar(df, {s: data_semana(s, referencia) for s in semanas})
+
+    # -------------------------
+    # Leitura de um intervalo de datas (inclusive); None = sem limite
+    # -------------------------
+    def meses_entre(self, de=None, ate=None):
+        return [
+            m for m in self.meses()
+            if (de is None or m >= f"{de:%Y-%m}") and (ate is None or m <= f"{ate:%Y-%m}")
+        ]
+
+    # Muda sempre que alguma das partições do intervalo é reescrita
+    def versao(self, de=None, ate=None):
+        versao = []
+        for mes in self.meses_entre(de, ate):
+            st = os.stat(self._caminho(mes))
+            versao.append((mes, st.st_mtime_ns, st.st_size))
+        return (os.path.realpath(self.pasta), tuple(versao))
+
+    @medicao.medido("carregar")
+    def carregar(self, de=None, ate=None):
+        meses = self.meses_entre(de, ate)
+        if not meses:
+            return _vazio()
+
+        df = pd.concat([self.ler_mes(m) for m in meses], ignore_index=True)
+        if de is not None:
+            df = df[df["Data"] >= pd.Timestamp(de)]
+        if ate is not None:
+            df = df[df["Data"] <= pd.Timestamp(ate)]
+        return df.reset_index(drop=True)
+
+
+# -------------------------
+# Abre o arquivo de uma pasta. Na primeira utilização
+# importa as designações que estavam guardadas.
+# -------------------------
+def abrir_arquivo(pasta, armazenamento):
+    arquivo = ArquivoDesignacoes(pasta)
+    if not arquivo.meses():
+        arquivo.importar(armazenamento.load_designacoes())
+    return arquivo
@@ -0,0 +1,70 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Orçamento para a primeira execução de uma página num processo novo
+ORCAMENTO_MS = int(os.environ.get("VMC_ORCAMENTO_ARRANQUE_MS", 1500))
+
+# Bibliotecas que não devem ser carregadas só para mostrar a página inicial
+PESADAS = ("pandas", "fpdf", "openpyxl", "fontTools", "PIL")
+
+_MEDIR = """
+import json, sys, time, warnings
+warnings.filterwarnings("ignore")
+t0 = time.perf_counter()
+import streamlit
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=60)
+at.run()
+t2 = time.perf_counter()
+print(json.dumps({
+    "import_streamlit_ms": (t1 - t0) * 1000,
+    "primeira_execucao_ms": (t2 - t1) * 1000,
+    "erros": [str(e.value) for e in at.exception],
+    "modulos": sorted(m for m in sys.modules if "." not in m),
+}))
+"""
+
+
+# -------------------------
+# Mede o arranque a frio de uma página num interpretador novo
+# -------------------------
+def medir(pagina):
+    saida = subprocess.run(
+        [sys.executable, "-c", _MEDIR, pagina],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m vmc.arranque",
+        description="Verifica o tempo da primeira execução de uma página após o arranque.",
+    )
+    parser.add_argument("paginas", nargs="*", default=["app.py"])
+    parser.add_argument("--orcamento", type=int, default=ORCAMENTO_MS, help="limite em ms")
+    args = parser.parse_args(argv)
+
+    falhou = False
+    for pagina in args.paginas:
+        r = medir(pagina)
+        pesadas = [m for m in PESADAS if m in r["modulos"]]
+        ok = r["primeira_execucao_ms"] <= args.orcamento and not r["erros"]
+        falhou |= not ok
+        print(
+            f"{'OK ' if ok else 'ERRO'} {pagina}: {r['primeira_execucao_ms']:.0f} ms "
+            f"(orçamento {args.orcamento} ms, import streamlit {r['import_streamlit_ms']:.0f} ms)"
+        )
+        if pesadas:
+            print(f"     bibliotecas carregadas: {', '.join(pesadas)}")
+        for erro in r["erros"]:
+            print(f"     erro: {erro}")
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import os
+import threading
+
+from vmc import medicao
+
+# Os DataFrames devolvidos são cópias superficiais: com o copy-on-write do
+# pandas 3 (requirements.txt), alterá-los nunca altera a versão guardada em cache.
+
+_cache = {}
+_lock = threading.Lock()
+
+
+# Identidade e versão de cada ficheiro (None se não existir)
+def _assinatura(caminhos):
+    assinatura = []
+    for caminho in caminhos:
+        try:
+            st = os.stat(caminho)
+        except FileNotFoundError:
+            assinatura.append(None)
+            continue
+        assinatura.append((st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size))
+    return tuple(assinatura)
+
+
+# -------------------------
+# Carrega um DataFrame a partir de ficheiros, partilhado por todas as sessões.
+# Só volta a ler quando algum dos ficheiros muda ou a entrada é invalidada.
+# -------------------------
+def carregar(nome, caminhos, ler):
+    return compilado(nome, caminhos, ler).copy(deep=False)
+
+
+# Igual, para objetos que nunca são alterados (ex: o modelo da reunião):
+# são devolvidos tal como estão, sem cópia
+def compilado(nome, caminhos, construir):
+    chave = (nome, tuple(os.path.realpath(c) for c in caminhos))
+    assinatura = _assinatura(caminhos)
+
+    with _lock:
+        entrada = _cache.get(chave)
+    if entrada is not None and entrada[0] == assinatura:
+        return entrada[1]
+
+    with medicao.medir("ler", nome) as medida:
+        valor = construir()
+        medida.bytes = sum(a[3] for a in assinatura if a)
+    with _lock:
+        _cache[chave] = (assinatura, valor)
+    return valor
+
+
+# Chamado depois de escrever num ficheiro
+def invalidar(*caminhos):
+    caminhos = {os.path.realpath(c) for c in caminhos}
+    with _lock:
+        for chave in [k for k in _cache if caminhos.intersection(k[1])]:
+            del _cache[chave]
+
+
+# Liberta tudo o que foi lido de ficheiros dentro de uma pasta
+def invalidar_pasta(pasta):
+    prefixo = os.path.join(os.path.realpath(pasta), "")
+    with _lock:
+        for chave in [k for k in _cache if any(c.startswith(prefixo) for c in k[1])]:
+            del _cache[chave]
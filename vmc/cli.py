@@ -0,0 +1,133 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime
+
+import pandas as pd
+
+from vmc import config, congregacoes, recursos
+from vmc.arquivo import limites_mes
+from vmc.documentos import COLUNAS_LISTA, escrever_excel, escrever_pdf_tabela, gerar_pdf_mensal
+from vmc.reuniao import data_semana
+
+FORMATOS = ("mensal", "lista", "excel")
+
+
+def _mes(texto):
+    try:
+        data = datetime.strptime(texto, "%Y-%m")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"mês inválido: {texto!r} (usar AAAA-MM)")
+    return data.year, data.month
+
+
+# -------------------------
+# Designações agrupadas por mês (ano, mês) -> DataFrame
+# -------------------------
+def designacoes_por_mes(df, de=None, ate=None, referencia=None):
+    if "Data" in df.columns:
+        datas = [d if not pd.isna(d) else None for d in df["Data"]]
+    else:
+        datas = [data_semana(s, referencia) for s in df["Semana"].astype(str)]
+    meses = [(d.year, d.month) if d else None for d in datas]
+    df = df.assign(_mes=meses).dropna(subset=["_mes"])
+    grupos = {}
+    for mes, grupo in df.groupby("_mes", sort=True):
+        if (de and mes < de) or (ate and mes > ate):
+            continue
+        grupos[mes] = grupo.drop(columns="_mes").reset_index(drop=True)
+    return grupos
+
+
+# -------------------------
+# Trabalho de um processo: gera os ficheiros de um mês
+# Devolve [(ficheiro, segundos, bytes), ...]
+# -------------------------
+def exportar_mes(mes, df, saida, formatos, titulo, linhas=None):
+    prefixo = os.path.join(saida, f"{mes[0]:04d}-{mes[1]:02d}")
+    # Cada gerador escreve diretamente no ficheiro aberto
+    geradores = {
+        "mensal": (f"{prefixo}_modelo_mensal.pdf", lambda f: f.write(gerar_pdf_mensal(df, titulo, linhas))),
+        "lista": (f"{prefixo}_partes.pdf", lambda f: escrever_pdf_tabela(df, f, "Designações da Reunião", COLUNAS_LISTA)),
+        "excel": (f"{prefixo}_partes.xlsx", lambda f: escrever_excel(df, f)),
+    }
+    resultados = []
+    for formato in formatos:
+        caminho, gerar = geradores[formato]
+        inicio = time.perf_counter()
+        with open(caminho, "wb") as f:
+            gerar(f)
+            tamanho = f.tell()
+        resultados.append((caminho, time.perf_counter() - inicio, tamanho))
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m vmc",
+        description="Gera os PDFs e Excel de cada mês a partir das designações guardadas.",
+    )
+    parser.add_argument("--de", type=_mes, help="primeiro mês (AAAA-MM)")
+    parser.add_argument("--ate", type=_mes, help="último mês (AAAA-MM)")
+    parser.add_argument("--saida", default="exportacoes", help="pasta de destino")
+    parser.add_argument("--formatos", default=",".join(FORMATOS), help="lista separada por vírgulas: " + ", ".join(FORMATOS))
+    parser.add_argument("--titulo", default="Reunião Vida e Ministério Cristãos", help="título do PDF mensal")
+    parser.add_argument("--processos", type=int, default=os.cpu_count(), help="número de processos")
+    parser.add_argument(
+        "--congregacao", default=congregacoes.PRINCIPAL,
+        help=f"pasta da congregação em {config.CONGREGACOES_DIR}",
+    )
+    parser.add_argument(
+        "--exportar-csv", action="store_true",
+        help="copia os nomes e as designações da base de dados SQLite para os CSV e termina",
+    )
+    parser.add_argument("--referencia", type=date.fromisoformat, help="data usada para deduzir o ano das semanas sem data (AAAA-MM-DD)")
+    args = parser.parse_args(argv)
+
+    formatos = [f.strip() for f in args.formatos.split(",") if f.strip()]
+    desconhecidos = set(formatos) - set(FORMATOS)
+    if desconhecidos:
+        parser.error(f"formatos desconhecidos: {', '.join(sorted(desconhecidos))}")
+
+    try:
+        congregacao = congregacoes.obter(args.congregacao)
+    except KeyError as e:
+        parser.error(e.args[0])
+
+    if args.exportar_csv:
+        armazenamento = congregacao.armazenamento
+        if not hasattr(armazenamento, "exportar_csv"):
+            parser.error("--exportar-csv só se aplica com VMC_ARMAZENAMENTO=sqlite")
+        armazenamento.exportar_csv(congregacao.nomes_file, congregacao.designacoes_file)
+        print(f"Nomes em {congregacao.nomes_file}, designações em {congregacao.designacoes_file}")
+        return 0
+
+    # Só são lidas as partições do arquivo entre --de e --ate
+    df = congregacao.arquivo.carregar(
+        limites_mes(f"{args.de[0]:04d}-{args.de[1]:02d}")[0] if args.de else None,
+        limites_mes(f"{args.ate[0]:04d}-{args.ate[1]:02d}")[1] if args.ate else None,
+    )
+    meses = designacoes_por_mes(df, args.de, args.ate, args.referencia) if not df.empty else {}
+    if not meses:
+        print("Não há designações no intervalo pedido.", file=sys.stderr)
+        return 1
+
+    os.makedirs(args.saida, exist_ok=True)
+    inicio = time.perf_counter()
+    total = 0
+    linhas = congregacao.modelo.linhas_mensal
+
+    with ProcessPoolExecutor(max_workers=args.processos, initializer=recursos.aquecer) as pool:
+        tarefas = [
+            pool.submit(exportar_mes, mes, grupo, args.saida, formatos, args.titulo, linhas)
+            for mes, grupo in meses.items()
+        ]
+        for tarefa in as_completed(tarefas):
+            for caminho, segundos, tamanho in tarefa.result():
+                total += 1
+                print(f"{segundos * 1000:8.0f} ms  {tamanho / 1024:8.1f} KB  {caminho}")
+
+    print(f"{total} ficheiros de {len(meses)} meses em {time.perf_counter() - inicio:.2f} s")
+    return 0
@@ -0,0 +1,65 @@
+import os
+
+# -------------------------
+# Dados
+# -------------------------
+DB_FILE = "nomes.csv"
+DESIGNACOES_FILE = "partes.csv"
+PARTES_FILE = "partes_reuniao.csv"
+MODELO_FILE = "modelo_reuniao.csv"      # estrutura da reunião (secções, partes, variantes)
+
+# Arquivo de todas as designações, uma partição por mês
+ARQUIVO_DIR = os.environ.get("VMC_ARQUIVO_DIR", "arquivo")
+ARQUIVO_FORMATO = os.environ.get("VMC_ARQUIVO_FORMATO", "").lower()   # "parquet", "csv" ou "" (automático)
+
+# Índice agregado das designações (por pessoa e tipo de parte)
+ESTATISTICAS_FILE = "estatisticas.json"
+
+# "csv" (por omissão) ou "sqlite"
+ARMAZENAMENTO = os.environ.get("VMC_ARMAZENAMENTO", "csv").lower()
+SQLITE_FILE = os.environ.get("VMC_SQLITE_FILE", "vmc.db")
+
+# A partir de quantos nomes elegíveis cada designado tem uma caixa de pesquisa
+PESQUISA_MIN_NOMES = int(os.environ.get("VMC_PESQUISA_MIN_NOMES", 40))
+
+# -------------------------
+# Várias congregações na mesma instalação: uma subpasta por congregação,
+# com os mesmos ficheiros (nomes.csv, partes.csv, arquivo/, exportacoes/, ...)
+# e, se quiser, o seu modelo_reuniao.csv e partes_reuniao.csv.
+# Sem subpastas há uma só congregação, com os ficheiros acima.
+# -------------------------
+CONGREGACOES_DIR = os.environ.get("VMC_CONGREGACOES_DIR", "congregacoes")
+# Os dados de uma congregação sem acessos há mais tempo do que isto saem da memória
+CONGREGACOES_INATIVIDADE_MIN = int(os.environ.get("VMC_CONGREGACOES_INATIVIDADE_MIN", 30))
+CONGREGACOES_MAX_ATIVAS = int(os.environ.get("VMC_CONGREGACOES_MAX_ATIVAS", 20))
+
+# -------------------------
+# Histórico de exportações
+# -------------------------
+EXPORT_DIR = "pages/exportacoes"
+
+# Política de retenção (0 = sem limite)
+HISTORICO_MAX_FICHEIROS = int(os.environ.get("VMC_HISTORICO_MAX_FICHEIROS", 200))
+HISTORICO_MAX_DIAS = int(os.environ.get("VMC_HISTORICO_MAX_DIAS", 180))
+HISTORICO_MAX_MB = int(os.environ.get("VMC_HISTORICO_MAX_MB", 200))
+HISTORICO_POR_PAGINA = 10
+
+# -------------------------
+# Fila de exportações em segundo plano
+# -------------------------
+EXPORTACAO_TRABALHADORES = int(os.environ.get("VMC_EXPORTACAO_TRABALHADORES", 2))
+# Processos em vez de threads (os PDFs grandes deixam de disputar o GIL com a app)
+EXPORTACAO_PROCESSOS = os.environ.get("VMC_EXPORTACAO_PROCESSOS", "").strip().lower() in ("1", "true", "sim", "yes")
+
+# -------------------------
+# Medição de tempos (VMC_MEDICAO=1 para ligar)
+# -------------------------
+MEDICAO = os.environ.get("VMC_MEDICAO", "").strip().lower() in ("1", "true", "sim", "yes")
+MEDICAO_LOG = os.environ.get("VMC_MEDICAO_LOG", "")   # ficheiro JSON lines (opcional)
+MEDICAO_MAX_REGISTOS = int(os.environ.get("VMC_MEDICAO_MAX_REGISTOS", 2000))
+
+# -------------------------
+# Otimização dos PDFs (fonte sem hinting, imagens reduzidas ao tamanho impresso)
+# -------------------------
+PDF_OTIMIZAR = os.environ.get("VMC_PDF_OTIMIZAR", "1").strip().lower() in ("1", "true", "sim", "yes")
+PDF_DPI = int(os.environ.get("VMC_PDF_DPI", 150))
@@ -0,0 +1,153 @@
+import os
+import threading
+import time
+
+from vmc import cache, config, filtros
+
+# Congregação com os ficheiros na raiz (instalação com uma só congregação)
+PRINCIPAL = "principal"
+
+
+# -------------------------
+# Dados de uma congregação. Armazenamento, arquivo, estatísticas e
+# histórico só são abertos no primeiro acesso, e são libertados
+# (com o que está em cache) quando a congregação fica inativa.
+# -------------------------
+class Congregacao:
+    def __init__(self, id, pasta=None):
+        self.id = id
+        self.pasta = pasta
+        self.ultimo_acesso = time.monotonic()
+        self._lock = threading.RLock()   # abrir o arquivo abre também o armazenamento
+        self._recursos = {}
+
+        if pasta is None:
+            self.nomes_file = config.DB_FILE
+            self.designacoes_file = config.DESIGNACOES_FILE
+            self.sqlite_file = config.SQLITE_FILE
+            self.arquivo_dir = config.ARQUIVO_DIR
+            self.estatisticas_file = config.ESTATISTICAS_FILE
+            self.export_dir = config.EXPORT_DIR
+        else:
+            self.nomes_file = os.path.join(pasta, os.path.basename(config.DB_FILE))
+            self.designacoes_file = os.path.join(pasta, os.path.basename(config.DESIGNACOES_FILE))
+            self.sqlite_file = os.path.join(pasta, os.path.basename(config.SQLITE_FILE))
+            self.arquivo_dir = os.path.join(pasta, "arquivo")
+            self.estatisticas_file = os.path.join(pasta, os.path.basename(config.ESTATISTICAS_FILE))
+            self.export_dir = os.path.join(pasta, "exportacoes")
+
+        # Modelo da reunião próprio ou, se não existir, o da instalação
+        self.partes_file = self._proprio(config.PARTES_FILE)
+        self.modelo_file = self._proprio(config.MODELO_FILE)
+
+    def _proprio(self, ficheiro):
+        if self.pasta is not None:
+            caminho = os.path.join(self.pasta, os.path.basename(ficheiro))
+            if os.path.exists(caminho):
+                return caminho
+        return ficheiro
+
+    def _recurso(self, nome, abrir):
+        self.ultimo_acesso = time.monotonic()
+        with self._lock:
+            recurso = self._recursos.get(nome)
+            if recurso is None:
+                recurso = self._recursos[nome] = abrir()
+            return recurso
+
+    @property
+    def armazenamento(self):
+        from vmc.armazenamento import criar_armazenamento
+
+        return self._recurso(
+            "armazenamento",
+            lambda: criar_armazenamento(self.nomes_file, self.designacoes_file, self.sqlite_file),
+        )
+
+    @property
+    def arquivo(self):
+        from vmc.arquivo import abrir_arquivo
+
+        return self._recurso("arquivo", lambda: abrir_arquivo(self.arquivo_dir, self.armazenamento))
+
+    @property
+    def estatisticas(self):
+        from vmc.estatisticas import abrir_estatisticas
+
+        return self._recurso("estatisticas", lambda: abrir_estatisticas(self.estatisticas_file, self.arquivo))
+
+    @property
+    def historico(self):
+        from vmc.historico import criar_historico
+
+        return self._recurso("historico", lambda: criar_historico(self.export_dir))
+
+    # Compilado e guardado em cache pela versão dos ficheiros
+    @property
+    def modelo(self):
+        from vmc.modelo_reuniao import get_modelo
+
+        self.ultimo_acesso = time.monotonic()
+        return get_modelo(self.modelo_file, self.partes_file)
+
+    def carregada(self):
+        return bool(self._recursos)
+
+    def descarregar(self):
+        with self._lock:
+            self._recursos.clear()
+        cache.invalidar_pasta(self.pasta)
+        filtros.descartar(self.arquivo_dir)
+
+
+_congregacoes = {}   # só as que já foram usadas
+_lock = threading.Lock()
+
+
+# Congregações disponíveis: as subpastas de CONGREGACOES_DIR ou, sem nenhuma, a principal
+def ids():
+    try:
+        pastas = sorted(
+            nome for nome in os.listdir(config.CONGREGACOES_DIR)
+            if not nome.startswith(".") and os.path.isdir(os.path.join(config.CONGREGACOES_DIR, nome))
+        )
+    except FileNotFoundError:
+        pastas = []
+    return pastas or [PRINCIPAL]
+
+
+def obter(id=None):
+    id = id or PRINCIPAL
+    with _lock:
+        congregacao = _congregacoes.get(id)
+        if congregacao is None:
+            if id == PRINCIPAL:
+                pasta = None
+            else:
+                pasta = os.path.join(config.CONGREGACOES_DIR, id)
+                if os.path.basename(id) != id or id.startswith(".") or not os.path.isdir(pasta):
+                    raise KeyError(f"Congregação desconhecida: {id}")
+            congregacao = _congregacoes[id] = Congregacao(id, pasta)
+        congregacao.ultimo_acesso = time.monotonic()
+
+    descarregar_inativas()
+    return congregacao
+
+
+# -------------------------
+# Liberta as congregações sem acessos recentes e, acima do limite
+# de congregações ativas, as usadas há mais tempo.
+# A principal (ficheiros na raiz) fica sempre carregada.
+# -------------------------
+def descarregar_inativas():
+    agora = time.monotonic()
+    limite = config.CONGREGACOES_INATIVIDADE_MIN * 60
+    with _lock:
+        ativas = sorted(
+            (c for c in _congregacoes.values() if c.pasta is not None and c.carregada()),
+            key=lambda c: c.ultimo_acesso,
+            reverse=True,
+        )
+    for i, congregacao in enumerate(ativas):
+        if i >= config.CONGREGACOES_MAX_ATIVAS or agora - congregacao.ultimo_acesso > limite:
+            congregacao.descarregar()
@@ -0,0 +1,225 @@
+import io
+import re
+
+from vmc import medicao
+from vmc.modelo_reuniao import get_modelo
+from vmc.reuniao import data_semana, indice_designacoes
+
+# As bibliotecas pesadas (fpdf, openpyxl) só são importadas quando um
+# documento é gerado, para não atrasar o arranque das páginas.
+
+# Número máximo de semanas por página no modelo mensal
+SEMANAS_POR_PAGINA = 5
+
+# Linhas convertidas de cada vez nas tabelas em PDF
+BLOCO_LINHAS = 5000
+
+# Colunas das tabelas em PDF: (coluna, largura em mm)
+COLUNAS_LISTA = [("Semana", 30), ("Secção", 60), ("Parte", 70), ("Responsável", 30)]
+COLUNAS_NOMES = [("Nome", 100), ("Visível", 40)]
+COLUNAS_REUNIAO = [("Semana", 25), ("Secção", 40), ("Ordem", 30), ("Parte", 65), ("Responsável", 30)]
+
+# Colunas do Excel: (título, largura em caracteres)
+COLUNAS_EXCEL = [
+    ("Data", 12), ("Semana", 10), ("Secção", 32), ("Ordem", 14),
+    ("Parte", 50), ("Minutos", 9), ("Responsável", 30),
+]
+_MINUTOS = re.compile(r"\((\d+)\s*min\)")
+_INVALIDOS_FOLHA = re.compile(r"[\[\]:*?/\\]")
+
+
+# -------------------------
+# Leitura por blocos
+#
+# fonte: DataFrame ou iterável de DataFrames (ex: pd.read_csv(..., chunksize=...)).
+# Cada bloco é convertido de uma vez, sem criar uma Series por linha.
+# -------------------------
+def blocos(fonte, tamanho=BLOCO_LINHAS):
+    if hasattr(fonte, "iloc"):
+        return (fonte.iloc[i:i + tamanho] for i in range(0, len(fonte), tamanho))
+    return fonte
+
+
+def blocos_texto(fonte, colunas, tamanho=BLOCO_LINHAS):
+    for bloco in blocos(fonte, tamanho):
+        yield bloco.reindex(columns=colunas).fillna("").astype(str)
+
+
+# -------------------------
+# Tabelas em PDF, linha a linha
+# -------------------------
+def linhas_tabela(fonte, colunas, tamanho=BLOCO_LINHAS):
+    for bloco in blocos_texto(fonte, colunas, tamanho):
+        yield from bloco.itertuples(index=False, name=None)
+
+
+# destino: caminho ou ficheiro binário aberto
+def escrever_pdf_tabela(fonte, destino, titulo, colunas):
+    from vmc.modelos_pdf import PDFTabela
+
+    pdf = PDFTabela(titulo, colunas)
+    pdf.add_page()
+    for valores in linhas_tabela(fonte, [nome for nome, _ in colunas]):
+        pdf.linha(valores)
+    pdf.output(destino)
+
+
+def _pdf_tabela(df, titulo, colunas):
+    buffer = io.BytesIO()
+    escrever_pdf_tabela(df, buffer, titulo, colunas)
+    return buffer.getvalue()
+
+
+# -------------------------
+# Funções de exportação
+# -------------------------
+@medicao.medido("exportar")
+def gerar_pdf_lista(df):
+    return _pdf_tabela(df, "Designações da Reunião", COLUNAS_LISTA)
+
+
+# linhas: as do modelo da reunião (ModeloReuniao.linhas_mensal); por omissão as da instalação
+@medicao.medido("exportar")
+def gerar_pdf_mensal(df, titulo="Reunião Vida e Ministério Cristãos", linhas=None):
+    from vmc.modelos_pdf import PDFModeloMensal
+
+    pdf = PDFModeloMensal(titulo=titulo)
+    pdf.add_page()
+
+    # 1) Índice (semana, secção, parte) -> responsável, construído uma só vez
+    indice = indice_designacoes(df)
+
+    # 2) Semanas pela ordem em que aparecem nos dados
+    semanas = list(dict.fromkeys(sem for sem, _, _ in indice))
+
+    # 3) Linhas do modelo (as opcionais só se tiverem dados)
+    presentes = {(secao, chave) for _, secao, chave in indice}
+    linhas = [
+        (secao, chave, rotulo)
+        for secao, chave, rotulo, opcional in (linhas or get_modelo().linhas_mensal)
+        if not opcional or (secao, chave) in presentes
+    ]
+
+    # 4) Uma tabela por bloco de semanas (permite gerar vários meses de uma vez)
+    col_desc_w = 70
+    blocos = [semanas[i:i + SEMANAS_POR_PAGINA] for i in range(0, len(semanas), SEMANAS_POR_PAGINA)] or [[]]
+
+    for n, bloco in enumerate(blocos):
+        if n > 0:
+            pdf.add_page()
+
+        # Imagem de secção (podes depois adicionar mais por secção)
+        pdf.secao_imagem("assets/tesouros.png")
+
+        # Tabela: colunas = semanas, linhas = partes
+        pdf.set_font("DejaVu", "B", 10)
+        col_sem_w = (190 - col_desc_w) / max(len(bloco), 1)
+
+        pdf.cell(col_desc_w, 8, "Parte", border=1, align="L")
+        for sem in bloco:
+            pdf.cell(col_sem_w, 8, sem, border=1, align="C")
+        pdf.ln()
+
+        for secao, chave, rotulo in linhas:
+            pdf.set_font("DejaVu", "B", 9)
+            pdf.cell(col_desc_w, 7, f"{secao} — {rotulo}", border=1, align="L")
+
+            pdf.set_font("DejaVu", "", 9)
+            for sem in bloco:
+                pdf.cell(col_sem_w, 7, indice.get((sem, secao, chave), ""), border=1, align="C")
+            pdf.ln()
+
+    buffer = io.BytesIO()
+    pdf.output(buffer)
+    return buffer.getvalue()
+
+
+# -------------------------
+# Excel em modo write-only: as linhas vão sendo escritas à medida que
+# são convertidas, uma folha por mês ("mes") ou por secção ("secao").
+# Datas reais na coluna Data (a do arquivo ou deduzida da semana)
+# e minutos como inteiros.
+# -------------------------
+def _nome_folha(texto):
+    return _INVALIDOS_FOLHA.sub("-", texto).strip()[:31] or "Folha"
+
+
+def escrever_excel(fonte, destino, agrupar="mes", referencia=None):
+    import pandas as pd
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    folhas = {}
+    datas = {}  # semana -> data, calculada uma vez por semana
+    negrito = Font(bold=True)
+
+    def folha(nome):
+        ws = folhas.get(nome)
+        if ws is None:
+            ws = folhas[nome] = wb.create_sheet(_nome_folha(nome))
+            cabecalho = []
+            for i, (titulo, largura) in enumerate(COLUNAS_EXCEL, start=1):
+                ws.column_dimensions[get_column_letter(i)].width = largura
+                celula = WriteOnlyCell(ws, titulo)
+                celula.font = negrito
+                cabecalho.append(celula)
+            ws.freeze_panes = "A2"
+            ws.append(cabecalho)
+        return ws
+
+    colunas = ["Semana", "Secção", "Ordem", "Parte", "Responsável"]
+    for bruto in blocos(fonte):
+        bloco = bruto.reindex(columns=colunas).fillna("").astype(str)
+        if "Data" in bruto.columns:
+            data = pd.to_datetime(bruto["Data"], errors="coerce").map(
+                lambda d: d.date() if isinstance(d, pd.Timestamp) else None
+            )
+        else:
+            for semana in bloco["Semana"].unique():
+                if semana not in datas:
+                    datas[semana] = data_semana(semana, referencia)
+            data = bloco["Semana"].map(datas)
+        minutos = bloco["Parte"].str.extract(_MINUTOS, expand=False)
+        if agrupar == "secao":
+            grupos = bloco["Secção"]
+        else:
+            grupos = data.map(lambda d: d.strftime("%Y-%m") if d else "Sem data")
+
+        for grupo, d, semana, secao, ordem, parte, mins, responsavel in zip(
+            grupos, data, bloco["Semana"], bloco["Secção"], bloco["Ordem"],
+            bloco["Parte"], minutos, bloco["Responsável"],
+        ):
+            folha(grupo).append([
+                d, semana, secao, ordem or None, parte,
+                int(mins) if isinstance(mins, str) else None, responsavel or None,
+            ])
+
+    if not folhas:
+        folha("Designações")
+    wb.save(destino)
+
+
+@medicao.medido("exportar")
+def gerar_excel(df, agrupar="mes"):
+    buffer = io.BytesIO()
+    escrever_excel(df, buffer, agrupar)
+    return buffer.getvalue()
+
+
+# -------------------------
+# PDF da lista de nomes
+# -------------------------
+@medicao.medido("exportar")
+def gerar_pdf_nomes(df):
+    return _pdf_tabela(df, "Lista de Nomes", COLUNAS_NOMES)
+
+
+# -------------------------
+# PDF das designações da reunião
+# -------------------------
+@medicao.medido("exportar")
+def gerar_pdf_reuniao(df):
+    return _pdf_tabela(df, "Designações da Reunião", COLUNAS_REUNIAO)
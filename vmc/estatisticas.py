@@ -0,0 +1,172 @@
+import bisect
+import json
+import os
+from datetime import date
+
+from vmc import ficheiros, medicao
+from vmc.reuniao import data_semana, separar_responsaveis, tipo_parte
+
+
+# -------------------------
+# Índice agregado das designações por (pessoa, tipo de parte)
+#
+# estatisticas.json:
+#   datas   -> pessoa -> tipo -> [datas ISO ordenadas]
+#   semanas -> data ISO -> [[pessoa, tipo], ...]  (o que cada semana contribuiu)
+#
+# Guardar uma semana outra vez substitui o que ela tinha contribuído,
+# por isso o índice nunca precisa de voltar a ler o histórico.
+#
+# Cada escrita constrói um índice novo e troca-o pelo anterior: quem está
+# a ler continua com o antigo, que nunca é alterado. O lock é o do ficheiro,
+# partilhado por todas as instâncias.
+# -------------------------
+class EstatisticasDesignacoes:
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._lock = ficheiros.lock(caminho)
+        self._indice = None
+        self._indice_mtime = None
+
+    def _carregar(self):
+        try:
+            mtime = os.stat(self.caminho).st_mtime_ns
+        except FileNotFoundError:
+            self._indice, self._indice_mtime = {"datas": {}, "semanas": {}}, None
+            return self._indice
+
+        if self._indice is None or mtime != self._indice_mtime:
+            with open(self.caminho, encoding="utf-8") as f:
+                self._indice = json.load(f)
+            self._indice_mtime = mtime
+        return self._indice
+
+    def _guardar(self, indice):
+        with ficheiros.escrita_atomica(self.caminho) as tmp:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(indice, f, ensure_ascii=False)
+        self._indice = indice
+        self._indice_mtime = os.stat(self.caminho).st_mtime_ns
+
+    def existe(self):
+        return os.path.exists(self.caminho)
+
+    # -------------------------
+    # Atualização incremental: df com as designações das semanas guardadas,
+    # datas_semanas = {semana: data}
+    # -------------------------
+    @medicao.medido("guardar")
+    def atualizar(self, df, datas_semanas):
+        self._atualizar(
+            (data, df[df["Semana"].astype(str) == semana])
+            for semana, data in datas_semanas.items()
+            if data is not None
+        )
+
+    # semanas: pares (data, designações dessa semana), guardados numa só escrita
+    def _atualizar(self, semanas):
+        with self._lock:
+            atual = self._carregar()
+            datas = {pessoa: {tipo: list(lista) for tipo, lista in por_tipo.items()}
+                     for pessoa, por_tipo in atual["datas"].items()}
+            contribuicoes = dict(atual["semanas"])
+
+            for data, linhas in semanas:
+                iso = data.isoformat()
+
+                # Retira o que a semana tinha contribuído antes
+                for pessoa, tipo in contribuicoes.pop(iso, []):
+                    lista = datas.get(pessoa, {}).get(tipo, [])
+                    if iso in lista:
+                        lista.remove(iso)
+                        if not lista:
+                            del datas[pessoa][tipo]
+                            if not datas[pessoa]:
+                                del datas[pessoa]
+
+                pares = list(dict.fromkeys(
+                    (pessoa, tipo_parte(parte))
+                    for parte, responsavel in zip(linhas["Parte"], linhas["Responsável"])
+                    for pessoa in separar_responsaveis(responsavel)
+                ))
+                for pessoa, tipo in pares:
+                    bisect.insort(datas.setdefault(pessoa, {}).setdefault(tipo, []), iso)
+                if pares:
+                    contribuicoes[iso] = [list(p) for p in pares]
+
+            self._guardar({"datas": datas, "semanas": contribuicoes})
+
+    # Constrói o índice de raiz a partir de um DataFrame de designações.
+    # Com a coluna Data (arquivo) cada semana fica com a sua data; sem ela
+    # (partes.csv antigo) a data é deduzida do nome da semana.
+    def reconstruir(self, df, referencia=None):
+        with self._lock:
+            self._guardar({"datas": {}, "semanas": {}})
+        if df.empty or "Semana" not in df.columns:
+            return
+        if "Data" in df.columns:
+            self._atualizar(df.groupby(df["Data"].dt.date, sort=True))
+            return
+        semanas = df["Semana"].astype(str).unique()
+        self.atualizar(df, {s: data_semana(s, referencia) for s in semanas})
+
+    # -------------------------
+    # Consultas (só leem o índice agregado)
+    # -------------------------
+    # O índice devolvido nunca é alterado (as escritas trocam-no por outro)
+    def _datas(self):
+        with self._lock:
+            return self._carregar()["datas"]
+
+    def tipos(self):
+        return sorted({tipo for por_tipo in self._datas().values() for tipo in por_tipo})
+
+    # (vezes, última data, intervalo médio em dias) de uma pessoa numa parte
+    def estatistica(self, pessoa, tipo):
+        lista = self._datas().get(pessoa, {}).get(tipo)
+        if not lista:
+            return 0, None, None
+        primeira, ultima = date.fromisoformat(lista[0]), date.fromisoformat(lista[-1])
+        intervalo = (ultima - primeira).days / (len(lista) - 1) if len(lista) > 1 else None
+        return len(lista), ultima, intervalo
+
+    # {pessoa: última data} para um tipo de parte
+    def ultimas(self, tipo):
+        return {
+            pessoa: date.fromisoformat(por_tipo[tipo][-1])
+            for pessoa, por_tipo in self._datas().items()
+            if tipo in por_tipo
+        }
+
+    # Pessoas que não têm a parte desde `limite` (ou nunca tiveram), mais antigas primeiro
+    def sem_parte_desde(self, tipo, limite, nomes):
+        ultimas = self.ultimas(tipo)
+        resultado = [(nome, ultimas.get(nome)) for nome in nomes if nome]
+        resultado = [(nome, ultima) for nome, ultima in resultado if ultima is None or ultima < limite]
+        return sorted(resultado, key=lambda r: (r[1] is not None, r[1] or date.min, r[0]))
+
+    # Uma linha por (pessoa, tipo)
+    def resumo(self):
+        linhas = []
+        for pessoa, por_tipo in sorted(self._datas().items()):
+            for tipo in sorted(por_tipo):
+                vezes, ultima, intervalo = self.estatistica(pessoa, tipo)
+                linhas.append({
+                    "Pessoa": pessoa,
+                    "Parte": tipo,
+                    "Vezes": vezes,
+                    "Última": ultima,
+                    "Intervalo médio (dias)": round(intervalo) if intervalo is not None else None,
+                })
+        return linhas
+
+
+# -------------------------
+# Abre o índice de um ficheiro; na primeira utilização é construído
+# a partir do arquivo, com a data real de cada semana
+# -------------------------
+def abrir_estatisticas(caminho, arquivo):
+    estatisticas = EstatisticasDesignacoes(caminho)
+    if not estatisticas.existe():
+        estatisticas.reconstruir(arquivo.carregar())
+    return estatisticas
@@ -0,0 +1,63 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from vmc import medicao
+
+# Número máximo de artefactos guardados em memória (por processo)
+MAX_ENTRADAS = 16
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+# -------------------------
+# Assinatura de um DataFrame (+ argumentos extra, ex: título)
+# -------------------------
+def assinatura(df, *extra):
+    h = hashlib.sha1()
+    h.update(repr(list(df.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    h.update(repr(extra).encode("utf-8"))
+    return h.hexdigest()
+
+
+# -------------------------
+# Gera um artefacto, reutilizando o resultado se os dados não mudaram
+# -------------------------
+def gerar_memo(gerar, df, *args):
+    chave = (gerar.__module__, gerar.__qualname__, assinatura(df, *args))
+
+    with _lock:
+        if chave in _cache:
+            _cache.move_to_end(chave)
+            return _cache[chave]
+
+    dados = gerar(df, *args)
+
+    with _lock:
+        _cache[chave] = dados
+        while len(_cache) > MAX_ENTRADAS:
+            _cache.popitem(last=False)
+    return dados
+
+
+# -------------------------
+# Exportação diferida: devolve um callable para st.download_button,
+# que só gera o ficheiro quando o utilizador clica.
+# df pode ser uma função que devolve o DataFrame no momento do clique.
+# -------------------------
+def diferido(gerar, df, *args, ao_gerar=None):
+    def _construir():
+        dados = gerar_memo(gerar, df() if callable(df) else df, *args)
+        if ao_gerar is not None:
+            ao_gerar(dados)
+        return dados
+    return _construir
+
+
+@medicao.medido("exportar")
+def gerar_csv(df):
+    return df.to_csv(index=False).encode("utf-8")
@@ -0,0 +1,43 @@
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from vmc import cache
+
+_locks = {}
+_locks_lock = threading.Lock()
+
+
+# Um lock por ficheiro: as sessões do Streamlit são threads do mesmo processo,
+# e várias instâncias podem apontar para o mesmo ficheiro
+def lock(caminho):
+    caminho = os.path.realpath(caminho)
+    with _locks_lock:
+        return _locks.setdefault(caminho, threading.RLock())
+
+
+# -------------------------
+# Escrita atómica: cada escrita tem o seu ficheiro temporário (na mesma pasta),
+# que substitui o original no fim; em caso de erro o original fica intacto.
+#
+#   with escrita_atomica(caminho) as tmp:
+#       df.to_csv(tmp, index=False)
+# -------------------------
+@contextmanager
+def escrita_atomica(caminho):
+    fd, tmp = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(caminho)), prefix=f"{os.path.basename(caminho)}.", suffix=".tmp"
+    )
+    os.close(fd)
+    try:
+        yield tmp
+        if os.path.exists(caminho):
+            shutil.copymode(caminho, tmp)
+        os.replace(tmp, caminho)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    cache.invalidar(caminho)
@@ -0,0 +1,130 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from vmc.reuniao import data_semana, separar_responsaveis
+
+TODOS = "Todos"
+
+# Índices guardados em memória (um por versão dos dados)
+MAX_INDICES = 8
+
+_indices = OrderedDict()
+_lock = threading.Lock()
+_VAZIO = np.empty(0, dtype=np.intp)
+
+
+# -------------------------
+# Índice de filtros de um conjunto de designações
+#
+# As linhas ficam ordenadas por data: um intervalo de datas ou uma semana
+# é uma pesquisa binária. Secções e pessoas têm as posições das suas linhas
+# pré-calculadas, por isso filtrar é juntar/intersetar listas de posições.
+# -------------------------
+class IndiceFiltros:
+    def __init__(self, df, referencia=None):
+        df = df.copy(deep=False)
+        if "Data" in df.columns:
+            df["Data"] = pd.to_datetime(df["Data"])
+        else:
+            semanas = df["Semana"].astype(str)
+            datas = {s: data_semana(s, referencia) for s in semanas.unique()}
+            df.insert(0, "Data", pd.to_datetime(semanas.map(datas)))
+        df = df.sort_values("Data", kind="stable").reset_index(drop=True)
+        for coluna in ("Secção", "Responsável"):
+            if coluna in df.columns:
+                df[coluna] = df[coluna].astype("category")
+
+        self.df = df
+        self._datas = df["Data"].to_numpy()
+        self._por_secao = self._grupos("Secção")
+
+        # "A / B" conta para as duas pessoas
+        pessoas = {}
+        for valor, posicoes in self._grupos("Responsável").items():
+            for pessoa in separar_responsaveis(valor):
+                pessoas.setdefault(pessoa, []).append(posicoes)
+        self._por_pessoa = {p: np.sort(np.concatenate(l)) for p, l in pessoas.items()}
+
+    def _grupos(self, coluna):
+        if coluna not in self.df.columns or self.df.empty:
+            return {}
+        return dict(self.df.groupby(coluna, observed=True).indices)
+
+    def _intervalo(self, de=None, ate=None):
+        inicio = 0 if de is None else int(np.searchsorted(self._datas, np.datetime64(de), "left"))
+        fim = len(self._datas) if ate is None else int(np.searchsorted(self._datas, np.datetime64(ate), "right"))
+        return inicio, fim
+
+    # -------------------------
+    # Opções dos filtros
+    # -------------------------
+    def semanas(self, de=None, ate=None):
+        inicio, fim = self._intervalo(de, ate)
+        datas = pd.unique(self._datas[inicio:fim])
+        return [pd.Timestamp(d).date() for d in datas if not pd.isna(d)]
+
+    def secoes(self):
+        return sorted(self._por_secao)
+
+    def responsaveis(self):
+        return sorted(self._por_pessoa)
+
+    # -------------------------
+    # Filtrar: listas vazias = todos
+    # -------------------------
+    def filtrar(self, de=None, ate=None, semanas=(), secoes=(), responsaveis=()):
+        inicio, fim = self._intervalo(de, ate)
+        if not (semanas or secoes or responsaveis):
+            return self.df.iloc[inicio:fim]
+
+        posicoes = None
+        selecoes = []
+        if semanas:
+            selecoes.append(np.concatenate([np.arange(*self._intervalo(d, d)) for d in semanas]))
+        for grupos, escolhidos in ((self._por_secao, secoes), (self._por_pessoa, responsaveis)):
+            if escolhidos:
+                selecoes.append(np.concatenate([grupos.get(v, _VAZIO) for v in escolhidos]))
+
+        # Começa pela seleção mais pequena, já limitada ao intervalo de datas
+        for escolhidas in sorted(selecoes, key=len):
+            if posicoes is None:
+                posicoes = np.unique(escolhidas[(escolhidas >= inicio) & (escolhidas < fim)])
+            else:
+                posicoes = posicoes[np.isin(posicoes, escolhidas)]
+        return self.df.iloc[posicoes]
+
+
+# -------------------------
+# Índice de uma versão dos dados, construído uma só vez.
+# versao: chave que muda sempre que os dados mudam (ex: assinatura dos ficheiros)
+# -------------------------
+def obter_indice(versao, carregar):
+    with _lock:
+        if versao in _indices:
+            _indices.move_to_end(versao)
+            return _indices[versao]
+
+    indice = IndiceFiltros(carregar())
+
+    with _lock:
+        _indices[versao] = indice
+        while len(_indices) > MAX_INDICES:
+            _indices.popitem(last=False)
+    return indice
+
+
+# Liberta os índices das designações guardadas numa pasta (ver ArquivoDesignacoes.versao)
+def descartar(pasta):
+    pasta = os.path.realpath(pasta)
+    with _lock:
+        for versao in [v for v in _indices if v and v[0] == pasta]:
+            del _indices[versao]
+
+
+# Texto de um filtro para o histórico
+def descrever(valores, formatar=str):
+    return ", ".join(formatar(v) for v in valores) if valores else TODOS
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import logging
+import os
+import time
+
+from vmc import config, ficheiros, medicao
+
+INDICE = "indice.json"
+OBJETOS = "objetos"
+
+_log = logging.getLogger("vmc.historico")
+
+
+# -------------------------
+# Histórico de exportações endereçado por conteúdo
+#
+# pasta/
+#   indice.json          -> metadados (hash -> nome, tipo, filtros, tamanho, data)
+#   objetos/<hash>.<ext> -> conteúdo, guardado uma única vez
+#
+# O lock é o do índice: partilhado por todas as instâncias da mesma pasta.
+# -------------------------
+class HistoricoExportacoes:
+    def __init__(self, pasta, max_ficheiros=0, max_dias=0, max_bytes=0):
+        self.pasta = pasta
+        self.max_ficheiros = max_ficheiros
+        self.max_dias = max_dias
+        self.max_bytes = max_bytes
+        self._lock = ficheiros.lock(os.path.join(pasta, INDICE))
+        self._indice = None
+        self._indice_mtime = None
+        os.makedirs(os.path.join(pasta, OBJETOS), exist_ok=True)
+        self._migrar_antigos()
+
+    # -------------------------
+    # Índice
+    # -------------------------
+    def _caminho_indice(self):
+        return os.path.join(self.pasta, INDICE)
+
+    def _carregar_indice(self):
+        caminho = self._caminho_indice()
+        try:
+            mtime = os.stat(caminho).st_mtime_ns
+        except FileNotFoundError:
+            self._indice, self._indice_mtime = {}, None
+            return self._indice
+
+        if self._indice is None or mtime != self._indice_mtime:
+            with open(caminho, encoding="utf-8") as f:
+                self._indice = json.load(f)
+            self._indice_mtime = mtime
+        return self._indice
+
+    def _guardar_indice(self, indice):
+        caminho = self._caminho_indice()
+        with ficheiros.escrita_atomica(caminho) as tmp:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(indice, f, ensure_ascii=False)
+        self._indice = indice
+        self._indice_mtime = os.stat(caminho).st_mtime_ns
+
+    def _caminho_objeto(self, entrada):
+        return os.path.join(self.pasta, OBJETOS, entrada["hash"] + entrada["ext"])
+
+    # -------------------------
+    # Guardar (ficheiros idênticos são guardados uma só vez)
+    # -------------------------
+    @medicao.medido("historico")
+    def guardar(self, dados, nome, tipo, filtros=None, criado=None):
+        with self._lock:
+            indice = dict(self._carregar_indice())
+            entrada = self._juntar(indice, dados, nome, tipo, filtros, criado)
+            self._aplicar_retencao(indice)
+            self._guardar_indice(indice)
+        return entrada
+
+    # Guarda o conteúdo (se ainda não existir) e acrescenta a entrada ao índice
+    def _juntar(self, indice, dados, nome, tipo, filtros=None, criado=None):
+        digest = hashlib.sha256(dados).hexdigest()
+        entrada = {
+            "hash": digest,
+            "ext": os.path.splitext(nome)[1],
+            "nome": nome,
+            "tipo": tipo,
+            "filtros": filtros or {},
+            "tamanho": len(dados),
+            "criado": criado if criado is not None else time.time(),
+        }
+        caminho = self._caminho_objeto(entrada)
+        if not os.path.exists(caminho):
+            with ficheiros.escrita_atomica(caminho) as tmp:
+                with open(tmp, "wb") as f:
+                    f.write(dados)
+        if digest in indice:
+            entrada["criado"] = max(entrada["criado"], indice[digest]["criado"])
+        indice[digest] = entrada
+        return entrada
+
+    # -------------------------
+    # Retenção: idade, número de ficheiros e tamanho total.
+    # Devolve as entradas removidas.
+    # -------------------------
+    def _aplicar_retencao(self, indice):
+        entradas = sorted(indice.values(), key=lambda e: e["criado"])
+        remover = []
+
+        if self.max_dias:
+            limite = time.time() - self.max_dias * 86400
+            while entradas and entradas[0]["criado"] < limite:
+                remover.append(entradas.pop(0))
+
+        total = sum(e["tamanho"] for e in entradas)
+        while entradas and (
+            (self.max_ficheiros and len(entradas) > self.max_ficheiros)
+            or (self.max_bytes and total > self.max_bytes)
+        ):
+            e = entradas.pop(0)
+            total -= e["tamanho"]
+            remover.append(e)
+
+        for e in remover:
+            del indice[e["hash"]]
+            try:
+                os.remove(self._caminho_objeto(e))
+            except FileNotFoundError:
+                pass
+        return remover
+
+    # -------------------------
+    # Listagem paginada (mais recentes primeiro); não lê o conteúdo
+    # -------------------------
+    @medicao.medido("historico")
+    def total(self):
+        with self._lock:
+            return len(self._carregar_indice())
+
+    @medicao.medido("historico")
+    def listar(self, pagina=0, por_pagina=10):
+        with self._lock:
+            entradas = sorted(self._carregar_indice().values(), key=lambda e: e["criado"], reverse=True)
+        inicio = pagina * por_pagina
+        return entradas[inicio:inicio + por_pagina]
+
+    @medicao.medido("historico")
+    def ler(self, entrada):
+        with open(self._caminho_objeto(entrada), "rb") as f:
+            return f.read()
+
+    # -------------------------
+    # Ficheiros soltos do formato antigo (partes_<timestamp>.csv, ...).
+    # Todos entram no índice numa só escrita; a retenção é aplicada uma vez
+    # no fim e os ficheiros que ela remover ficam registados no log.
+    # -------------------------
+    def _migrar_antigos(self):
+        antigos = [
+            f for f in os.listdir(self.pasta)
+            if os.path.isfile(os.path.join(self.pasta, f))
+            and f != INDICE and not f.startswith(".") and not f.endswith(".tmp")
+        ]
+        if not antigos:
+            return
+        with self._lock:
+            indice = dict(self._carregar_indice())
+            for f in antigos:
+                caminho = os.path.join(self.pasta, f)
+                with open(caminho, "rb") as fh:
+                    dados = fh.read()
+                tipo = "mensal" if f.startswith("modelo_mensal") else os.path.splitext(f)[1].lstrip(".")
+                self._juntar(indice, dados, f, tipo, criado=os.path.getmtime(caminho))
+            removidos = self._aplicar_retencao(indice)
+            self._guardar_indice(indice)
+        for f in antigos:
+            os.remove(os.path.join(self.pasta, f))
+        if removidos:
+            _log.warning(
+                "%s: %d de %d exportações antigas migradas foram removidas pela retenção (%s)",
+                self.pasta, len(removidos), len(antigos), ", ".join(e["nome"] for e in removidos[:10]),
+            )
+
+# -------------------------
+# Histórico de uma pasta, com a retenção configurada
+# -------------------------
+def criar_historico(pasta):
+    return HistoricoExportacoes(
+        pasta,
+        max_ficheiros=config.HISTORICO_MAX_FICHEIROS,
+        max_dias=config.HISTORICO_MAX_DIAS,
+        max_bytes=config.HISTORICO_MAX_MB * 1024 * 1024,
+    )
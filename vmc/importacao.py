@@ -0,0 +1,179 @@
+import csv
+import io
+import os
+
+import pandas as pd
+
+from vmc.armazenamento import COLUNAS_NOMES, juntar_partes, separar_partes
+
+# Acentos e cedilhas, que a decomposição NFKD separa das letras
+_MARCAS = "[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]"
+
+# Cabeçalhos aceites para cada coluna (já sem acentos nem maiúsculas)
+_CABECALHOS = {
+    "Nome": ("nome", "nomes", "name"),
+    "Visível": ("visivel", "visible", "ativo"),
+    "Partes": ("partes", "qualificacoes"),
+}
+_VISIVEL = {
+    **dict.fromkeys(("true", "1", "sim", "s", "yes", "x"), True),
+    **dict.fromkeys(("false", "0", "nao", "n", "no"), False),
+}
+
+
+# "  João   SIMÕES " -> "João SIMÕES"
+def limpar(serie):
+    return serie.fillna("").astype(str).str.replace(r"\s+", " ", regex=True).str.strip()
+
+
+# Chave de comparação dos nomes: "  João   SIMÕES " -> "joao simoes"
+def chaves(serie):
+    return limpar(serie).str.normalize("NFKD").str.replace(_MARCAS, "", regex=True).str.casefold()
+
+
+# -------------------------
+# Leitura do ficheiro enviado (CSV com , ; ou tabulações, ou Excel)
+# -------------------------
+def ler_ficheiro(dados, nome_ficheiro):
+    if os.path.splitext(nome_ficheiro)[1].lower() in (".xlsx", ".xlsm"):
+        df = pd.read_excel(io.BytesIO(dados), dtype=str)
+    else:
+        try:
+            texto = dados.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            texto = dados.decode("cp1252", errors="replace")   # CSV guardado pelo Excel
+        try:
+            separador = csv.Sniffer().sniff(texto[:4096], delimiters=",;\t").delimiter
+        except csv.Error:
+            separador = ","
+        df = pd.read_csv(io.StringIO(texto), sep=separador, dtype=str, keep_default_na=False)
+
+    if not len(df.columns):
+        raise ValueError("O ficheiro não tem colunas.")
+
+    cabecalhos = dict(zip(chaves(pd.Series(df.columns, dtype=object)), df.columns))
+    renomear = {}
+    for coluna, aceites in _CABECALHOS.items():
+        original = next((cabecalhos[c] for c in aceites if c in cabecalhos), None)
+        if original is not None:
+            renomear[original] = coluna
+    if "Nome" not in renomear.values():
+        primeira = df.columns[0]
+        if len(df.columns) == 1:
+            # Lista simples, sem cabeçalho: a primeira linha também é um nome
+            df = pd.concat([pd.DataFrame({primeira: [primeira]}), df], ignore_index=True)
+        renomear[primeira] = "Nome"
+    df = df.rename(columns=renomear)
+    return df[[c for c in COLUNAS_NOMES if c in df.columns]]
+
+
+# -------------------------
+# O que a importação vai fazer, comparando o ficheiro com os nomes existentes
+# (mesma chave = mesma pessoa):
+# - adicionar: nomes novos
+# - juntar: nomes existentes que ganham partes
+# - conflitos: mudanças que não são só acrescentos (visibilidade, restringir
+#   quem podia fazer todas as partes) ou nomes repetidos na lista atual;
+#   só são aplicados se se escolher usar o ficheiro
+# -------------------------
+class PlanoImportacao:
+    __slots__ = ("adicionar", "juntar", "conflitos", "iguais", "repetidos", "vazios", "_resolucoes")
+
+    def __init__(self, existentes, importados):
+        entrada = pd.DataFrame({"Nome": limpar(importados["Nome"])})
+        if "Visível" in importados.columns:
+            entrada["Visível"] = chaves(importados["Visível"]).map(_VISIVEL).astype("boolean")
+        else:
+            entrada["Visível"] = pd.Series(pd.NA, index=entrada.index, dtype="boolean")
+        entrada["Partes"] = limpar(importados["Partes"]) if "Partes" in importados.columns else ""
+
+        vazio = entrada["Nome"] == ""
+        self.vazios = int(vazio.sum())
+        entrada = entrada[~vazio]
+        entrada["chave"] = chaves(entrada["Nome"])
+
+        # Linhas repetidas no ficheiro: a primeira grafia, o primeiro Visível
+        # preenchido e as partes de todas
+        unicos = entrada.drop_duplicates("chave").set_index("chave")
+        visivel = entrada.dropna(subset=["Visível"]).drop_duplicates("chave").set_index("chave")["Visível"]
+        unicos["Visível"] = visivel.reindex(unicos.index).astype("boolean")
+        unicos["Partes"] = (entrada["Partes"] + ";").groupby(entrada["chave"], sort=False).sum().map(juntar_partes)
+        self.repetidos = len(entrada) - len(unicos)
+
+        atuais = pd.DataFrame({
+            "id": existentes.index,
+            "Existente": existentes["Nome"].to_numpy(),
+            "Visível atual": existentes["Visível"].to_numpy(dtype=bool),
+            "Partes atuais": existentes["Partes"].fillna("").to_numpy(),
+            "chave": chaves(existentes["Nome"]).to_numpy(),
+        })
+        ocorrencias = atuais["chave"].value_counts()
+        plano = unicos.reset_index().merge(atuais.drop_duplicates("chave"), on="chave", how="left")
+
+        novo = plano["id"].isna()
+        self.adicionar = pd.DataFrame({
+            "Nome": plano.loc[novo, "Nome"],
+            "Visível": plano.loc[novo, "Visível"].fillna(True).astype(bool),
+            "Partes": plano.loc[novo, "Partes"],
+        }).reset_index(drop=True)
+
+        plano = plano[~novo].copy()
+        plano["id"] = plano["id"].astype(int)
+        plano["Novas partes"] = [
+            juntar_partes(separar_partes(atual) + separar_partes(nova))
+            for atual, nova in zip(plano["Partes atuais"], plano["Partes"])
+        ]
+        ambiguo = plano["chave"].map(ocorrencias) > 1
+        muda_partes = (plano["Partes"] != "") & (plano["Novas partes"] != plano["Partes atuais"])
+        restringe = muda_partes & (plano["Partes atuais"] == "")
+        muda_visivel = (plano["Visível"].notna() & (plano["Visível"] != plano["Visível atual"])).astype(bool)
+        conflito = ambiguo | restringe | muda_visivel
+
+        juntar = plano[~conflito & muda_partes]
+        self.juntar = pd.DataFrame({
+            "Nome": juntar["Existente"].to_numpy(),
+            "No ficheiro": juntar["Nome"].to_numpy(),
+            "Partes atuais": juntar["Partes atuais"].to_numpy(),
+            "Partes": juntar["Novas partes"].to_numpy(),
+        }, index=juntar["id"].to_numpy())
+        self.iguais = int((~conflito & ~muda_partes).sum())
+
+        conflitos = plano[conflito]
+        motivos = [
+            f"Corresponde a {ocorrencias[chave]} nomes existentes" if amb else "; ".join(filter(None, (
+                f"Visível: {'sim' if atual else 'não'} → {'sim' if vis else 'não'}" if mv else "",
+                f"Partes: todas → {nova}" if rst else "",
+            )))
+            for chave, amb, mv, rst, atual, vis, nova in zip(
+                conflitos["chave"], ambiguo[conflito], muda_visivel[conflito], restringe[conflito],
+                conflitos["Visível atual"], conflitos["Visível"], conflitos["Partes"],
+            )
+        ]
+        self.conflitos = pd.DataFrame({
+            "Nome": conflitos["Existente"].to_numpy(),
+            "No ficheiro": conflitos["Nome"].to_numpy(),
+            "Motivo": motivos,
+        }, index=conflitos["id"].to_numpy())
+
+        # O que cada conflito muda se se usar o ficheiro (os ambíguos nunca são aplicados)
+        resolvivel = conflito & ~ambiguo
+        self._resolucoes = (
+            dict(zip(plano.loc[resolvivel & muda_visivel, "id"], plano.loc[resolvivel & muda_visivel, "Visível"].astype(bool))),
+            dict(zip(plano.loc[resolvivel & muda_partes, "id"], plano.loc[resolvivel & muda_partes, "Novas partes"])),
+        )
+
+    # Argumentos de Armazenamento.aplicar_alteracoes (uma única escrita);
+    # originais: o nome de cada id alterado, verificado ao aplicar
+    def alteracoes(self, usar_ficheiro=False):
+        visivel, partes = {}, dict(zip(self.juntar.index, self.juntar["Partes"]))
+        originais = dict(zip(self.juntar.index, self.juntar["Nome"]))
+        if usar_ficheiro:
+            visivel.update(self._resolucoes[0])
+            partes.update(self._resolucoes[1])
+            for i in visivel.keys() | partes.keys():
+                originais.setdefault(i, self.conflitos.at[i, "Nome"])
+        return dict(visivel=visivel, partes=partes, adicionar=self.adicionar, originais=originais)
+
+    def total(self, usar_ficheiro=False):
+        alteracoes = self.alteracoes(usar_ficheiro)
+        return len(alteracoes["adicionar"]) + len(alteracoes["partes"].keys() | alteracoes["visivel"].keys())
@@ -0,0 +1,121 @@
+import functools
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from vmc import config
+
+# Desligada por omissão (VMC_MEDICAO=1 para ligar).
+# Com a medição desligada, cada função medida custa apenas um teste a esta variável.
+ATIVA = config.MEDICAO
+
+_registos = deque(maxlen=config.MEDICAO_MAX_REGISTOS)
+_lock = threading.Lock()
+
+_log = logging.getLogger("vmc.medicao")
+if config.MEDICAO_LOG:
+    _handler = logging.FileHandler(config.MEDICAO_LOG, encoding="utf-8")
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    _log.addHandler(_handler)
+    _log.setLevel(logging.INFO)
+    _log.propagate = False
+
+
+# Tamanho em bytes de um resultado (bytes ou DataFrame); None se não se souber
+def tamanho(valor):
+    if isinstance(valor, (bytes, bytearray)):
+        return len(valor)
+    if hasattr(valor, "memory_usage"):
+        return int(valor.memory_usage(index=True, deep=False).sum())
+    return None
+
+
+def registar(categoria, nome, ms, bytes_=None):
+    registo = {
+        "ts": round(time.time(), 3),
+        "categoria": categoria,
+        "nome": nome,
+        "ms": round(ms, 3),
+        "bytes": bytes_,
+    }
+    with _lock:
+        _registos.append(registo)
+    if _log.handlers:
+        _log.info(json.dumps(registo, ensure_ascii=False))
+
+
+class _Medida:
+    __slots__ = ("bytes",)
+
+    def __init__(self):
+        self.bytes = None
+
+
+# -------------------------
+# Mede um bloco: with medir("ler", "nomes") as m: ...; m.bytes = ...
+# -------------------------
+@contextmanager
+def medir(categoria, nome):
+    medida = _Medida()
+    if not ATIVA:
+        yield medida
+        return
+    inicio = time.perf_counter()
+    try:
+        yield medida
+    finally:
+        registar(categoria, nome, (time.perf_counter() - inicio) * 1000, medida.bytes)
+
+
+# -------------------------
+# Decorador: mede cada chamada. Os bytes são os do resultado
+# ou, se não forem mensuráveis (ex: save_*), os do primeiro argumento que o seja.
+# -------------------------
+def medido(categoria, nome=None):
+    def decorar(funcao):
+        rotulo = nome or funcao.__qualname__
+
+        @functools.wraps(funcao)
+        def _medido(*args, **kwargs):
+            if not ATIVA:
+                return funcao(*args, **kwargs)
+            inicio = time.perf_counter()
+            resultado = funcao(*args, **kwargs)
+            ms = (time.perf_counter() - inicio) * 1000
+            bytes_ = tamanho(resultado)
+            if bytes_ is None:
+                bytes_ = next((b for b in map(tamanho, args) if b is not None), None)
+            registar(categoria, rotulo, ms, bytes_)
+            return resultado
+        return _medido
+    return decorar
+
+
+# -------------------------
+# Tempo total de execução de uma página: inicio_pagina() no topo, fim_pagina() no fim
+# -------------------------
+def inicio_pagina():
+    return time.perf_counter() if ATIVA else None
+
+
+def fim_pagina(pagina, t0):
+    if ATIVA and t0 is not None:
+        registar("pagina", pagina, (time.perf_counter() - t0) * 1000)
+
+
+def registos():
+    with _lock:
+        return list(_registos)
+
+
+def limpar():
+    with _lock:
+        _registos.clear()
+
+
+# Registos em JSON lines (um objeto por linha)
+def exportar_jsonl():
+    return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in registos()).encode("utf-8")
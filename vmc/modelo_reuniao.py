@@ -0,0 +1,157 @@
+import csv
+
+from vmc import cache, config
+from vmc.reuniao import chave_parte, load_partes, tipo_parte
+
+# Variantes de uma parte (coluna Variante): vazio = todas as semanas
+NORMAL = "normal"
+ESPECIAL = "especial"
+
+
+def _inteiro(valor, padrao=0):
+    try:
+        return int(str(valor).strip())
+    except ValueError:
+        return padrao
+
+
+# -------------------------
+# Parte escolhida de semana para semana (partes_reuniao.csv)
+# -------------------------
+class ItemCatalogo:
+    __slots__ = ("nome", "pessoas", "tempo_min", "tempo_max")
+
+    def __init__(self, nome, pessoas, tempo_min, tempo_max):
+        self.nome = nome
+        self.pessoas = pessoas
+        self.tempo_min = tempo_min
+        self.tempo_max = tempo_max
+
+
+# -------------------------
+# Uma linha de modelo_reuniao.csv
+#
+# Ordem e Parte podem ter {n} (partes repetidas, de 1 até Máximo).
+# Parte vazia = escolhida do catálogo da secção; Pessoas 0 = as do catálogo.
+# TempoMin = TempoMax: duração fixa; TempoMin < TempoMax: duração escolhida.
+# -------------------------
+class ParteModelo:
+    __slots__ = (
+        "id", "secao", "ordem", "parte", "pessoas", "tempo_min", "tempo_max",
+        "quantidade", "maximo", "variante", "catalogo",
+    )
+
+    def __init__(self, linha):
+        self.id = linha["Id"].strip()
+        self.secao = linha["Secção"].strip()
+        self.ordem = linha["Ordem"].strip()
+        self.parte = (linha.get("Parte") or "").strip()
+        self.pessoas = _inteiro(linha.get("Pessoas"), 1)
+        self.tempo_min = _inteiro(linha.get("TempoMin"))
+        self.tempo_max = _inteiro(linha.get("TempoMax"))
+        self.maximo = max(_inteiro(linha.get("Máximo"), 1), 1)
+        self.quantidade = min(max(_inteiro(linha.get("Quantidade"), 1), 1), self.maximo)
+        self.variante = (linha.get("Variante") or "").strip().lower()
+        self.catalogo = not self.parte
+
+    def ativa(self, especial):
+        return not self.variante or self.variante == (ESPECIAL if especial else NORMAL)
+
+    def ordem_de(self, n):
+        return self.ordem.format(n=n)
+
+    def nome_de(self, n):
+        return self.parte.format(n=n)
+
+    # Rótulo no modelo mensal: o nome da parte ou, se vier do catálogo, a ordem
+    def rotulo_de(self, n):
+        return self.nome_de(n) or self.ordem_de(n)
+
+    def chave_de(self, n):
+        return chave_parte(self.ordem_de(n), self.rotulo_de(n))
+
+
+class SeccaoModelo:
+    __slots__ = ("nome", "partes", "variantes")
+
+    def __init__(self, nome, partes):
+        self.nome = nome
+        self.partes = tuple(partes)
+        self.variantes = any(p.variante for p in self.partes)
+
+
+# -------------------------
+# Modelo da reunião, compilado uma vez por versão dos ficheiros
+# e partilhado pela página das reuniões e pelo modelo mensal
+# -------------------------
+class ModeloReuniao:
+    __slots__ = ("secoes", "partes", "por_id", "catalogo", "opcoes", "tipos", "linhas_mensal")
+
+    def __init__(self, partes, catalogo):
+        self.partes = tuple(partes)
+        self.por_id = {p.id: p for p in self.partes}
+
+        secoes = {}
+        for parte in self.partes:
+            secoes.setdefault(parte.secao, []).append(parte)
+        self.secoes = tuple(SeccaoModelo(nome, lista) for nome, lista in secoes.items())
+
+        # secção -> {nome: ItemCatalogo}, pela ordem do ficheiro
+        self.catalogo = catalogo
+        self.opcoes = {secao: tuple(itens) for secao, itens in catalogo.items()}
+
+        # Tipos de parte (os das qualificações dos nomes), pela ordem da reunião
+        tipos = []
+        for parte in self.partes:
+            nomes = self.opcoes.get(parte.secao, ()) if parte.catalogo else (parte.nome_de(1),)
+            tipos.extend(tipo_parte(nome) for nome in nomes)
+        self.tipos = tuple(dict.fromkeys(tipos))
+
+        # Linhas do modelo mensal: (secção, chave da parte, rótulo, opcional).
+        # As opcionais (repetições acima da quantidade habitual e partes
+        # das semanas especiais) só aparecem se alguma semana as tiver.
+        self.linhas_mensal = tuple(
+            (parte.secao, parte.chave_de(n), parte.rotulo_de(n), n > parte.quantidade or parte.variante == ESPECIAL)
+            for parte in self.partes
+            for n in range(1, parte.maximo + 1)
+        )
+
+    def item(self, secao, nome):
+        return self.catalogo.get(secao, {}).get(nome)
+
+    # (nome, nº de designados, tempo mínimo, tempo máximo) da repetição n de uma parte;
+    # escolha = nome escolhido do catálogo, nas partes que vêm do catálogo
+    def resolver(self, parte, n, escolha=None):
+        if not parte.catalogo:
+            return parte.nome_de(n), parte.pessoas, parte.tempo_min, parte.tempo_max
+        item = self.item(parte.secao, escolha)
+        if item is None:
+            return escolha or "", parte.pessoas or 1, parte.tempo_min, parte.tempo_max
+        return item.nome, parte.pessoas or item.pessoas, item.tempo_min, item.tempo_max
+
+
+# "Discurso", 5 -> "Discurso (5 min)"
+def texto_parte(nome, minutos):
+    return f"{nome} ({minutos} min)" if minutos else nome
+
+
+def _ler_modelo(modelo_file, partes_file):
+    with open(modelo_file, encoding="utf-8", newline="") as f:
+        partes = [ParteModelo(linha) for linha in csv.DictReader(f) if (linha.get("Id") or "").strip()]
+
+    catalogo = {}
+    df = load_partes(partes_file)
+    for secao, nome, pessoas, tempo_min, tempo_max in zip(
+        df["Secção"], df["Parte"].astype(str).str.strip(), df["Pessoas"], df["TempoMin"], df["TempoMax"]
+    ):
+        catalogo.setdefault(secao, {})[nome] = ItemCatalogo(nome, int(pessoas), int(tempo_min), int(tempo_max))
+    return ModeloReuniao(partes, catalogo)
+
+
+# Modelo compilado de um par de ficheiros (por omissão os da instalação)
+def get_modelo(modelo_file=None, partes_file=None):
+    modelo_file = modelo_file or config.MODELO_FILE
+    partes_file = partes_file or config.PARTES_FILE
+    return cache.compilado(
+        "modelo_reuniao", [modelo_file, partes_file], lambda: _ler_modelo(modelo_file, partes_file)
+    )
@@ -0,0 +1,115 @@
+import os
+
+from fpdf import FPDF
+
+from vmc.recursos import preparar_imagem, registar_fontes
+
+
+# -------------------------
+# Classe PDF para lista simples
+# -------------------------
+class PDFLista(FPDF):
+    def __init__(self):
+        super().__init__()
+        registar_fontes(self)
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font("DejaVu", size=9)
+        self.cell(0, 10, f"Página {self.page_no()}", align="C")
+
+
+# -------------------------
+# Tabela com cabeçalho repetido em cada página e texto com quebra de linha.
+# colunas: [(título, largura), ...]
+# -------------------------
+class PDFTabela(PDFLista):
+    ALTURA_LINHA = 6
+    MARGEM_INFERIOR = 15
+
+    def __init__(self, titulo, colunas):
+        self.titulo = titulo
+        self.colunas = colunas
+        self._quebras = {}
+        super().__init__()
+        # As quebras de página são feitas à mão, para nunca partir uma linha da tabela
+        self.set_auto_page_break(False, margin=self.MARGEM_INFERIOR)
+
+    def header(self):
+        if self.page_no() == 1:
+            self.set_font("DejaVu", "B", 12)
+            self.cell(0, 8, self.titulo, new_x="LMARGIN", new_y="NEXT", align="C")
+            self.ln(4)
+        self.set_font("DejaVu", "B", 10)
+        for titulo, largura in self.colunas:
+            self.cell(largura, 8, titulo, border=1)
+        self.ln()
+        self.set_font("DejaVu", "", 9)
+
+    # Os mesmos textos (secções, partes, nomes) repetem-se muito:
+    # a divisão em linhas é calculada uma vez por texto e largura
+    def _quebrar(self, texto, largura):
+        chave = (texto, largura)
+        linhas = self._quebras.get(chave)
+        if linhas is None:
+            if self.get_string_width(texto) <= largura - 2 * self.c_margin:
+                linhas = [texto]
+            else:
+                linhas = self.multi_cell(largura, self.ALTURA_LINHA, texto, dry_run=True, output="LINES")
+            self._quebras[chave] = linhas
+        return linhas
+
+    def linha(self, valores):
+        partes = [self._quebrar(v, w) for v, (_, w) in zip(valores, self.colunas)]
+        num_linhas = max(len(p) for p in partes)
+        altura = self.ALTURA_LINHA * num_linhas
+        if self.get_y() + altura > self.page_break_trigger:
+            self.add_page()
+
+        # Caso comum: tudo cabe numa linha
+        if num_linhas == 1:
+            for (texto,), (_, w) in zip(partes, self.colunas):
+                self.cell(w, altura, texto, border=1)
+            self.ln()
+            return
+
+        x, y = self.l_margin, self.get_y()
+        for linhas, (_, w) in zip(partes, self.colunas):
+            self.rect(x, y, w, altura)
+            for i, texto in enumerate(linhas):
+                self.set_xy(x, y + i * self.ALTURA_LINHA)
+                self.cell(w, self.ALTURA_LINHA, texto)
+            x += w
+        self.set_xy(self.l_margin, y + altura)
+
+
+# -------------------------
+# Classe PDF para Modelo A (mensal)
+# -------------------------
+class PDFModeloMensal(FPDF):
+    def __init__(self, titulo="Reunião Vida e Ministério Cristãos"):
+        super().__init__(orientation="P", unit="mm", format="A4")
+        self.titulo = titulo
+        self.set_auto_page_break(auto=True, margin=15)
+        registar_fontes(self)
+
+    def header(self):
+        self.set_font("DejaVu", "B", 14)
+        self.cell(0, 8, self.titulo, ln=True, align="C")
+        self.ln(4)
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font("DejaVu", size=9)
+        self.cell(0, 10, f"Página {self.page_no()}", align="C")
+
+    def secao_imagem(self, imagem_path):
+        if os.path.exists(imagem_path):
+            x = 10
+            w = 190
+            preparar_imagem(self, imagem_path, w)
+            y = self.get_y()
+            self.image(imagem_path, x=x, y=y, w=w)
+            self.ln(15)
+        else:
+            self.ln(5)
@@ -0,0 +1,160 @@
+import pandas as pd
+import streamlit as st
+
+from vmc import congregacoes, medicao
+from vmc.tarefas import A_GERAR, CONCLUIDA, PENDENTE, get_fila
+
+# Espera (segundos) logo a seguir ao pedido: ficheiros rápidos, como o CSV,
+# ficam prontos na mesma execução da página
+ESPERA_CURTA = 0.3
+# Intervalo (segundos) com que o painel se atualiza enquanto há exportações a decorrer
+INTERVALO_EXPORTACOES = 1.0
+# Exportações mostradas por sessão
+MAX_EXPORTACOES_SESSAO = 10
+
+
+# -------------------------
+# Congregação desta sessão. Com várias, escolhe-se na barra lateral
+# (ou com ?congregacao=<pasta> no endereço); a escolha vale para todas as páginas.
+# -------------------------
+def escolher_congregacao():
+    ss = st.session_state
+    disponiveis = congregacoes.ids()
+
+    pedida = st.query_params.get("congregacao")
+    if "congregacao" not in ss and pedida in disponiveis:
+        ss["congregacao"] = pedida
+    if ss.get("congregacao") not in disponiveis:
+        ss["congregacao"] = disponiveis[0]
+
+    if len(disponiveis) > 1:
+        st.sidebar.selectbox(
+            "Congregação",
+            disponiveis,
+            index=disponiveis.index(ss["congregacao"]),
+            key="_congregacao",
+            on_change=_mudar_congregacao,
+        )
+    return congregacoes.obter(ss["congregacao"])
+
+
+# Os valores escolhidos nas páginas eram da congregação anterior
+def _mudar_congregacao():
+    ss = st.session_state
+    escolhida = ss["_congregacao"]
+    for chave in [k for k in ss if k not in ("congregacao", "_congregacao")]:
+        del ss[chave]
+    ss["congregacao"] = escolhida
+
+
+# -------------------------
+# Painel lateral com as medições (só aparece com VMC_MEDICAO=1)
+# -------------------------
+def painel_medicao():
+    if not medicao.ATIVA:
+        return
+
+    registos = medicao.registos()
+    with st.sidebar.expander("⏱️ Medições", expanded=False):
+        if not registos:
+            st.caption("Ainda não há medições.")
+            return
+
+        df = pd.DataFrame(registos)
+        resumo = (
+            df.groupby(["categoria", "nome"])
+            .agg(
+                chamadas=("ms", "size"),
+                media_ms=("ms", "mean"),
+                p95_ms=("ms", lambda s: s.quantile(0.95)),
+                max_ms=("ms", "max"),
+                kb=("bytes", lambda s: s.mean() / 1024),
+            )
+            .round(1)
+            .sort_values("max_ms", ascending=False)
+            .reset_index()
+        )
+        st.dataframe(resumo, hide_index=True, use_container_width=True)
+
+        paginas = df[df["categoria"] == "pagina"]
+        if not paginas.empty:
+            ultima = paginas.iloc[-1]
+            st.caption(f"Última execução: {ultima['nome']} em {ultima['ms']:.0f} ms")
+
+        col_exportar, col_limpar = st.columns(2)
+        col_exportar.download_button(
+            "📥 JSON lines",
+            data=medicao.exportar_jsonl,
+            file_name="medicoes.jsonl",
+            mime="application/x-ndjson",
+        )
+        if col_limpar.button("Limpar", key="limpar_medicoes"):
+            medicao.limpar()
+            st.rerun()
+
+
+# -------------------------
+# Exportações em segundo plano: o botão só pede o ficheiro à fila
+# (usar em on_click); df pode ser uma função que devolve o DataFrame.
+# -------------------------
+def pedir_exportacao(gerar, df, *args, nome, tipo, filtros=None, mime=None, historico=None):
+    tarefa = get_fila().submeter(
+        gerar, df() if callable(df) else df, *args, nome=nome, tipo=tipo, filtros=filtros, historico=historico
+    )
+
+    pedidos = st.session_state.setdefault("exportacoes", {})
+    pedidos.pop(tarefa.id, None)
+    pedidos[tarefa.id] = mime
+    while len(pedidos) > MAX_EXPORTACOES_SESSAO:
+        del pedidos[next(iter(pedidos))]
+    tarefa.esperar(ESPERA_CURTA)
+
+
+def _descrever(tarefa, fila):
+    estado = tarefa.estado
+    if estado == PENDENTE:
+        return f"⏳ à espera ({fila.posicao(tarefa)} antes)"
+    if estado == A_GERAR:
+        return f"⚙️ a gerar… {tarefa.duracao():.0f} s"
+    if estado == CONCLUIDA:
+        return f"✔️ pronto, {len(tarefa.dados) / 1024:.1f} KB em {tarefa.duracao():.1f} s"
+    return f"❌ erro: {tarefa.erro}"
+
+
+# -------------------------
+# Painel com as exportações pedidas nesta sessão. Enquanto alguma
+# não terminar, só este fragmento se atualiza (o resto da página não corre).
+# -------------------------
+def painel_exportacoes():
+    fila = get_fila()
+    pedidos = st.session_state.get("exportacoes", {})
+    for id in [id for id in pedidos if fila.obter(id) is None]:
+        del pedidos[id]
+    if not pedidos:
+        return
+
+    a_decorrer = any(t is not None and not t.terminada() for t in map(fila.obter, pedidos))
+
+    @st.fragment(run_every=INTERVALO_EXPORTACOES if a_decorrer else None)
+    def _painel():
+        tarefas = [t for t in (fila.obter(id) for id in pedidos) if t is not None]
+        prontas = sum(t.terminada() for t in tarefas)
+
+        st.progress(prontas / len(tarefas), text=f"Exportações: {prontas} de {len(tarefas)} prontas")
+        for tarefa in reversed(tarefas):
+            col_info, col_btn = st.columns([3, 1])
+            col_info.write(f"**{tarefa.nome}** — {_descrever(tarefa, fila)}")
+            if tarefa.estado == CONCLUIDA:
+                col_btn.download_button(
+                    "⬇️",
+                    tarefa.dados,
+                    file_name=tarefa.nome,
+                    mime=pedidos.get(tarefa.id),
+                    key=f"exportacao_{tarefa.id}",
+                )
+
+        # Terminaram todas: uma última execução completa para parar as atualizações
+        if a_decorrer and prontas == len(tarefas):
+            st.rerun()
+
+    _painel()
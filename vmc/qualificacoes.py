@@ -0,0 +1,95 @@
+import bisect
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from vmc.armazenamento import separar_partes
+from vmc.exportacao import assinatura
+
+# Índices guardados em memória (um por versão da lista de nomes)
+MAX_INDICES = 8
+
+_indices = OrderedDict()
+_lock = threading.Lock()
+
+
+# "João Simões" -> "joao simoes"
+def normalizar(texto):
+    texto = unicodedata.normalize("NFKD", str(texto))
+    return "".join(c for c in texto if not unicodedata.combining(c)).casefold().strip()
+
+
+# -------------------------
+# Índice dos nomes visíveis:
+# - tipo de parte -> nomes que a podem fazer (sem qualificações = todas as partes)
+# - pesquisa por prefixo de qualquer palavra do nome, sem acentos nem maiúsculas
+#   ("si" e "simoes" encontram "João Simões")
+# -------------------------
+class IndiceNomes:
+    def __init__(self, nomes_df):
+        visiveis = nomes_df[nomes_df["Visível"]]
+        self.nomes = tuple(dict.fromkeys(n for n in visiveis["Nome"] if n))
+
+        partes = {}
+        if "Partes" in visiveis.columns:
+            for nome, texto in zip(visiveis["Nome"], visiveis["Partes"]):
+                partes[nome] = frozenset(separar_partes(texto))
+        self._livres = tuple(n for n in self.nomes if not partes.get(n))
+        self._por_tipo = {}
+        for nome in self.nomes:
+            for tipo in partes.get(nome, ()):
+                self._por_tipo.setdefault(tipo, set()).add(nome)
+
+        # Chaves ordenadas: o nome normalizado a partir de cada palavra
+        chaves = []
+        for nome in self.nomes:
+            palavras = normalizar(nome).split()
+            for i in range(len(palavras)):
+                chaves.append((" ".join(palavras[i:]), nome))
+        chaves.sort()
+        self._chaves = [c for c, _ in chaves]
+        self._nomes_chaves = [n for _, n in chaves]
+
+        self._elegiveis = {}
+
+    # Nomes que podem fazer este tipo de parte, pela ordem da lista
+    def elegiveis(self, tipo):
+        resultado = self._elegiveis.get(tipo)
+        if resultado is None:
+            com_tipo = self._por_tipo.get(tipo, set())
+            livres = set(self._livres)
+            resultado = self._elegiveis[tipo] = tuple(n for n in self.nomes if n in livres or n in com_tipo)
+        return resultado
+
+    # tipo -> conjunto de nomes, para o Agendador
+    def conjuntos(self, tipos):
+        return {tipo: frozenset(self.elegiveis(tipo)) for tipo in tipos}
+
+    def procurar(self, texto, nomes=None):
+        chave = normalizar(texto)
+        nomes = self.nomes if nomes is None else nomes
+        if not chave:
+            return list(nomes)
+        inicio = bisect.bisect_left(self._chaves, chave)
+        fim = bisect.bisect_left(self._chaves, chave + "\uffff")
+        encontrados = set(self._nomes_chaves[inicio:fim])
+        return [n for n in nomes if n in encontrados]
+
+
+# -------------------------
+# Índice de uma versão da lista de nomes, construído uma só vez
+# -------------------------
+def obter_indice_nomes(nomes_df):
+    versao = assinatura(nomes_df)
+    with _lock:
+        if versao in _indices:
+            _indices.move_to_end(versao)
+            return _indices[versao]
+
+    indice = IndiceNomes(nomes_df)
+
+    with _lock:
+        _indices[versao] = indice
+        while len(_indices) > MAX_INDICES:
+            _indices.popitem(last=False)
+    return indice
@@ -0,0 +1,250 @@
+import copy
+import datetime
+import functools
+import io
+import os
+import tempfile
+import warnings
+
+from fontTools import ttLib
+from fpdf import FPDF, FPDF_VERSION
+
+# Internos do fpdf2: se mudarem de sítio, usa-se o registo normal
+try:
+    from fpdf.fonts import SubsetMap
+    from fpdf.image_parsing import get_img_info
+except ImportError:
+    SubsetMap = get_img_info = None
+
+from vmc import config
+
+FONTE = "fonts/DejaVuSans.ttf"
+FAMILIA = "DejaVu"
+ESTILOS = ("", "B")
+IMAGENS = ("assets/tesouros.png", "assets/ministerio.png", "assets/viver.png")
+LARGURA_IMAGENS_MM = 190  # largura com que as imagens das secções são impressas
+
+
+# Tabelas só usadas pelo hinting TrueType, que os leitores de PDF ignoram
+_TABELAS_HINTING = ("fpgm", "prep", "cvt ", "hdmx", "VDMX", "LTSH")
+
+# Versões do fpdf2 cujos internos foram verificados (ver requirements.txt)
+_VERSOES_FPDF = ("2.8.",)
+_TEXTO_TESTE = "Designações — Leitura da Bíblia ção ÁÉÍÓÚ ãõ 123"
+
+
+# -------------------------
+# Fontes: o ficheiro TTF é lido e analisado uma vez por processo.
+# Cada documento recebe uma cópia com o seu próprio subconjunto de glifos,
+# porque o fpdf2 altera a fonte ao gerar o PDF.
+# Com a otimização ligada, a fonte é usada sem hinting (mesmos glifos e métricas).
+# -------------------------
+@functools.lru_cache(maxsize=None)
+def _bytes_fonte(caminho, sem_hinting=False):
+    with open(caminho, "rb") as f:
+        dados = f.read()
+    if not sem_hinting:
+        return dados
+
+    fonte = ttLib.TTFont(io.BytesIO(dados), recalcTimestamp=False)
+    for tabela in _TABELAS_HINTING:
+        if tabela in fonte:
+            del fonte[tabela]
+    if "glyf" in fonte:
+        glyf = fonte["glyf"]
+        for nome in fonte.getGlyphOrder():
+            glyf[nome].removeHinting()
+    buffer = io.BytesIO()
+    fonte.save(buffer)
+    return buffer.getvalue()
+
+
+@functools.lru_cache(maxsize=None)
+def _prototipo_fonte(familia, estilo, caminho):
+    pdf = FPDF()
+    pdf.add_font(familia, estilo, caminho)
+    return next(iter(pdf.fonts.values()))
+
+
+# Põe em pdf uma cópia do protótipo; False se os internos do fpdf2 não coincidirem
+def _copiar_fonte(pdf, familia, estilo, caminho, sem_hinting):
+    proto = _prototipo_fonte(familia, estilo, caminho)
+    try:
+        fonte = copy.copy(proto)
+        fonte.i = len(pdf.fonts) + 1
+        # O descritor é um objeto PDF: recebe um id em cada output, não pode ser partilhado
+        fonte.desc = copy.copy(proto.desc)
+        dados = _bytes_fonte(caminho, sem_hinting)
+        fonte.ttfont = ttLib.TTFont(io.BytesIO(dados), recalcTimestamp=False, lazy=True)
+        fonte._hbfont = None
+        fonte.missing_glyphs = []
+        fonte.biggest_size_pt = 0
+        fonte.subset = SubsetMap(fonte)
+    except (AttributeError, TypeError):
+        return False
+    pdf.fonts[proto.fontkey] = fonte
+    return True
+
+
+def registar_fontes(pdf, familia=FAMILIA, caminho=FONTE, estilos=ESTILOS):
+    atalho = _atalho_fontes(familia, caminho, tuple(estilos), config.PDF_OTIMIZAR)
+    for estilo in estilos:
+        if not atalho or not _copiar_fonte(pdf, familia, estilo, caminho, config.PDF_OTIMIZAR):
+            pdf.add_font(familia, estilo, caminho)
+
+
+# -------------------------
+# Imagens: descodificadas e comprimidas uma vez por processo.
+# Com a otimização ligada e a largura impressa conhecida, a imagem é
+# reduzida para config.PDF_DPI (nunca ampliada) e a transparência
+# é assente em fundo branco (o fundo da página).
+# -------------------------
+def _imagem_impressao(caminho, largura_mm, dpi):
+    from PIL import Image
+
+    with Image.open(caminho) as original:
+        imagem = original.convert("RGBA")
+    largura_px = max(1, round(largura_mm / 25.4 * dpi))
+    if imagem.width > largura_px:
+        altura_px = max(1, round(imagem.height * largura_px / imagem.width))
+        imagem = imagem.resize((largura_px, altura_px), Image.LANCZOS)
+    fundo = Image.new("RGB", imagem.size, "white")
+    fundo.paste(imagem, mask=imagem.getchannel("A"))
+    return fundo
+
+
+@functools.lru_cache(maxsize=None)
+def _info_imagem(caminho, filtro, largura_mm=None, dpi=None):
+    if largura_mm is None:
+        return get_img_info(caminho, None, filtro)
+    return get_img_info(caminho, _imagem_impressao(caminho, largura_mm, dpi), filtro)
+
+
+def _inserir_imagem(cache, caminho, info):
+    info = copy.copy(info)
+    info["i"] = len(cache.images) + 1
+    info["usages"] = 0
+    info["iccp_i"] = None
+    cache.images[caminho] = info
+
+
+def preparar_imagem(pdf, caminho, largura_mm=None):
+    if not _atalho_imagens(config.PDF_OTIMIZAR, config.PDF_DPI):
+        return
+    cache = pdf.image_cache
+    if caminho in cache.images or not os.path.exists(caminho):
+        return
+    if config.PDF_OTIMIZAR and largura_mm:
+        info = _info_imagem(caminho, cache.image_filter, largura_mm, config.PDF_DPI)
+    else:
+        info = _info_imagem(caminho, cache.image_filter)
+    if info.get("iccp") is not None:
+        # Perfis ICC ficam a cargo do fpdf2
+        return
+    _inserir_imagem(cache, caminho, info)
+
+
+# -------------------------
+# Verificação (uma vez por processo): o mesmo documento é gerado pelo caminho
+# normal e pelo atalho; o atalho só é usado se os PDFs forem iguais byte a byte.
+# Caso contrário, fica um aviso e usa-se sempre o caminho normal.
+# -------------------------
+def _sem_atalho(motivo):
+    warnings.warn(f"vmc.recursos: {motivo}; a usar o registo normal do fpdf2", RuntimeWarning, stacklevel=3)
+    return False
+
+
+def _versao_suportada():
+    return SubsetMap is not None and FPDF_VERSION.startswith(_VERSOES_FPDF)
+
+
+def _pdf_teste():
+    pdf = FPDF()
+    pdf.set_creation_date(datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc))
+    pdf.add_page()
+    return pdf
+
+
+# Com as mesmas opções da produção: sem hinting, a referência é o fpdf2
+# a ler um ficheiro com a fonte já sem hinting
+@functools.lru_cache(maxsize=None)
+def _atalho_fontes(familia, caminho, estilos, sem_hinting):
+    if not _versao_suportada():
+        return _sem_atalho(f"fpdf2 {FPDF_VERSION} não verificado")
+    saidas = []
+    with tempfile.TemporaryDirectory() as pasta:
+        referencia = caminho
+        try:
+            if sem_hinting:
+                referencia = os.path.join(pasta, os.path.basename(caminho))
+                with open(referencia, "wb") as f:
+                    f.write(_bytes_fonte(caminho, True))
+            for atalho in (False, True):
+                pdf = _pdf_teste()
+                for estilo in estilos:
+                    if not atalho or not _copiar_fonte(pdf, familia, estilo, caminho, sem_hinting):
+                        pdf.add_font(familia, estilo, referencia)
+                    pdf.set_font(familia, estilo, 12)
+                    pdf.cell(0, 10, _TEXTO_TESTE, new_x="LMARGIN", new_y="NEXT")
+                saidas.append(bytes(pdf.output()))
+        except Exception as e:
+            return _sem_atalho(f"cópia das fontes falhou ({e!r})")
+    if saidas[0] != saidas[1]:
+        return _sem_atalho("a cópia das fontes gera um PDF diferente")
+    return True
+
+
+# Imagem com transparência e maior do que o tamanho impresso; com a otimização
+# ligada, a referência é o fpdf2 a receber a imagem já reduzida
+@functools.lru_cache(maxsize=None)
+def _atalho_imagens(otimizar, dpi):
+    if not _versao_suportada():
+        return _sem_atalho(f"fpdf2 {FPDF_VERSION} não verificado")
+    from PIL import Image
+
+    largura_mm = 50
+    saidas = []
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "teste.png")
+        imagem = Image.new("RGBA", (1200, 60), (255, 255, 255, 0))
+        for x in range(0, 1200, 7):
+            imagem.putpixel((x, x % 60), (200, 30, 30, 255))
+        imagem.save(caminho)
+        try:
+            for atalho in (False, True):
+                pdf = _pdf_teste()
+                cache = pdf.image_cache
+                if atalho:
+                    _inserir_imagem(cache, caminho, get_img_info(caminho, None, cache.image_filter))
+                pdf.image(caminho, w=largura_mm)
+                if otimizar:
+                    reduzida = _imagem_impressao(caminho, largura_mm, dpi)
+                    if atalho:
+                        nome = f"{caminho}@{largura_mm}"
+                        _inserir_imagem(cache, nome, get_img_info(caminho, reduzida, cache.image_filter))
+                        pdf.image(nome, w=largura_mm)
+                    else:
+                        pdf.image(reduzida, w=largura_mm)
+                saidas.append(bytes(pdf.output()))
+        except Exception as e:
+            return _sem_atalho(f"cópia das imagens falhou ({e!r})")
+    if saidas[0] != saidas[1]:
+        return _sem_atalho("a cópia das imagens gera um PDF diferente")
+    return True
+
+
+# -------------------------
+# Aquecimento (chamado no arranque da app)
+# -------------------------
+def aquecer():
+    if _atalho_fontes(FAMILIA, FONTE, ESTILOS, config.PDF_OTIMIZAR):
+        for estilo in ESTILOS:
+            _prototipo_fonte(FAMILIA, estilo, FONTE)
+        _bytes_fonte(FONTE, config.PDF_OTIMIZAR)
+    if _atalho_imagens(config.PDF_OTIMIZAR, config.PDF_DPI):
+        for caminho in IMAGENS:
+            if os.path.exists(caminho):
+                if config.PDF_OTIMIZAR:
+                    _info_imagem(caminho, "AUTO", LARGURA_IMAGENS_MM, config.PDF_DPI)
+                else:
+                    _info_imagem(caminho, "AUTO")
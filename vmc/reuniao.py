@@ -0,0 +1,109 @@
+import os
+import re
+from datetime import date, datetime
+
+from vmc import cache, config, medicao
+
+_DURACAO = re.compile(r"\s*\(\d+\s*min\)\s*$")
+_NUMERO = re.compile(r"\s+\d+$")
+
+COLUNAS_PARTES = ["Secção", "Parte", "TempoMin", "TempoMax", "Pessoas"]
+
+
+# -------------------------
+# Partes configuráveis (partes_reuniao.csv): as que se escolhem
+# de semana para semana, com a duração e o número de designados
+# -------------------------
+@medicao.medido("carregar")
+def load_partes(caminho=None):
+    import pandas as pd
+
+    caminho = caminho or config.PARTES_FILE
+    if not os.path.exists(caminho):
+        return pd.DataFrame(columns=COLUNAS_PARTES)
+    return cache.carregar("partes_reuniao", [caminho], lambda: _ler_partes(caminho))
+
+
+def _ler_partes(caminho):
+    import pandas as pd
+
+    df = pd.read_csv(caminho)
+    df["Secção"] = df["Secção"].astype(str).str.strip()
+    df["TempoMin"] = pd.to_numeric(df["TempoMin"], errors="coerce").fillna(0).astype(int)
+    df["TempoMax"] = pd.to_numeric(df["TempoMax"], errors="coerce").fillna(0).astype(int)
+    # Ficheiros antigos, sem a coluna: duas pessoas por parte
+    if "Pessoas" not in df.columns:
+        df["Pessoas"] = 2
+    df["Pessoas"] = pd.to_numeric(df["Pessoas"], errors="coerce").fillna(2).astype(int)
+    return df
+
+
+# -------------------------
+# Chave normalizada de uma parte:
+# - partes numeradas ("Parte 1", "Parte variável 2", "Parte fixa 1", ...) usam a Ordem,
+#   porque o nome da parte muda de semana para semana
+# - as restantes usam o nome da parte sem a duração ("Leitura da Bíblia (4 min)" -> "Leitura da Bíblia")
+# -------------------------
+def chave_parte(ordem, parte):
+    ordem = str(ordem).strip()
+    if ordem.startswith("Parte"):
+        return ordem
+    return _DURACAO.sub("", str(parte)).strip()
+
+
+def _coluna(df, nome):
+    if nome not in df.columns:
+        return [""] * len(df)
+    return df[nome].fillna("").astype(str).str.strip()
+
+
+# -------------------------
+# Índice (semana, secção, chave) -> responsável, construído uma só vez
+# -------------------------
+def indice_designacoes(df):
+    semanas = _coluna(df, "Semana")
+    secoes = _coluna(df, "Secção")
+    ordens = _coluna(df, "Ordem")
+    partes = _coluna(df, "Parte")
+    responsaveis = _coluna(df, "Responsável")
+
+    indice = {}
+    for sem, secao, ordem, parte, resp in zip(semanas, secoes, ordens, partes, responsaveis):
+        chave = chave_parte(ordem, parte)
+        if not sem or not chave:
+            continue
+        k = (sem, secao, chave)
+        anterior = indice.get(k)
+        # Partes repetidas não são descartadas em silêncio
+        indice[k] = resp if not anterior or anterior == resp else f"{anterior}; {resp}"
+    return indice
+
+
+# -------------------------
+# Tipo de parte, para estatísticas e rotação:
+# "Iniciar conversas (3 min)" -> "Iniciar conversas", "Parte variável 2 (5 min)" -> "Parte variável"
+# -------------------------
+def tipo_parte(parte):
+    return _NUMERO.sub("", _DURACAO.sub("", str(parte)).strip())
+
+
+# "A / B" -> ["A", "B"]
+def separar_responsaveis(texto):
+    return [n.strip() for n in str(texto).split("/") if n.strip() and n.strip() != "nan"]
+
+
+# -------------------------
+# Data de uma semana guardada como "%d %b" (sem ano):
+# escolhe o ano que deixa a data mais perto da referência
+# -------------------------
+def data_semana(semana, referencia=None):
+    referencia = referencia or date.today()
+    candidatas = []
+    for ano in (referencia.year - 1, referencia.year, referencia.year + 1):
+        try:
+            candidatas.append(datetime.strptime(f"{str(semana).strip()} {ano}", "%d %b %Y").date())
+        except ValueError:
+            pass
+    if not candidatas:
+        return None
+    return min(candidatas, key=lambda d: abs((d - referencia).days))
@@ -0,0 +1,136 @@
+import functools
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from vmc import config
+from vmc.exportacao import assinatura
+
+PENDENTE = "pendente"
+A_GERAR = "a gerar"
+CONCLUIDA = "concluída"
+ERRO = "erro"
+
+# Tarefas terminadas mantidas em memória (com o ficheiro gerado)
+MAX_CONCLUIDAS = 32
+
+
+# Cada trabalhador prepara as fontes e imagens dos PDFs ao arrancar
+# (o fpdf só é importado aí, não quando a página importa este módulo)
+def _aquecer():
+    from vmc import recursos
+    recursos.aquecer()
+
+
+# -------------------------
+# Uma exportação pedida: o estado vem do future,
+# o resultado fica na tarefa quando termina
+# -------------------------
+class Tarefa:
+    __slots__ = (
+        "id", "chave", "nome", "tipo", "filtros", "historico",
+        "criada", "fim", "dados", "erro", "_futuro", "_pronta",
+    )
+
+    def __init__(self, id, chave, nome, tipo, filtros, historico=None):
+        self.id = id
+        self.chave = chave
+        self.nome = nome
+        self.tipo = tipo
+        self.filtros = filtros or {}
+        self.historico = historico
+        self.criada = time.time()
+        self.fim = None
+        self.dados = None
+        self.erro = None
+        self._futuro = None
+        self._pronta = threading.Event()
+
+    @property
+    def estado(self):
+        if self._pronta.is_set():
+            return ERRO if self.erro is not None else CONCLUIDA
+        return A_GERAR if self._futuro is not None and self._futuro.running() else PENDENTE
+
+    def terminada(self):
+        return self._pronta.is_set()
+
+    def esperar(self, timeout=None):
+        return self._pronta.wait(timeout)
+
+    def duracao(self):
+        return (self.fim or time.time()) - self.criada
+
+
+# -------------------------
+# Fila de exportações partilhada por todas as sessões.
+#
+# Pedidos iguais (mesma função, mesmos dados e argumentos) ainda por
+# terminar, ou terminados há pouco, dão a mesma tarefa. Cada ficheiro
+# gerado é guardado no histórico de exportações indicado no pedido
+# (o de cada congregação) ou, sem nenhum, no da fila.
+# -------------------------
+class FilaExportacoes:
+    def __init__(self, trabalhadores=2, processos=False, historico=None):
+        executor = ProcessPoolExecutor if processos else ThreadPoolExecutor
+        self._executor = executor(max_workers=trabalhadores, initializer=_aquecer)
+        self.historico = historico
+        self._lock = threading.Lock()
+        self._tarefas = OrderedDict()   # id -> Tarefa, pela ordem dos pedidos
+        self._por_chave = {}            # chave -> Tarefa
+        self._ids = itertools.count(1)
+
+    def submeter(self, gerar, df, *args, nome, tipo, filtros=None, historico=None):
+        historico = historico or self.historico
+        pasta = historico.pasta if historico is not None else None
+        chave = (pasta, gerar.__module__, gerar.__qualname__, assinatura(df, *args))
+
+        with self._lock:
+            tarefa = self._por_chave.get(chave)
+            if tarefa is not None and tarefa.erro is None:
+                self._tarefas.move_to_end(tarefa.id)
+                return tarefa
+
+            tarefa = Tarefa(next(self._ids), chave, nome, tipo, filtros, historico)
+            self._tarefas[tarefa.id] = tarefa
+            self._por_chave[chave] = tarefa
+
+        tarefa._futuro = self._executor.submit(gerar, df, *args)
+        tarefa._futuro.add_done_callback(functools.partial(self._terminar, tarefa))
+        return tarefa
+
+    def _terminar(self, tarefa, futuro):
+        try:
+            tarefa.dados = futuro.result()
+            if tarefa.historico is not None:
+                tarefa.historico.guardar(tarefa.dados, tarefa.nome, tarefa.tipo, tarefa.filtros)
+        except Exception as e:
+            tarefa.erro = str(e) or type(e).__name__
+        tarefa.fim = time.time()
+        tarefa._pronta.set()
+
+        with self._lock:
+            terminadas = [t for t in self._tarefas.values() if t.terminada()]
+            for antiga in terminadas[:max(0, len(terminadas) - MAX_CONCLUIDAS)]:
+                del self._tarefas[antiga.id]
+                if self._por_chave.get(antiga.chave) is antiga:
+                    del self._por_chave[antiga.chave]
+
+    def obter(self, id):
+        with self._lock:
+            return self._tarefas.get(id)
+
+    # Nº de pedidos à frente desta tarefa ainda à espera
+    def posicao(self, tarefa):
+        with self._lock:
+            return sum(1 for t in self._tarefas.values() if t.criada < tarefa.criada and t.estado == PENDENTE)
+
+
+# -------------------------
+# Fila configurada, uma por processo e partilhada pelas congregações
+# -------------------------
+@functools.lru_cache(maxsize=None)
+def get_fila():
+    return FilaExportacoes(config.EXPORTACAO_TRABALHADORES, processos=config.EXPORTACAO_PROCESSOS)